@@ -0,0 +1,198 @@
+"""
+Автоматический выключатель (circuit breaker) для внешних рендереров.
+
+Если рендерер (wkhtmltopdf) несколько раз подряд завершается ошибкой
+или не укладывается в таймаут, выключатель размыкается: вызовы
+сразу отклоняются исключением CircuitOpen, и запросы не ждут
+заведомо неработающий процесс. Через RECEIPT_BREAKER_RESET секунд
+выключатель пропускает один пробный вызов (полуоткрытое состояние):
+успех замыкает его, ошибка снова размыкает.
+
+Состояние хранится в памяти процесса, каждый воркер gunicorn
+ведёт свой выключатель. Значения отдаются эндпоинтом /metrics.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Значение метрики состояния выключателя.
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpen(Exception):
+    """
+    Вызов отклонён: выключатель разомкнут.
+    """
+
+
+class CircuitBreaker:
+    """
+    Выключатель, размыкающийся после серии ошибок подряд.
+
+    Attributes:
+        name (str): Имя выключателя в метриках.
+        clock (callable): Источник монотонного времени в секундах.
+    """
+
+    def __init__(self, name: str, clock=time.monotonic):
+        self.name = name
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self._counters = {"failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def failure_threshold(self) -> int:
+        return settings.RECEIPT_BREAKER_FAILURES
+
+    @property
+    def reset_timeout(self) -> float:
+        return settings.RECEIPT_BREAKER_RESET
+
+    @property
+    def state(self) -> str:
+        """
+        Возвращает текущее состояние с учётом истёкшего таймаута.
+        """
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if (
+            self._state == OPEN
+            and self.clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = HALF_OPEN
+            self._trial = False
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Проверяет, можно ли выполнить вызов.
+
+        В полуоткрытом состоянии разрешается только один пробный
+        вызов, остальные отклоняются до его завершения.
+
+        Returns:
+            bool: True, если вызов разрешён.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            self._counters["rejected"] += 1
+            return False
+
+    def record_success(self):
+        """
+        Учитывает успешный вызов и замыкает выключатель.
+        """
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trial = False
+
+    def record_failure(self):
+        """
+        Учитывает ошибку и размыкает выключатель, если ошибок
+        подряд стало не меньше порога или не удался пробный вызов.
+        """
+        with self._lock:
+            self._counters["failures"] += 1
+            self._failures += 1
+            if (
+                self._state == HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                if self._state != OPEN:
+                    self._counters["opened"] += 1
+                self._state = OPEN
+                self._opened_at = self.clock()
+                self._trial = False
+
+    def call(self, func, *args, **kwargs):
+        """
+        Выполняет func через выключатель.
+
+        Raises:
+            CircuitOpen: Если выключатель разомкнут.
+            Exception: Исключение, выброшенное func.
+        """
+        if not self.allow():
+            raise CircuitOpen(f"Выключатель {self.name} разомкнут")
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self) -> dict:
+        """
+        Возвращает состояние и счётчики выключателя.
+        """
+        with self._lock:
+            return {"state": self._current_state(), **self._counters}
+
+    def reset(self):
+        """
+        Замыкает выключатель и сбрасывает счётчики.
+        """
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trial = False
+            self._counters = dict.fromkeys(self._counters, 0)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """
+    Возвращает выключатель процесса с заданным именем.
+    """
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def pdf_breaker() -> CircuitBreaker:
+    """
+    Возвращает выключатель рендеринга PDF (wkhtmltopdf).
+    """
+    return get_breaker("pdf")
+
+
+def snapshot() -> dict:
+    """
+    Возвращает состояние всех выключателей процесса.
+    """
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+def reset():
+    """
+    Замыкает все выключатели и сбрасывает их счётчики.
+    """
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    for breaker in breakers:
+        breaker.reset()
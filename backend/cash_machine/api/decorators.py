@@ -12,11 +12,42 @@ from .serializers import (
     NotFoundErrorSerializer,
 )
 
+
+def query_budget(limit: int):
+    """
+    Задаёт бюджет запросов к БД для представления.
+
+    Бюджет проверяется middleware QueryCountMiddleware: при превышении
+    пишется предупреждение в лог и увеличивается метрика over_budget.
+
+    Args:
+        limit (int): Максимальное количество SQL-запросов на один
+            HTTP-запрос к представлению.
+
+    Returns:
+        Callable: Декоратор класса или функции представления.
+    """
+
+    def decorator(view):
+        view.query_budget = limit
+        return view
+
+    return decorator
+
+
 check_post_schema = extend_schema_view(
     post=extend_schema(
         request=ItemSerializer(many=True),
         summary="Метод для генерации QR-кода.",
         description="Этот метод позволяет сгенерировать QR-код.\n\n"
+        "Формат ответа выбирается по заголовку Accept: image/png "
+        "(по умолчанию), image/svg+xml, application/vnd.escpos "
+        "(чек в командах термопринтера ESC/POS в кодировке CP866 "
+        "с QR-кодом; ширина строки задаётся параметром columns, "
+        "например application/vnd.escpos; columns=48 для ленты 80 мм) "
+        "или application/json "
+        "(идентификатор чека, ссылка и суммы без изображения). "
+        "Ошибки всегда возвращаются в формате JSON.\n\n"
         "Пример POST-запроса:\n\n"
         "{\n\n"
         '    "items": [1, 2, 3]\n\n'
@@ -25,6 +56,9 @@ check_post_schema = extend_schema_view(
             200: OpenApiResponse(
                 description="Документ успешно создан.",
             ),
+            406: OpenApiResponse(
+                description="Error: Not Acceptable",
+            ),
             400: OpenApiResponse(
                 response=BadRequestErrorSerializer,
                 description="Error: Bad Request",
@@ -72,6 +106,35 @@ qrcode_get_schema = extend_schema_view(
 )
 
 
+receipt_token_get_schema = extend_schema_view(
+    get=extend_schema(
+        summary="Метод для получения чека по короткой ссылке из QR-кода.",
+        description="Этот метод позволяет получить чек по подписанному "
+        "токену из ссылки /r/<token>.\n\n"
+        "Если файла чека нет на сервере, PDF формируется заново "
+        "по сохранённым строкам чека.",
+        parameters=[
+            OpenApiParameter(
+                name="token", type=str, location=OpenApiParameter.PATH
+            )
+        ],
+        responses={
+            200: OpenApiResponse(
+                description="application/pdf",
+            ),
+            404: OpenApiResponse(
+                response=NotFoundErrorSerializer,
+                description="Error: Not Found",
+            ),
+            500: OpenApiResponse(
+                response=InternalServerErrorSerializer,
+                description="Error: Internal server error",
+            ),
+        },
+    ),
+)
+
+
 create_items_post_schema = extend_schema_view(
     post=extend_schema(
         request=ItemSerializer(many=True),
@@ -103,3 +166,209 @@ create_items_post_schema = extend_schema_view(
         },
     ),
 )
+
+
+healthz_get_schema = extend_schema_view(
+    get=extend_schema(
+        summary="Проверка живости процесса.",
+        description="Возвращает 200, если процесс запущен и отвечает.",
+        responses={
+            200: OpenApiResponse(description="Процесс запущен."),
+        },
+    ),
+)
+
+
+readyz_get_schema = extend_schema_view(
+    get=extend_schema(
+        summary="Проверка готовности к приёму трафика.",
+        description="Возвращает 200, если база данных доступна, "
+        "а шаблон чека и рендерер PDF прогреты при запуске воркера, "
+        "иначе 503. Прогрев эндпоинтом не запускается.",
+        responses={
+            200: OpenApiResponse(description="Сервис готов."),
+            503: OpenApiResponse(description="Сервис не готов."),
+        },
+    ),
+)
+
+
+receipts_export_get_schema = extend_schema_view(
+    get=extend_schema(
+        summary="Метод для выгрузки чеков за период.",
+        description="Этот метод позволяет администратору выгрузить "
+        "все чеки за период в виде ZIP-архива.\n\n"
+        "Границы периода задаются параметрами from и to в формате "
+        "YYYY-MM-DD (конечная дата включается) или ISO 8601.\n\n"
+        "С параметром store=true архив сохраняется в S3-хранилище "
+        "чеков, а ответ перенаправляет на подписанную ссылку.",
+        parameters=[
+            OpenApiParameter(
+                name="from", type=str, location=OpenApiParameter.QUERY
+            ),
+            OpenApiParameter(
+                name="to", type=str, location=OpenApiParameter.QUERY
+            ),
+            OpenApiParameter(
+                name="store", type=bool, location=OpenApiParameter.QUERY
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                description="application/zip",
+            ),
+            302: OpenApiResponse(
+                description="Ссылка на сохранённый архив.",
+            ),
+            400: OpenApiResponse(
+                response=BadRequestErrorSerializer,
+                description="Error: Bad Request",
+            ),
+        },
+    ),
+)
+
+
+sales_report_get_schema = extend_schema_view(
+    get=extend_schema(
+        summary="Метод для получения отчёта о продажах.",
+        description="Этот метод позволяет администратору получить "
+        "выручку, НДС и количество проданных товаров за период "
+        "с группировкой по дням (day), часам (hour) или товарам (item).",
+        parameters=[
+            OpenApiParameter(
+                name="from", type=str, location=OpenApiParameter.QUERY
+            ),
+            OpenApiParameter(
+                name="to", type=str, location=OpenApiParameter.QUERY
+            ),
+            OpenApiParameter(
+                name="group",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                enum=["day", "hour", "item"],
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                description="Строки отчёта.",
+            ),
+            400: OpenApiResponse(
+                response=BadRequestErrorSerializer,
+                description="Error: Bad Request",
+            ),
+        },
+    ),
+)
+
+
+items_search_get_schema = extend_schema_view(
+    get=extend_schema(
+        summary="Метод для поиска товаров по названию.",
+        description="Этот метод позволяет найти товары по словам "
+        "или началу слов названия без учёта регистра.\n\n"
+        "Пример GET-запроса: /api/v1/items/search/?q=мак",
+        parameters=[
+            OpenApiParameter(
+                name="q", type=str, location=OpenApiParameter.QUERY
+            ),
+            OpenApiParameter(
+                name="limit", type=int, location=OpenApiParameter.QUERY
+            ),
+        ],
+        responses={
+            200: ItemSerializer(many=True),
+            400: OpenApiResponse(
+                response=BadRequestErrorSerializer,
+                description="Error: Bad Request",
+            ),
+        },
+    ),
+)
+
+
+receipts_list_get_schema = extend_schema_view(
+    get=extend_schema(
+        summary="Метод для поиска чеков.",
+        description="Этот метод позволяет администраторам найти чеки "
+        "по периоду создания (from, to), минимальной сумме (min_total) "
+        "и товару (item).\n\n"
+        "Чеки возвращаются от новых к старым, ссылка на следующую "
+        "страницу с ключом after возвращается в поле next.",
+        parameters=[
+            OpenApiParameter(
+                name="from", type=str, location=OpenApiParameter.QUERY
+            ),
+            OpenApiParameter(
+                name="to", type=str, location=OpenApiParameter.QUERY
+            ),
+            OpenApiParameter(
+                name="min_total", type=str, location=OpenApiParameter.QUERY
+            ),
+            OpenApiParameter(
+                name="item", type=int, location=OpenApiParameter.QUERY
+            ),
+            OpenApiParameter(
+                name="after", type=str, location=OpenApiParameter.QUERY
+            ),
+            OpenApiParameter(
+                name="limit", type=int, location=OpenApiParameter.QUERY
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(description="Страница найденных чеков."),
+            400: OpenApiResponse(
+                response=BadRequestErrorSerializer,
+                description="Error: Bad Request",
+            ),
+        },
+    ),
+)
+
+
+items_list_get_schema = extend_schema_view(
+    get=extend_schema(
+        summary="Метод для постраничной выгрузки каталога товаров.",
+        description="Этот метод позволяет кассе синхронизировать каталог.\n\n"
+        "Страница начинается с товара, следующего за id из параметра "
+        "after, ссылка на следующую страницу возвращается в поле next. "
+        "С параметром since_version возвращаются только изменения "
+        "после указанной версии каталога и список удалённых товаров. "
+        "Если каталог не изменился, запрос с заголовком If-None-Match "
+        "получает ответ 304.",
+        parameters=[
+            OpenApiParameter(
+                name="after", type=int, location=OpenApiParameter.QUERY
+            ),
+            OpenApiParameter(
+                name="limit", type=int, location=OpenApiParameter.QUERY
+            ),
+            OpenApiParameter(
+                name="since_version",
+                type=int,
+                location=OpenApiParameter.QUERY,
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(description="Страница каталога."),
+            304: OpenApiResponse(description="Каталог не изменился."),
+            400: OpenApiResponse(
+                response=BadRequestErrorSerializer,
+                description="Error: Bad Request",
+            ),
+        },
+    ),
+)
+
+
+metrics_get_schema = extend_schema_view(
+    get=extend_schema(
+        summary="Метрики обработки запросов.",
+        description="Возвращает счётчики запросов, SQL-запросов, времени SQL "
+        "и превышений бюджета запросов по представлениям "
+        "в текстовом формате Prometheus.",
+        responses={
+            200: OpenApiResponse(description="text/plain"),
+        },
+    ),
+)
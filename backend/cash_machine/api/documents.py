@@ -0,0 +1,260 @@
+"""
+Постраничный HTML чека и его потоковая передача в wkhtmltopdf.
+
+Шаблон "receipt.html" рендерится Jinja2 генератором
+(Template.generate): HTML чека не собирается в одну строку,
+а отдаётся частями по CHUNK_SIZE символов и сразу пишется в stdin
+wkhtmltopdf (см. run_streaming). Пиковая память на HTML чека из
+десятков тысяч строк не зависит от количества строк (замер:
+python -m benchmarks.bench_large_receipt).
+
+Строки чека разбиваются на страницы по RECEIPT_PAGE_LINES строк,
+а на первую страницу, где над таблицей выводится шапка чека,
+выводится RECEIPT_FIRST_PAGE_LINES строк (см. paginate). На каждой
+странице повторяется шапка таблицы, а у многостраничного чека
+выводятся номер страницы, итог по странице и итог нарастающим итогом.
+Значения по умолчанию оценены по CSS шаблона, а не замерены:
+помещается ли страница на лист A7, проверяет RenderedPagesTest
+(tests/test_documents.py) с wkhtmltopdf и шрифтами чека.
+
+Шрифты wkhtmltopdf берёт из набора RECEIPT_FONTCONFIG_FILE
+(см. renderer_environment), кэш которого построен при сборке образа.
+"""
+
+import math
+import os
+import subprocess
+import threading
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
+
+from django.conf import settings
+
+from . import lazy
+
+TEMPLATE_NAME = "receipt.html"
+# Размер части HTML, передаваемой в wkhtmltopdf, в символах.
+CHUNK_SIZE = 64 * 1024
+
+
+class Page(NamedTuple):
+    """
+    Страница чека.
+
+    Attributes:
+        number (int): Номер страницы, начиная с 1.
+        items (list): Строки чека на странице.
+        subtotal: Сумма строк страницы.
+        running_total: Сумма строк этой и предыдущих страниц.
+    """
+
+    number: int
+    items: list
+    subtotal: object
+    running_total: object
+
+
+def paginate(
+    items: Iterable, per_page: int, first_page: int = None
+) -> Iterator[Page]:
+    """
+    Разбивает строки чека на страницы.
+
+    Args:
+        items (Iterable): Строки чека (словари с ключом
+            total_item_price).
+        per_page (int): Количество строк на странице.
+        first_page (int): Количество строк на первой странице,
+            по умолчанию per_page.
+
+    Yields:
+        Page: Страницы по порядку. Пустой чек - одна пустая страница.
+    """
+    number, page, running_total = 1, [], 0
+    size = first_page or per_page
+    for item in items:
+        page.append(item)
+        if len(page) == size:
+            subtotal = sum(row["total_item_price"] for row in page)
+            running_total += subtotal
+            yield Page(number, page, subtotal, running_total)
+            number, page, size = number + 1, [], per_page
+    if page or number == 1:
+        subtotal = sum(row["total_item_price"] for row in page)
+        yield Page(number, page, subtotal, running_total + subtotal)
+
+
+def page_count(line_count: int, per_page: int, first_page: int = None) -> int:
+    """
+    Возвращает количество страниц чека из line_count строк.
+    """
+    rest = line_count - (first_page or per_page)
+    return 1 + max(0, math.ceil(rest / per_page))
+
+
+def buffered(parts: Iterable[str], size: int = CHUNK_SIZE):
+    """
+    Объединяет мелкие части HTML в части не меньше size символов.
+
+    Генератор шаблона отдаёт HTML по фрагментам в несколько символов;
+    запись каждого фрагмента в канал процесса была бы слишком дорогой.
+    """
+    buffer, length = [], 0
+    for part in parts:
+        buffer.append(part)
+        length += len(part)
+        if length >= size:
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+class ReceiptDocument:
+    """
+    HTML чека, который рендерится по частям при каждом проходе.
+
+    Документ можно обойти несколько раз: для PDF (частями, без сборки
+    в строку) и для HTML-версии чека, если PDF не сформирован.
+    str(document) возвращает HTML целиком.
+
+    Args:
+        context (dict): Данные чека из CashMachineView.receipt_context.
+        per_page (int): Строк на странице, по умолчанию
+            RECEIPT_PAGE_LINES.
+        first_page (int): Строк на первой странице, по умолчанию
+            RECEIPT_FIRST_PAGE_LINES, а при заданном per_page - per_page.
+    """
+
+    def __init__(
+        self, context: dict, per_page: int = None, first_page: int = None
+    ):
+        self.context = context
+        if per_page is None:
+            per_page = settings.RECEIPT_PAGE_LINES
+            first_page = first_page or settings.RECEIPT_FIRST_PAGE_LINES
+        self.per_page = per_page
+        self.first_page = first_page or per_page
+
+    def __iter__(self) -> Iterator[str]:
+        items = self.context["items"]
+        template = lazy.jinja_environment().get_template(TEMPLATE_NAME)
+        parts = template.generate(
+            self.context,
+            pages=paginate(items, self.per_page, self.first_page),
+            page_count=page_count(len(items), self.per_page, self.first_page),
+        )
+        return buffered(parts)
+
+    def __str__(self) -> str:
+        return "".join(self)
+
+
+def render_receipt_html(context: dict) -> str:
+    """
+    Рендерит HTML чека в строку.
+
+    Args:
+        context (dict): Данные чека.
+
+    Returns:
+        str: HTML чека.
+    """
+    return str(ReceiptDocument(context))
+
+
+def renderer_environment():
+    """
+    Возвращает окружение процесса wkhtmltopdf.
+
+    Returns:
+        dict | None: Окружение текущего процесса с FONTCONFIG_FILE
+        из настройки RECEIPT_FONTCONFIG_FILE или None (окружение
+        наследуется), если набор шрифтов не задан.
+    """
+    if not settings.RECEIPT_FONTCONFIG_FILE:
+        return None
+    return dict(os.environ, FONTCONFIG_FILE=settings.RECEIPT_FONTCONFIG_FILE)
+
+
+def _drain(stream, parts: list):
+    """
+    Читает поток процесса до конца в отдельном потоке.
+    """
+    parts.append(stream.read())
+    stream.close()
+
+
+def run_streaming(
+    args: list, chunks: Iterable[str], timeout: float, env: dict = None
+) -> tuple:
+    """
+    Запускает процесс и передаёт ему HTML в stdin по частям.
+
+    stdout и stderr читаются в отдельных потоках, чтобы процесс
+    не блокировался на заполненном канале, пока в stdin пишется HTML.
+    Процесс, не завершившийся за timeout секунд, останавливается.
+
+    Args:
+        args (list): Команда запуска.
+        chunks (Iterable[str]): Части HTML.
+        timeout (float): Таймаут в секундах.
+        env (dict): Окружение процесса, по умолчанию - текущее.
+
+    Returns:
+        tuple: Код возврата, stdout (bytes) и stderr (str).
+
+    Raises:
+        subprocess.TimeoutExpired: Если процесс не уложился в таймаут.
+    """
+    process = subprocess.Popen(
+        args,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+    )
+    expired = threading.Event()
+
+    def expire():
+        expired.set()
+        process.kill()
+
+    timer = threading.Timer(timeout, expire)
+    timer.start()
+    stdout, stderr = [], []
+    readers = [
+        threading.Thread(target=_drain, args=(process.stdout, stdout)),
+        threading.Thread(target=_drain, args=(process.stderr, stderr)),
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        try:
+            for chunk in chunks:
+                process.stdin.write(chunk.encode())
+        except BrokenPipeError:
+            # Процесс завершился, не дочитав HTML; причина - в коде
+            # возврата и stderr.
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+    except BaseException:
+        process.kill()
+        raise
+    finally:
+        for reader in readers:
+            reader.join()
+        returncode = process.wait()
+        timer.cancel()
+
+    if expired.is_set():
+        raise subprocess.TimeoutExpired(args, timeout)
+    return (
+        returncode,
+        b"".join(stdout),
+        b"".join(stderr).decode("utf-8", errors="replace"),
+    )
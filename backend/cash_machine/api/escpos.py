@@ -0,0 +1,190 @@
+"""
+Формирование чека в виде команд ESC/POS для термопринтеров.
+
+Чек печатается теми же данными, что и PDF (реквизиты продавца,
+строки, итог, НДС), но как поток команд принтера: текст в кодировке
+CP866 и QR-код встроенной командой принтера (GS ( k), без
+растрирования на стороне сервера или клиента. Чек из нескольких
+строк занимает несколько сотен байт.
+
+Ширина строки задаётся в символах шрифта A: 32 для ленты 58 мм,
+48 для ленты 80 мм.
+"""
+
+from decimal import Decimal
+
+ENCODING = "cp866"
+
+ESC = b"\x1b"
+GS = b"\x1d"
+
+INITIALIZE = ESC + b"@"
+# Таблица символов PC866 (кириллица) в принтерах Epson и совместимых.
+CODE_PAGE_CP866 = ESC + b"t\x11"
+ALIGN_LEFT = ESC + b"a\x00"
+ALIGN_CENTER = ESC + b"a\x01"
+BOLD_ON = ESC + b"E\x01"
+BOLD_OFF = ESC + b"E\x00"
+# Режим печати: жирный шрифт двойной высоты и обычный шрифт.
+TITLE_ON = ESC + b"!\x18"
+TITLE_OFF = ESC + b"!\x00"
+# Прогон ленты на 4 строки и частичный отрез.
+FEED_AND_CUT = GS + b"V\x42\x04"
+
+COLUMNS_58MM = 32
+COLUMNS_80MM = 48
+MIN_COLUMNS = 24
+MAX_COLUMNS = 64
+
+SELLER_DETAILS = ("ИНН 771234567800", "КПП 912345678")
+
+
+def encode(text: str) -> bytes:
+    """
+    Кодирует текст в CP866, заменяя неподдерживаемые символы на "?".
+    """
+    return text.encode(ENCODING, errors="replace")
+
+
+def money(value) -> str:
+    """
+    Форматирует сумму с двумя знаками после запятой.
+    """
+    return f"{Decimal(value):.2f}"
+
+
+def wrap(text: str, columns: int) -> list:
+    """
+    Разбивает текст на строки не длиннее columns символов.
+
+    Слова длиннее строки переносятся посимвольно.
+    """
+    lines, line = [], ""
+    for word in text.split():
+        while len(word) > columns:
+            if line:
+                lines.append(line)
+                line = ""
+            lines.append(word[:columns])
+            word = word[columns:]
+        if not line:
+            line = word
+        elif len(line) + 1 + len(word) <= columns:
+            line = f"{line} {word}"
+        else:
+            lines.append(line)
+            line = word
+    if line or not lines:
+        lines.append(line)
+    return lines
+
+
+def justify(left: str, right: str, columns: int) -> str:
+    """
+    Возвращает строку с текстом слева и суммой справа.
+    """
+    space = max(1, columns - len(left) - len(right))
+    return f"{left}{' ' * space}{right}"[-columns:]
+
+
+def qr_code(data: str, module_size: int = 5) -> bytes:
+    """
+    Возвращает команды печати QR-кода средствами принтера.
+
+    Args:
+        data (str): Содержимое QR-кода (ссылка на чек).
+        module_size (int): Размер модуля QR-кода в точках (1-16).
+
+    Returns:
+        bytes: Команды GS ( k: модель 2, размер модуля,
+        уровень коррекции M, сохранение данных и печать.
+    """
+    payload = data.encode("ascii", errors="replace")
+    length = len(payload) + 3
+    return b"".join(
+        (
+            GS + b"(k\x04\x00\x31\x41\x32\x00",
+            GS + b"(k\x03\x00\x31\x43" + bytes([module_size]),
+            GS + b"(k\x03\x00\x31\x45\x31",
+            GS
+            + b"(k"
+            + bytes([length % 256, length // 256])
+            + b"\x31\x50\x30"
+            + payload,
+            GS + b"(k\x03\x00\x31\x51\x30",
+        )
+    )
+
+
+def render_receipt(
+    data: dict, receipt: dict = None, columns: int = COLUMNS_58MM
+) -> bytes:
+    """
+    Формирует чек в виде потока команд ESC/POS.
+
+    Args:
+        data (dict): Данные чека из ответа API (url, total_price,
+            total_nds_price).
+        receipt (dict): Контекст шаблона чека (company_name, items,
+            current_time, payment_method, customer_name). Без него
+            печатаются только итоги и QR-код.
+        columns (int): Ширина строки в символах.
+
+    Returns:
+        bytes: Команды принтера, заканчивающиеся отрезом ленты.
+    """
+    receipt = receipt or {}
+    separator = "-" * columns
+    parts = [INITIALIZE, CODE_PAGE_CP866, ALIGN_CENTER]
+
+    def line(text: str = ""):
+        parts.append(encode(text) + b"\n")
+
+    if receipt.get("company_name"):
+        parts.append(TITLE_ON)
+        for text in wrap(receipt["company_name"], columns):
+            line(text)
+        parts.append(TITLE_OFF)
+    for text in SELLER_DETAILS:
+        line(text)
+    line("Кассовый чек")
+    if receipt.get("current_time"):
+        line(receipt["current_time"])
+
+    parts.append(ALIGN_LEFT)
+    line(separator)
+    for item in receipt.get("items", ()):
+        for text in wrap(str(item["title"]), columns):
+            line(text)
+        line(
+            justify(
+                f"  {item['quantity']} x {money(item['price'])}",
+                f"={money(item['total_item_price'])}",
+                columns,
+            )
+        )
+    line(separator)
+
+    parts.append(BOLD_ON)
+    line(justify("ИТОГ", f"={money(data['total_price'])}", columns))
+    parts.append(BOLD_OFF)
+    if receipt.get("payment_method"):
+        line(
+            justify(
+                receipt["payment_method"],
+                f"={money(data['total_price'])}",
+                columns,
+            )
+        )
+    line(
+        justify("Сумма НДС 20%", f"={money(data['total_nds_price'])}", columns)
+    )
+    if receipt.get("customer_name"):
+        line(f"Чек выдан: {receipt['customer_name']}"[:columns])
+
+    parts.append(ALIGN_CENTER)
+    parts.append(qr_code(data["url"]))
+    line()
+    line("Спасибо за покупку!")
+    parts.append(FEED_AND_CUT)
+    return b"".join(parts)
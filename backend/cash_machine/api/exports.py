@@ -0,0 +1,65 @@
+"""
+Потоковое формирование ZIP-архивов.
+
+Архив пишется в небольшой промежуточный буфер, который опустошается
+после каждой записанной части, поэтому объём используемой памяти
+не зависит от размера архива, а временные файлы не создаются.
+"""
+
+import io
+import zipfile
+
+
+class _ZipStream(io.RawIOBase):
+    """
+    Несмещаемый поток, накапливающий записанные байты до выборки.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self) -> bytes:
+        """
+        Возвращает накопленные байты и очищает буфер.
+        """
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries):
+    """
+    Формирует ZIP-архив по частям.
+
+    Так как поток несмещаемый, zipfile записывает размеры и CRC
+    каждого файла в дескриптор данных после его содержимого.
+
+    Args:
+        entries: Итерируемый объект кортежей (имя, дата и время
+            в виде кортежа из шести чисел, итератор частей содержимого).
+
+    Yields:
+        bytes: Очередная часть архива.
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(
+        stream, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1
+    ) as archive:
+        for name, date_time, chunks in entries:
+            info = zipfile.ZipInfo(name, date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with archive.open(info, "w", force_zip64=True) as file:
+                for chunk in chunks:
+                    file.write(chunk)
+                    data = stream.pop()
+                    if data:
+                        yield data
+            yield stream.pop()
+    yield stream.pop()
@@ -0,0 +1,65 @@
+"""
+Ленивый доступ к тяжёлым зависимостям генерации чеков.
+
+Модули pdfkit, qrcode (вместе с Pillow) и jinja2 импортируются
+при первом обращении, а не при загрузке api.views. Благодаря этому
+команды manage.py, тесты и воркеры gunicorn не платят за импорт
+библиотек, которые им не нужны. При запуске gunicorn с preload_app
+модули загружаются один раз в мастер-процессе (см. gunicorn.conf.py).
+"""
+
+import functools
+from importlib import import_module
+
+HEAVY_MODULES = (
+    "pdfkit",
+    "qrcode",
+    "qrcode.image.pil",
+    "PIL.Image",
+    "jinja2",
+)
+
+
+@functools.cache
+def pdfkit():
+    """
+    Возвращает модуль pdfkit.
+    """
+    return import_module("pdfkit")
+
+
+@functools.cache
+def qrcode():
+    """
+    Возвращает модуль qrcode.
+    """
+    return import_module("qrcode")
+
+
+@functools.cache
+def jinja_environment():
+    """
+    Возвращает окружение Jinja2 для рендеринга чеков.
+
+    Окружение создаётся один раз на процесс. Шаблоны загружаются
+    из каталога templates, HTML-шаблоны экранируют данные.
+    """
+    from django.conf import settings
+
+    jinja2 = import_module("jinja2")
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(settings.BASE_DIR / "templates"),
+        autoescape=jinja2.select_autoescape(),
+    )
+
+
+def preload():
+    """
+    Импортирует все тяжёлые зависимости заранее.
+
+    Вызывается в мастер-процессе gunicorn, чтобы воркеры
+    получали уже загруженные модули после fork.
+    """
+    for name in HEAVY_MODULES:
+        import_module(name)
+    jinja_environment()
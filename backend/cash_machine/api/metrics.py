@@ -0,0 +1,120 @@
+"""
+Метрики обработки запросов в памяти процесса.
+
+Для каждого представления накапливаются количество запросов,
+число SQL-запросов, суммарное время SQL и число превышений
+бюджета запросов к БД. Значения собираются middleware
+QueryCountMiddleware и отдаются эндпоинтом /metrics в текстовом
+формате Prometheus вместе с состоянием выключателей рендереров
+(api.breaker) и количеством записей журнала, отброшенных
+при переполнении очереди (cash_machine.log). Каждый воркер
+gunicorn ведёт свои счётчики, поэтому при нескольких воркерах они
+суммируются на стороне сборщика.
+"""
+
+import threading
+from collections import defaultdict
+
+from cash_machine import log
+
+from . import breaker
+
+_lock = threading.Lock()
+_views = defaultdict(
+    lambda: {
+        "requests": 0,
+        "queries": 0,
+        "sql_seconds": 0.0,
+        "over_budget": 0,
+    }
+)
+
+METRICS = (
+    ("requests", "counter", "Количество обработанных запросов."),
+    ("queries", "counter", "Количество выполненных SQL-запросов."),
+    ("sql_seconds", "counter", "Суммарное время выполнения SQL, секунды."),
+    ("over_budget", "counter", "Количество превышений бюджета запросов."),
+)
+
+BREAKER_METRICS = (
+    ("failures", "counter", "Количество ошибок рендерера."),
+    ("rejected", "counter", "Количество вызовов, отклонённых выключателем."),
+    ("opened", "counter", "Количество размыканий выключателя."),
+)
+
+
+def record(view: str, queries: int, sql_seconds: float, over_budget: bool):
+    """
+    Учитывает обработанный запрос в метриках представления.
+
+    Args:
+        view (str): Имя представления.
+        queries (int): Количество SQL-запросов.
+        sql_seconds (float): Суммарное время SQL в секундах.
+        over_budget (bool): Превышен ли бюджет запросов.
+    """
+    with _lock:
+        values = _views[view]
+        values["requests"] += 1
+        values["queries"] += queries
+        values["sql_seconds"] += sql_seconds
+        values["over_budget"] += int(over_budget)
+
+
+def snapshot() -> dict:
+    """
+    Возвращает копию накопленных метрик по представлениям.
+    """
+    with _lock:
+        return {view: dict(values) for view, values in _views.items()}
+
+
+def reset():
+    """
+    Сбрасывает накопленные метрики.
+    """
+    with _lock:
+        _views.clear()
+
+
+def render_prometheus() -> str:
+    """
+    Формирует метрики в текстовом формате Prometheus.
+    """
+    views = snapshot()
+    lines = []
+    for name, kind, help_text in METRICS:
+        metric = f"cash_machine_view_{name}_total"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for view, values in sorted(views.items()):
+            lines.append(f'{metric}{{view="{view}"}} {values[name]}')
+
+    breakers = breaker.snapshot()
+    metric = "cash_machine_breaker_state"
+    lines.append(
+        f"# HELP {metric} Состояние выключателя: "
+        "0 - замкнут, 1 - полуоткрыт, 2 - разомкнут."
+    )
+    lines.append(f"# TYPE {metric} gauge")
+    for name, values in sorted(breakers.items()):
+        state = breaker.STATE_VALUES[values["state"]]
+        lines.append(f'{metric}{{breaker="{name}"}} {state}')
+    for name, kind, help_text in BREAKER_METRICS:
+        metric = f"cash_machine_breaker_{name}_total"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for breaker_name, values in sorted(breakers.items()):
+            lines.append(
+                f'{metric}{{breaker="{breaker_name}"}} {values[name]}'
+            )
+
+    metric = "cash_machine_log_dropped_total"
+    lines.append(
+        f"# HELP {metric} Количество записей журнала, отброшенных "
+        "при переполнении очереди."
+    )
+    lines.append(f"# TYPE {metric} counter")
+    for handler, dropped in sorted(log.dropped_records().items()):
+        lines.append(f'{metric}{{handler="{handler}"}} {dropped}')
+    return "\n".join(lines) + "\n"
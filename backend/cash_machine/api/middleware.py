@@ -0,0 +1,107 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Исключение для представления, превысившего бюджет запросов к БД.
+    """
+
+
+class QueryCounter:
+    """
+    Обёртка выполнения SQL, считающая запросы и их время.
+
+    Подключается через connection.execute_wrapper и работает
+    независимо от DEBUG, не сохраняя текст запросов.
+
+    Attributes:
+        count (int): Количество выполненных запросов.
+        duration (float): Суммарное время выполнения в секундах.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class QueryCountMiddleware:
+    """
+    Middleware учёта запросов к БД для каждого HTTP-запроса.
+
+    Добавляет в ответ заголовки X-DB-Query-Count и X-DB-Query-Time
+    (миллисекунды), записывает значения в метрики (api.metrics)
+    и сравнивает количество запросов с бюджетом представления,
+    заданным декоратором query_budget. При превышении пишется
+    предупреждение в лог, а при QUERY_BUDGET_STRICT=True
+    выбрасывается QueryBudgetExceeded (используется в тестах).
+
+    Запросы, выполняемые при отдаче потокового ответа,
+    выполняются после возврата из middleware и не учитываются.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        request.query_budget = None
+        request.query_view_name = None
+
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(counter)
+                )
+            response = self.get_response(request)
+
+        budget = request.query_budget
+        over_budget = budget is not None and counter.count > budget
+        response["X-DB-Query-Count"] = str(counter.count)
+        response["X-DB-Query-Time"] = f"{counter.duration * 1000:.2f}"
+        if request.query_view_name is not None:
+            metrics.record(
+                request.query_view_name,
+                counter.count,
+                counter.duration,
+                over_budget,
+            )
+
+        if over_budget:
+            if getattr(settings, "QUERY_BUDGET_STRICT", False):
+                raise QueryBudgetExceeded(
+                    f"Превышен бюджет запросов к БД в "
+                    f"{request.query_view_name}: {counter.count} > {budget}"
+                )
+            logger.warning(
+                "Превышен бюджет запросов к БД в %s: %s > %s",
+                request.query_view_name,
+                counter.count,
+                budget,
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        target = view_class or view_func
+        request.query_budget = getattr(target, "query_budget", None)
+        request.query_view_name = getattr(
+            target, "__name__", type(target).__name__
+        )
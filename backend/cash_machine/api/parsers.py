@@ -0,0 +1,51 @@
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson является опциональным
+    orjson = None
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """
+    Быстрый JSON-парсер на основе библиотеки orjson.
+
+    Возвращает те же структуры, что и стандартный JSONParser:
+    дробные числа разбираются как float, а NaN и Infinity отклоняются.
+    Если orjson не установлен, разбор выполняется стандартным JSONParser.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Разбирает входящий поток байтов как JSON.
+
+        Args:
+            stream: Поток с телом запроса.
+            media_type (str): Тип содержимого запроса.
+            parser_context (dict): Контекст разбора.
+
+        Returns:
+            Разобранные данные запроса.
+
+        Raises:
+            ParseError: Если тело запроса не является корректным JSON.
+        """
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        try:
+            content = stream.read()
+            if encoding.lower().replace("-", "") != "utf8":
+                content = content.decode(encoding)
+            return orjson.loads(content)
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,328 @@
+import functools
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson является опциональным
+    orjson = None
+
+from django.conf import settings
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.mediatypes import _MediaType
+
+from . import escpos, lazy
+
+logger = logging.getLogger(__name__)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Быстрый JSON-рендерер на основе библиотеки orjson.
+
+    Формирует тот же JSON, что и стандартный JSONRenderer:
+    типы, которые orjson не умеет сериализовать сам (Decimal, datetime,
+    ленивые строки и т.д.), передаются в JSONEncoder из DRF,
+    поэтому цены в формате Decimal выглядят в ответе так же, как раньше.
+
+    Если orjson не установлен или клиент запросил форматирование
+    с отступами, рендеринг выполняется стандартным JSONRenderer.
+    Им же обрабатываются данные, которые orjson не принимает
+    (например, целые числа шире 64 бит): orjson.JSONEncodeError
+    не должен превращаться в ошибку 500 там, где работает JSONRenderer.
+    Ключи словарей, не являющиеся строками, допускаются, как и в json.
+    """
+
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Преобразует данные в JSON и возвращает строку байтов.
+
+        Args:
+            data: Данные для сериализации.
+            accepted_media_type (str): Согласованный тип содержимого.
+            renderer_context (dict): Контекст рендеринга.
+
+        Returns:
+            bytes: JSON-представление данных.
+        """
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+
+        if (
+            orjson is None
+            or indent is not None
+            or self.ensure_ascii
+            or not self.compact
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder.default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Как и JSONRenderer, экранируем символы U+2028 и U+2029,
+        # чтобы результат оставался корректным подмножеством JavaScript.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
+
+
+def _dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def iter_items_json(header: dict, rows, chunk_size: int = 500):
+    """
+    Формирует JSON со списком товаров по частям.
+
+    Строки (id, title, price) из values_list преобразуются
+    в словари напрямую, без создания объектов модели и ModelSerializer.
+    Результат совпадает с выводом ItemSerializer.
+
+    Args:
+        header (dict): Поля ответа, выводимые перед списком товаров.
+        rows: Итерируемый объект кортежей (id, title, price).
+        chunk_size (int): Количество товаров в одной части.
+
+    Yields:
+        bytes: Очередная часть JSON-документа.
+    """
+    yield _dumps(header)[:-1] + (b"," if header else b"") + b'"items":['
+    batch = []
+    first = True
+    for item_id, title, price in rows:
+        batch.append({"id": item_id, "title": title, "price": str(price)})
+        if len(batch) >= chunk_size:
+            yield (b"" if first else b",") + _dumps(batch)[1:-1]
+            first = False
+            batch = []
+    if batch:
+        yield (b"" if first else b",") + _dumps(batch)[1:-1]
+    yield b"]}"
+
+
+def make_qrcode(url: str):
+    """
+    Создаёт QR-код со ссылкой на чек.
+
+    Args:
+        url (str): Ссылка на файл чека.
+
+    Returns:
+        QRCode: Объект QR-кода с построенной матрицей.
+    """
+    qrcode = lazy.qrcode()
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+    return qr
+
+
+class QRCodePNGRenderer(BaseRenderer):
+    """
+    Рендерер ответа с данными чека в растровый QR-код (PNG).
+
+    Ожидает словарь с ключом url, изображение строится Pillow.
+    """
+
+    media_type = "image/png"
+    format = "png"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Возвращает PNG-изображение QR-кода со ссылкой на чек.
+        """
+        image = make_qrcode(data["url"]).make_image(
+            fill_color="black", back_color="white"
+        )
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG")
+
+        logger.info("Файл чека в формате QR-кода (PNG) успешно сгенерирован.")
+
+        return buffer.getvalue()
+
+
+class QRCodeSVGRenderer(BaseRenderer):
+    """
+    Рендерер ответа с данными чека в векторный QR-код (SVG).
+
+    Изображение формируется как XML-документ из матрицы QR-кода,
+    без растрирования и PNG-кодирования.
+    """
+
+    media_type = "image/svg+xml"
+    format = "svg"
+    charset = "utf-8"
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Возвращает SVG-изображение QR-кода со ссылкой на чек.
+        """
+        svg = import_module("qrcode.image.svg")
+        image = make_qrcode(data["url"]).make_image(
+            image_factory=svg.SvgPathImage
+        )
+
+        logger.info("Файл чека в формате QR-кода (SVG) успешно сгенерирован.")
+
+        return image.to_string(encoding="unicode").encode(self.charset)
+
+
+class ESCPOSRenderer(BaseRenderer):
+    """
+    Рендерер ответа с данными чека в команды ESC/POS.
+
+    Строки чека берутся из контекста рендеринга (ключ receipt),
+    QR-код печатается встроенной командой принтера. Ширина строки
+    задаётся параметром типа содержимого, например
+    "application/vnd.escpos; columns=48" для ленты 80 мм,
+    по умолчанию 32 символа (лента 58 мм).
+    """
+
+    media_type = "application/vnd.escpos"
+    format = "escpos"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Возвращает чек в виде команд термопринтера.
+        """
+        renderer_context = renderer_context or {}
+        return escpos.render_receipt(
+            data,
+            renderer_context.get("receipt"),
+            self.get_columns(accepted_media_type),
+        )
+
+    @staticmethod
+    def get_columns(accepted_media_type) -> int:
+        """
+        Возвращает ширину строки из параметра columns типа содержимого.
+        """
+        params = _MediaType(accepted_media_type or "").params
+        try:
+            columns = int(params.get("columns", escpos.COLUMNS_58MM))
+        except ValueError:
+            return escpos.COLUMNS_58MM
+        return min(max(columns, escpos.MIN_COLUMNS), escpos.MAX_COLUMNS)
+
+
+@functools.cache
+def pipeline_executor() -> ThreadPoolExecutor:
+    """
+    Возвращает пул потоков для генерации QR-кода и PDF чека.
+
+    wkhtmltopdf работает в отдельном процессе, а Pillow отпускает GIL
+    при кодировании PNG, поэтому обе задачи выполняются параллельно.
+    Пул создаётся при первом обращении, то есть уже в воркере gunicorn.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.RECEIPT_PIPELINE_WORKERS,
+        thread_name_prefix="pipeline",
+    )
+
+
+SMALL = "small"
+LARGE = "large"
+
+
+def receipt_lane(line_count: int, html_size: int) -> str:
+    """
+    Оценивает стоимость рендеринга чека и выбирает полосу пула.
+
+    Время работы wkhtmltopdf растёт с размером документа, поэтому
+    чек считается большим, если в нём больше RECEIPT_LARGE_LINES
+    строк или его HTML-код больше RECEIPT_LARGE_HTML_BYTES.
+
+    Args:
+        line_count (int): Количество строк чека.
+        html_size (int): Длина HTML-кода чека.
+
+    Returns:
+        str: LARGE для больших чеков, иначе SMALL.
+    """
+    if (
+        line_count > settings.RECEIPT_LARGE_LINES
+        or html_size > settings.RECEIPT_LARGE_HTML_BYTES
+    ):
+        return LARGE
+    return SMALL
+
+
+@functools.cache
+def large_executor() -> ThreadPoolExecutor:
+    """
+    Возвращает пул потоков для рендеринга больших чеков.
+
+    Большие чеки выполняются только в этом пуле из
+    RECEIPT_LARGE_WORKERS потоков и не занимают потоки
+    pipeline_executor, зарезервированные для обычных чеков.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.RECEIPT_LARGE_WORKERS,
+        thread_name_prefix="pipeline-large",
+    )
+
+
+def lane_executor(lane: str) -> ThreadPoolExecutor:
+    """
+    Возвращает пул потоков полосы lane.
+
+    При RECEIPT_LARGE_WORKERS=0 отдельной полосы нет
+    и все чеки рендерятся в pipeline_executor.
+    """
+    if lane == LARGE and settings.RECEIPT_LARGE_WORKERS > 0:
+        return large_executor()
+    return pipeline_executor()
+
+
+class PrerenderedRenderer(BaseRenderer):
+    """
+    Рендерер, отдающий содержимое, которое уже формируется в пуле потоков.
+
+    Подменяет согласованный рендерер запроса: повторяет его тип
+    содержимого и кодировку, а при рендеринге ответа только ожидает
+    результат фоновой задачи.
+    """
+
+    def __init__(self, renderer, future):
+        self.media_type = renderer.media_type
+        self.format = renderer.format
+        self.charset = renderer.charset
+        self.render_style = getattr(renderer, "render_style", "text")
+        self.future = future
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Возвращает результат фонового рендеринга.
+        """
+        return self.future.result()
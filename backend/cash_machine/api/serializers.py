@@ -52,3 +52,46 @@ class InternalServerErrorSerializer(serializers.Serializer):
         default="Internal server error.",
         help_text="Сообщение об ошибке",
     )
+
+
+class DailySalesSerializer(serializers.Serializer):
+    """
+    Сериализатор строки отчёта о продажах за день.
+    """
+
+    day = serializers.DateField()
+    quantity = serializers.IntegerField(source="quantity_sum")
+    revenue = serializers.DecimalField(
+        max_digits=14, decimal_places=2, source="revenue_sum"
+    )
+    vat = serializers.DecimalField(
+        max_digits=14, decimal_places=2, source="vat_sum"
+    )
+
+
+class HourlySalesSerializer(serializers.Serializer):
+    """
+    Сериализатор строки отчёта о продажах за час.
+    """
+
+    hour = serializers.DateTimeField()
+    receipts = serializers.IntegerField()
+    quantity = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    vat = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class ItemSalesSerializer(serializers.Serializer):
+    """
+    Сериализатор строки отчёта о продажах товара за период.
+    """
+
+    item_id = serializers.IntegerField()
+    title = serializers.CharField(source="title_value")
+    quantity = serializers.IntegerField(source="quantity_sum")
+    revenue = serializers.DecimalField(
+        max_digits=14, decimal_places=2, source="revenue_sum"
+    )
+    vat = serializers.DecimalField(
+        max_digits=14, decimal_places=2, source="vat_sum"
+    )
@@ -5,7 +5,14 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
-from .views import CreateItemsView
+from .views import (
+    CreateItemsView,
+    ItemListView,
+    ItemSearchView,
+    ReceiptExportView,
+    ReceiptListView,
+    SalesReportView,
+)
 
 urlpatterns = [
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
@@ -20,4 +27,13 @@ urlpatterns = [
         name="redoc",
     ),
     path("create_items/", CreateItemsView.as_view(), name="create_items"),
+    path("items/", ItemListView.as_view(), name="items_list"),
+    path("items/search/", ItemSearchView.as_view(), name="items_search"),
+    path("receipts/", ReceiptListView.as_view(), name="receipts_list"),
+    path(
+        "receipts/export/",
+        ReceiptExportView.as_view(),
+        name="receipts_export",
+    ),
+    path("reports/sales/", SalesReportView.as_view(), name="sales_report"),
 ]
@@ -0,0 +1,200 @@
+"""
+Проверка тела запросов пробития чека и загрузки каталога.
+
+Проверки выполняются простыми сравнениями типов, без сериализаторов
+DRF: на корзину из сотни товаров уходят микросекунды. Размер корзины
+и загружаемого списка ограничен настройками RECEIPT_MAX_ITEMS
+и ITEMS_LOAD_MAX_ROWS, чтобы один запрос не мог занять воркер
+разбором и запросами к БД без ограничений.
+
+Большие списки идентификаторов передаются в БД частями
+(см. filter_in_chunks): у SQLite ограничено количество параметров
+одного запроса.
+"""
+
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import connection
+
+# Ограничения поля Item.price (max_digits=10, decimal_places=2)
+# и Item.title (max_length=255).
+MAX_PRICE = Decimal("99999999.99")
+MAX_TITLE_LENGTH = 255
+# Верхняя граница идентификатора (AutoField хранится как integer).
+MAX_ID = 2**31 - 1
+
+
+class PayloadError(ValueError):
+    """
+    Тело запроса не прошло проверку.
+    """
+
+
+def is_id(value) -> bool:
+    """
+    Проверяет, что значение - неотрицательное целое число,
+    помещающееся в поле идентификатора.
+
+    Логические значения и дробные числа идентификаторами не считаются.
+    """
+    return type(value) is int and 0 <= value <= MAX_ID
+
+
+def validate_cart(data) -> list:
+    """
+    Проверяет тело запроса пробития чека.
+
+    Args:
+        data: Разобранное тело запроса, ожидается {"items": [1, 2]}.
+
+    Returns:
+        list: Идентификаторы товаров в порядке запроса.
+
+    Raises:
+        PayloadError: Если список товаров отсутствует, пуст, длиннее
+            RECEIPT_MAX_ITEMS или содержит не идентификаторы.
+    """
+    if not isinstance(data, dict):
+        raise PayloadError("Ожидается объект с полем items")
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        raise PayloadError("Поле items должно быть непустым списком")
+    if len(items) > settings.RECEIPT_MAX_ITEMS:
+        raise PayloadError(
+            f"В чеке не может быть больше {settings.RECEIPT_MAX_ITEMS} "
+            "товаров"
+        )
+    for value in items:
+        if not is_id(value):
+            raise PayloadError(f"Некорректный идентификатор товара: {value!r}")
+    return items
+
+
+def parse_price(value) -> Decimal:
+    """
+    Преобразует цену товара в Decimal.
+
+    Args:
+        value: Цена из JSON: целое, дробное число или строка.
+
+    Returns:
+        Decimal: Положительная цена не более чем с двумя знаками
+        после запятой.
+
+    Raises:
+        PayloadError: Если цена некорректна.
+    """
+    if type(value) is int or type(value) is str:
+        text = value
+    elif type(value) is float:
+        text = repr(value)
+    else:
+        raise PayloadError("Цена товара должна быть числом")
+    try:
+        price = Decimal(text)
+    except InvalidOperation:
+        raise PayloadError(f"Некорректная цена товара: {value!r}") from None
+    if not price.is_finite() or price <= 0 or price > MAX_PRICE:
+        raise PayloadError(f"Некорректная цена товара: {value!r}")
+    if price.as_tuple().exponent < -2:
+        raise PayloadError(
+            "Цена товара не может содержать больше двух знаков после запятой"
+        )
+    return price
+
+
+def validate_item_row(row) -> tuple:
+    """
+    Проверяет одну строку загрузки каталога.
+
+    Args:
+        row: Словарь с ключами title, price и необязательным id.
+
+    Returns:
+        tuple: Идентификатор (или None), название и цена (Decimal).
+
+    Raises:
+        PayloadError: Если строка некорректна.
+    """
+    if not isinstance(row, dict):
+        raise PayloadError("Товар должен быть объектом")
+    item_id = row.get("id")
+    title = row.get("title")
+    price = row.get("price")
+
+    if not title or not price:
+        raise PayloadError("Название и цена товара обязательны")
+    if item_id is not None and not is_id(item_id):
+        raise PayloadError(f"Некорректный идентификатор товара: {item_id!r}")
+    if not isinstance(title, str) or len(title) > MAX_TITLE_LENGTH:
+        raise PayloadError(
+            "Название товара должно быть строкой не длиннее "
+            f"{MAX_TITLE_LENGTH} символов"
+        )
+    return item_id, title, parse_price(price)
+
+
+def validate_item_rows(data) -> list:
+    """
+    Проверяет размер и тип тела запроса загрузки каталога.
+
+    Строки проверяются по отдельности функцией validate_item_row,
+    чтобы ошибки возвращались для каждой строки.
+
+    Args:
+        data: Разобранное тело запроса, ожидается список товаров.
+
+    Returns:
+        list: Строки загрузки.
+
+    Raises:
+        PayloadError: Если тело не является непустым списком
+            или в нём больше ITEMS_LOAD_MAX_ROWS строк.
+    """
+    if not isinstance(data, list) or not data:
+        raise PayloadError("Ожидается непустой список товаров")
+    if len(data) > settings.ITEMS_LOAD_MAX_ROWS:
+        raise PayloadError(
+            f"За один запрос можно загрузить не больше "
+            f"{settings.ITEMS_LOAD_MAX_ROWS} товаров"
+        )
+    return data
+
+
+def in_chunk_size() -> int:
+    """
+    Возвращает наибольшее количество значений в одном фильтре __in.
+
+    Для SQLite ограничение определяется количеством параметров
+    запроса, для остальных СУБД - настройкой DB_IN_CHUNK_SIZE.
+    """
+    limit = connection.features.max_query_params
+    if limit is None:
+        return settings.DB_IN_CHUNK_SIZE
+    return min(limit, settings.DB_IN_CHUNK_SIZE)
+
+
+def filter_in_chunks(queryset, field: str, values) -> list:
+    """
+    Выполняет queryset.filter(<field>__in=values) частями.
+
+    Значения сортируются и разбиваются на части по in_chunk_size(),
+    результаты частей объединяются. Если частей одна, выполняется
+    один запрос, как и без разбиения.
+
+    Args:
+        queryset (QuerySet): Исходная выборка.
+        field (str): Имя поля.
+        values: Значения фильтра.
+
+    Returns:
+        list: Объединённые результаты всех частей.
+    """
+    values = sorted(set(values))
+    size = in_chunk_size()
+    result = []
+    for start in range(0, len(values), size):
+        stop = start + size
+        result.extend(queryset.filter(**{f"{field}__in": values[start:stop]}))
+    return result
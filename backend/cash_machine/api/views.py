@@ -1,34 +1,164 @@
 import datetime
+import functools
 import logging
-import os
-import pdfkit
-import qrcode
+from decimal import Decimal
 
 from django.conf import settings
-from django.http import FileResponse, Http404, HttpResponse, HttpRequest
-from django.shortcuts import get_list_or_404
-from django.template.loader import render_to_string
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Max, Q, Sum
+from django.utils import dateparse, timezone
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
 from django.views.decorators.csrf import csrf_exempt
 from drf_spectacular.utils import extend_schema
-from jinja2 import Environment, FileSystemLoader
-from PIL import Image
 from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from . import lazy, metrics, warmup
+from .breaker import OPEN, pdf_breaker
+from .exports import stream_zip
+from .documents import (
+    ReceiptDocument,
+    renderer_environment,
+    run_streaming,
+)
 from .decorators import (
     check_post_schema,
     qrcode_get_schema,
     create_items_post_schema,
+    healthz_get_schema,
+    readyz_get_schema,
+    receipts_export_get_schema,
+    receipts_list_get_schema,
+    sales_report_get_schema,
+    items_search_get_schema,
+    items_list_get_schema,
+    receipt_token_get_schema,
+    metrics_get_schema,
+    query_budget,
+)
+from .serializers import (
+    DailySalesSerializer,
+    HourlySalesSerializer,
+    ItemSalesSerializer,
+    ItemSerializer,
+)
+from .parsers import ORJSONParser
+from .validation import (
+    PayloadError,
+    filter_in_chunks,
+    validate_cart,
+    validate_item_row,
+    validate_item_rows,
+)
+from .renderers import (
+    LARGE,
+    ESCPOSRenderer,
+    ORJSONRenderer,
+    PrerenderedRenderer,
+    QRCodePNGRenderer,
+    QRCodeSVGRenderer,
+    iter_items_json,
+    lane_executor,
+    pipeline_executor,
+    receipt_lane,
+)
+from receipts.models import (
+    CatalogState,
+    DailyItemSales,
+    DeletedItem,
+    HourlySales,
+    Item,
+    Receipt,
+    Sale,
+)
+from receipts.sales import calculate_vat, record_sale
+from receipts.search import search_items
+from receipts.tokens import (
+    BadToken,
+    make_receipt_token,
+    read_receipt_token,
+)
+from receipts.storage import (
+    count_receipts,
+    defer_receipt,
+    fallback_name,
+    get_receipt_storage,
+    open_receipt_chunks,
+    persist_receipt,
+    save_fallback,
 )
-from receipts.models import Item
-
 
 logger = logging.getLogger(__name__)
 
+# Начало отсчёта для ключей страниц поиска чеков.
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+# Предельное количество попыток зарезервировать имя файла чека.
+# После каждого конфликта количество чеков за минуту перечитывается,
+# поэтому предел защищает только от бесконечного цикла.
+RESERVE_ATTEMPTS = 100
+
+PDFKIT_OPTIONS = {
+    "page-size": "A7",
+    "margin-top": "5mm",
+    "margin-right": "5mm",
+    "margin-bottom": "5mm",
+    "margin-left": "5mm",
+}
+
+HTML_CONTENT_TYPE = "text/html; charset=utf-8"
+
+
+def parse_border(value, end=False):
+    """
+    Преобразует параметр запроса в границу периода.
+
+    Args:
+        value (str): Дата (YYYY-MM-DD) или дата и время.
+        end (bool): Для конечной даты без времени граница
+            сдвигается на начало следующего дня.
+
+    Returns:
+        datetime: Граница периода или None, если параметр не задан.
+
+    Raises:
+        ValueError: Если параметр не удалось разобрать.
+    """
+    if not value:
+        return None
+
+    day = dateparse.parse_date(value)
+    if day is not None:
+        if end:
+            day += datetime.timedelta(days=1)
+        moment = datetime.datetime.combine(day, datetime.time())
+    else:
+        moment = dateparse.parse_datetime(value)
+        if moment is None:
+            raise ValueError(f"Некорректная дата: {value}")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
 
 @extend_schema(tags=["Кассовый чек - генерация QR-кода"])
 @check_post_schema
+@query_budget(12)
 class CashMachineView(APIView):
     """
     Эндпоинт для генерации QR-кода чека.
@@ -37,10 +167,15 @@ class CashMachineView(APIView):
         items (list): Список идентификаторов товаров, входящих в чек.
 
     Returns:
-        HttpResponse: Изображение QR-кода, представленное в виде HTTP-ответа.
+        HttpResponse: Изображение QR-кода или данные чека в формате,
+        выбранном по заголовку Accept: image/png (по умолчанию),
+        image/svg+xml, application/vnd.escpos (команды термопринтера)
+        или application/json.
 
     Raises:
         Http404: Ошибка, если один или несколько товаров не найдены.
+        PayloadError: Ошибка 400, если список товаров пуст, длиннее
+            RECEIPT_MAX_ITEMS или содержит не целые идентификаторы.
         Exception: В случае непредвиденной ошибки.
 
     Примечания:
@@ -54,6 +189,13 @@ class CashMachineView(APIView):
         }
     """
 
+    renderer_classes = [
+        QRCodePNGRenderer,
+        QRCodeSVGRenderer,
+        ESCPOSRenderer,
+        ORJSONRenderer,
+    ]
+
     @csrf_exempt
     def post(self, request):
         """
@@ -64,40 +206,68 @@ class CashMachineView(APIView):
             содержащий информацию о товарах.
 
         Returns:
-            HttpResponse: Изображение QR-кода,
-            представленное в виде HTTP-ответа.
+            Response: Данные чека, которые согласованный рендерер
+            преобразует в QR-код (PNG или SVG) или JSON.
         """
         try:
-            items_ids = request.data.get("items", [])
-            items = get_list_or_404(Item, id__in=items_ids)
+            items_ids = validate_cart(request.data)
+            items = filter_in_chunks(Item.objects.all(), "id", items_ids)
+            if not items:
+                raise Http404("Товары не найдены")
 
             current_time = datetime.datetime.now()
             current_time = current_time.strftime("%d.%m.%Y %H:%M")
 
-            rendered_html = self.generate_html_content(items, current_time)
-
-            pdf_file_path = self.create_pdf_receipt(
-                current_time, rendered_html
-            )
-
-            img = self.create_qrcode_receipt(request, pdf_file_path)
+            self.receipt = self.receipt_context(items, current_time)
+            rendered_html = self.render_html(self.receipt)
+
+            # Чек, продажи и сводки записываются одной транзакцией
+            # до рендеринга PDF: файл, который не удалось записать,
+            # формируется заново по продажам при открытии ссылки.
+            # Количество чеков за минуту читается до транзакции:
+            # в SQLite транзакция, начатая чтением, не ждёт блокировки
+            # записи, а сразу завершается ошибкой "database is locked".
+            count = count_receipts(self.receipt_prefix(current_time))
+            with transaction.atomic():
+                receipt = self.reserve_receipt(current_time, items, count)
+                record_sale(receipt, [(item, 1) for item in items])
+
+            data = self.receipt_data(request, receipt, items)
+            try:
+                self.create_pdf_receipt(
+                    request,
+                    receipt.file_name,
+                    rendered_html,
+                    data,
+                    line_count=receipt.line_count,
+                )
+            except Exception as e:
+                logger.exception(
+                    "Файл чека %s не записан, он будет сформирован "
+                    "при открытии ссылки: %s",
+                    receipt.file_name,
+                    e,
+                )
 
-            response = HttpResponse(content_type="image/png")
-            img.save(response, "PNG")
+            logger.info("Данные чека успешно сформированы.")
 
-            logger.info("Ответ с изображением QR-кода успешно сформирован.")
+            return Response(data)
 
-            return response
+        except (PayloadError, ParseError) as e:
+            logger.warning("Некорректный запрос чека: %s", e)
+            return Response(
+                {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
 
         except Http404 as e:
-            logger.error(f"Один или несколько товаров не найдены: {e}")
+            logger.error("Один или несколько товаров не найдены: %s", e)
             return Response(
                 {"error": "Один или несколько товаров не найдены"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
         except Exception as e:
-            logger.exception(f"Произошла непредвиденная ошибка: {e}")
+            logger.exception("Произошла непредвиденная ошибка: %s", e)
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
@@ -112,16 +282,32 @@ class CashMachineView(APIView):
             current_time (str): Текущее время, отформатированное в виде строки.
 
         Returns:
-            str: Сгенерированный HTML-код для чека.
+            str | ReceiptDocument: Сгенерированный HTML-код для чека.
 
         Описание:
             Метод генерирует HTML-код для чека на основе переданных товаров
-            и текущего времени. Для каждого товара создается словарь с
-            информацией о нем, такой как название, цена,
-            количество и общая стоимость товара.
-            Затем эти данные передаются в шаблон "receipt.html",
-            который использует Jinja2 для рендеринга HTML-кода.
-            После успешной генерации ведется логирование события.
+            и текущего времени: данные чека собираются методом
+            receipt_context и передаются в шаблон "receipt.html"
+            (см. render_html).
+        """
+        return self.render_html(self.receipt_context(items, current_time))
+
+    def receipt_context(self, items: list, current_time: str) -> dict:
+        """
+        Собирает данные для печати чека.
+
+        Args:
+            items (list): Список объектов Item, представляющих товары в чеке.
+            current_time (str): Текущее время, отформатированное в виде строки.
+
+        Returns:
+            dict: Реквизиты продавца, строки чека и итоги.
+
+        Описание:
+            Для каждого товара создается словарь с информацией о нем,
+            такой как название, цена, количество и общая стоимость
+            товара. Одни и те же данные используются для HTML-версии
+            (и PDF) чека и для печати на термопринтере (ESC/POS).
         """
 
         company_name = "ООО 'ОБЛАЧКО'"
@@ -144,124 +330,315 @@ class CashMachineView(APIView):
             }
             items_data.append(item_data)
 
-        html_content = render_to_string(
-            "receipt.html",
-            {
-                "items": items_data,
-                "total_price": total_price,
-                "total_nds_price": total_nds_price,
-                "current_time": current_time,
-                "company_name": company_name,
-                "payment_method": payment_method,
-                "customer_name": customer_name,
-            },
-        )
+        return {
+            "items": items_data,
+            "total_price": total_price,
+            "total_nds_price": total_nds_price,
+            "current_time": current_time,
+            "company_name": company_name,
+            "payment_method": payment_method,
+            "customer_name": customer_name,
+        }
+
+    def render_html(self, context: dict):
+        """
+        Рендерит шаблон "receipt.html" с данными чека.
+
+        Args:
+            context (dict): Данные чека из receipt_context.
 
-        jinja_env = Environment(loader=FileSystemLoader(settings.BASE_DIR))
-        template = jinja_env.from_string(html_content)
+        Returns:
+            str | ReceiptDocument: Сгенерированный HTML-код для чека.
+
+        Описание:
+            Шаблон рендерится Jinja2 с экранированием HTML, строки чека
+            разбиваются на страницы (см. api.documents). HTML чека
+            больше RECEIPT_LARGE_LINES строк не собирается в строку:
+            возвращается документ, который рендерится частями
+            при передаче в wkhtmltopdf.
+            После успешной генерации ведется логирование события.
+        """
+        document = ReceiptDocument(context)
+        if len(context["items"]) > settings.RECEIPT_LARGE_LINES:
+            logger.info("HTML-код чека будет сформирован по частям.")
+            return document
 
-        rendered_html = template.render()
+        rendered_html = str(document)
 
         logger.info("HTML-код успешно сгенерирован.")
 
         return rendered_html
 
-    @csrf_exempt
-    def create_pdf_receipt(self, current_time: str, rendered_html: str) -> str:
+    @staticmethod
+    def receipt_prefix(current_time: str) -> str:
+        """
+        Возвращает префикс имён файлов чеков за минуту current_time.
+        """
+        current_time = current_time.replace(":", "_").replace(" ", "_")
+        return f"check_{current_time}"
+
+    def reserve_receipt(
+        self, current_time: str, items: list, count: int = None
+    ) -> Receipt:
         """
-        Создаёт чек в формате PDF.
+        Резервирует имя файла чека.
 
         Args:
             current_time (str): Текущее время, отформатированное в виде строки.
-            rendered_html (str): Сгенерированный HTML-код для чека.
+            items (list): Список объектов Item, представляющих товары в чеке.
+            count (int): Количество чеков за эту минуту, прочитанное
+                заранее; по умолчанию читается здесь.
 
         Returns:
-            str: Путь к созданному файлу чека в формате PDF.
+            Receipt: Запись индекса с уникальным именем файла.
 
         Описание:
-            Метод создает чек в формате PDF на основе переданного времени
-            и сгенерированного HTML-кода. Перед созданием файла проверяется
-            количество файлов с аналогичным временем в имени,
-            формируется уникальный префикс и указываются параметры
-            для создания PDF с помощью библиотеки pdfkit. Файл сохраняется,
-            и в случае успешной генерации происходит логирование события.
+            Имя файла формируется из времени и порядкового номера чека
+            за эту минуту и сразу закрепляется записью Receipt
+            с уникальным file_name. Идентификатор записи нужен для ссылки
+            в QR-коде, поэтому QR-код можно строить, не дожидаясь PDF.
+            Если имя уже занято параллельным запросом, количество
+            чеков за минуту перечитывается и берётся следующий
+            свободный номер, но не меньше следующего за занятым.
+            Вместе с именем сохраняются сумма и количество строк чека
+            для поиска чеков.
         """
+        prefix = self.receipt_prefix(current_time)
+        if count is None:
+            count = count_receipts(prefix)
+
+        number = count + 1
+        for attempt in range(RESERVE_ATTEMPTS):
+            file_name = f"{prefix}_{number}.pdf"
+            try:
+                with transaction.atomic():
+                    return Receipt.objects.create(
+                        file_name=file_name,
+                        total=sum(item.price for item in items),
+                        line_count=len(items),
+                    )
+            except IntegrityError:
+                if attempt == RESERVE_ATTEMPTS - 1:
+                    raise
+                number = max(number, count_receipts(prefix)) + 1
 
-        current_time = current_time.replace(":", "_").replace(" ", "_")
+    @csrf_exempt
+    def create_pdf_receipt(
+        self,
+        request: HttpRequest,
+        file_name: str,
+        rendered_html: str,
+        data: dict,
+        line_count: int = 0,
+    ) -> str:
+        """
+        Создаёт чек в формате PDF одновременно с QR-кодом.
 
-        count = len(
-            [
-                f
-                for f in os.listdir(settings.MEDIA_ROOT)
-                if f.startswith(f"check_{current_time}")
-            ]
-        )
+        Args:
+            request (HttpRequest): Объект запроса Django.
+            file_name (str): Зарезервированное имя файла чека.
+            rendered_html (str | ReceiptDocument): Сгенерированный
+                HTML-код для чека.
+            data (dict): Данные чека для ответа.
+            line_count (int): Количество строк чека.
 
-        prefix = "_" + str(count + 1)
+        Returns:
+            str: Путь к файлу чека в формате PDF
+            или к его HTML-версии.
 
-        pdfkit_options = {
-            "page-size": "A7",
-            "margin-top": "5mm",
-            "margin-right": "5mm",
-            "margin-bottom": "5mm",
-            "margin-left": "5mm",
-        }
+        Описание:
+            PDF и QR-код (если клиент запросил изображение) формируются
+            параллельно в пуле потоков pipeline_executor, а поток запроса
+            дожидается PDF и записывает его в хранилище, так что ответ
+            отправляется только после записи файла. При RECEIPT_PERSIST=
+            "async" рендеринг и запись PDF выполняются в фоне,
+            а ответ отправляется сразу. При RECEIPT_PIPELINE_WORKERS=0
+            всё выполняется последовательно в потоке запроса.
+
+            PDF больших чеков (см. receipt_lane) рендерится в отдельной
+            полосе: пуле large_executor или, при отложенной записи,
+            в потоке large_persist_executor. Большие чеки ждут друг
+            друга, а потоки для обычных чеков остаются свободными.
+
+            Рендеринг выполняется через выключатель pdf_breaker.
+            Если wkhtmltopdf завершился ошибкой, не уложился в таймаут
+            или выключатель разомкнут, вместо PDF сохраняется
+            HTML-версия чека: ссылка из QR-кода отдаёт её, пока PDF
+            не будет сформирован после восстановления рендерера.
+        """
+        # Документ, который рендерится частями, формируется только
+        # для чеков больше RECEIPT_LARGE_LINES строк и попадает
+        # в полосу больших чеков по количеству строк.
+        html_size = len(rendered_html) if isinstance(rendered_html, str) else 0
+        lane = receipt_lane(line_count, html_size)
+        if settings.RECEIPT_PERSIST == "async":
+            defer_receipt(
+                file_name,
+                self.guarded_render_pdf,
+                rendered_html,
+                fallback=rendered_html,
+                large=lane == LARGE,
+            )
+            return f"media/{file_name}"
+
+        if settings.RECEIPT_PIPELINE_WORKERS > 0:
+            pdf = lane_executor(lane).submit(
+                self.guarded_render_pdf, rendered_html
+            )
+            renderer = request.accepted_renderer
+            if isinstance(renderer, (QRCodePNGRenderer, QRCodeSVGRenderer)):
+                request.accepted_renderer = PrerenderedRenderer(
+                    renderer,
+                    pipeline_executor().submit(
+                        renderer.render,
+                        data,
+                        request.accepted_media_type,
+                        self.get_renderer_context(),
+                    ),
+                )
+            render = pdf.result
+        else:
+            render = functools.partial(self.guarded_render_pdf, rendered_html)
+
+        try:
+            content = render()
+        except Exception as e:
+            logger.warning(
+                "PDF чека %s не сформирован, сохраняется HTML-версия: %s",
+                file_name,
+                e,
+            )
+            save_fallback(file_name, rendered_html)
+            return f"media/{fallback_name(file_name)}"
+
+        persist_receipt(file_name, content)
+
+        logger.info("Файл чека в формате .pdf успешно сгенерирован.")
+
+        return f"media/{file_name}"
+
+    def render_pdf(self, rendered_html) -> bytes:
+        """
+        Преобразует HTML-код чека в PDF без временных файлов.
 
-        pdf_file_path = f"media/check_{current_time}{prefix}.pdf"
+        wkhtmltopdf получает HTML через stdin и выводит PDF в stdout,
+        который читается в память. Документ ReceiptDocument
+        передаётся в stdin по частям, не собираясь в строку.
+        Процесс, не завершившийся за RECEIPT_PDF_TIMEOUT секунд,
+        принудительно останавливается. Шрифты берутся из набора
+        RECEIPT_FONTCONFIG_FILE, если он задан.
+
+        Args:
+            rendered_html (str | ReceiptDocument): Сгенерированный
+                HTML-код для чека.
+
+        Returns:
+            bytes: Содержимое PDF.
+
+        Raises:
+            subprocess.TimeoutExpired: Если wkhtmltopdf завис.
+            IOError: Если wkhtmltopdf недоступен или завершился ошибкой.
+        """
+        pdfkit = lazy.pdfkit()
         pdfkit_config = pdfkit.configuration(
             wkhtmltopdf=settings.WKHTMLTOPDF_DOCKER_PATH
         )
-        pdfkit.from_string(
-            rendered_html,
-            pdf_file_path,
+        kit = pdfkit.PDFKit(
+            "",
+            "string",
             configuration=pdfkit_config,
-            options=pdfkit_options,
+            options=PDFKIT_OPTIONS,
+        )
+        chunks = (
+            (rendered_html,)
+            if isinstance(rendered_html, str)
+            else rendered_html
+        )
+        returncode, content, stderr = run_streaming(
+            kit.command(),
+            chunks,
+            settings.RECEIPT_PDF_TIMEOUT,
+            env=renderer_environment(),
         )
+        kit.handle_error(returncode, stderr)
+        return content
 
-        logger.info("Файл чека в формате .pdf успешно сгенерирован.")
+    def guarded_render_pdf(self, rendered_html) -> bytes:
+        """
+        Формирует PDF через выключатель рендеринга.
 
-        return pdf_file_path
+        Raises:
+            CircuitOpen: Если выключатель разомкнут.
+        """
+        return pdf_breaker().call(self.render_pdf, rendered_html)
 
-    @csrf_exempt
-    def create_qrcode_receipt(
-        self, request: HttpRequest, pdf_file_path: str
-    ) -> Image:
+    def receipt_data(
+        self, request: HttpRequest, receipt: Receipt, items: list
+    ) -> dict:
         """
-        Создаёт чек в формате QR-code.
+        Формирует данные чека для ответа.
 
         Args:
             request (HttpRequest): Объект запроса Django.
-            pdf_file_path (str): Путь к файлу чека в формате PDF.
+            receipt (Receipt): Созданный чек.
+            items (list): Список объектов Item, входящих в чек.
 
         Returns:
-            Image: Объект изображения в формате PNG с содержимым QR-кода.
+            dict: Идентификатор чека, короткая ссылка на файл и суммы.
 
         Описание:
-            Метод создает чек в формате QR-code, используя переданный запрос
-            и путь к файлу чека. Для этого используется библиотека qrcode.
-            Сформированный QR-код преобразуется в изображение
-            с помощью библиотеки Pillow.
-            После успешной генерации происходит логирование события.
-        """
-
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(f"http://{request.get_host()}/{pdf_file_path}")
-        qr.make(fit=True)
+            Ссылка вида /r/<token> содержит подписанный токен чека,
+            поэтому QR-код получается меньше, а открыть чек можно
+            на любой реплике сервиса. Ссылка кодируется в QR-код рендерерами
+            image/png и image/svg+xml, для application/json данные
+            возвращаются как есть, без построения изображения.
+        """
+        total_price = sum(item.price for item in items)
+        token = make_receipt_token(receipt.id)
+        url = reverse("receipt_token", args=[token])
+        return {
+            "id": receipt.id,
+            "file_name": receipt.file_name,
+            "token": token,
+            "url": f"http://{request.get_host()}{url}",
+            "total_price": str(total_price),
+            "total_nds_price": str(
+                calculate_vat(total_price).quantize(Decimal("0.01"))
+            ),
+        }
 
-        img = qr.make_image(fill_color="black", back_color="white")
+    def get_renderer_context(self) -> dict:
+        """
+        Добавляет в контекст рендеринга данные для печати чека.
+
+        Они нужны рендереру ESC/POS, который печатает строки чека,
+        а не только ссылку на него.
+        """
+        context = super().get_renderer_context()
+        context["receipt"] = getattr(self, "receipt", None)
+        return context
 
-        logger.info("Файл чека в формате QR-кода успешно сгенерирован.")
+    def finalize_response(self, request, response, *args, **kwargs):
+        """
+        Отдаёт ошибки в формате JSON независимо от заголовка Accept.
 
-        return img
+        Рендереры изображений умеют строить только QR-код, поэтому
+        для ответов с ошибкой (включая 406 Not Acceptable)
+        принудительно выбирается JSON-рендерер.
+        """
+        if isinstance(response, Response) and response.status_code >= 400:
+            request.accepted_renderer = ORJSONRenderer()
+            request.accepted_media_type = ORJSONRenderer.media_type
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        patch_vary_headers(response, ("Accept",))
+        return response
 
 
 @extend_schema(tags=["Кассовый чек - сканирование QR-кода"])
 @qrcode_get_schema
+@query_budget(1)
 class QRCodeFileView(APIView):
     """
     Вьюсет для получения файла по его имени через сканирование QR-кода.
@@ -289,23 +666,156 @@ class QRCodeFileView(APIView):
             соответствующий HTTP-ответ с сообщением об ошибке.
         """
         try:
-            file_path = os.path.join(settings.MEDIA_ROOT, file_name)
-            if os.path.exists(file_path):
-                with open(file_path, "rb") as file:
-                    return FileResponse(file, content_type="application/pdf")
-            else:
+            storage = get_receipt_storage()
+            if getattr(storage, "redirect_reads", False):
+                return HttpResponseRedirect(storage.url(file_name))
+
+            chunks = storage.open_chunks(file_name)
+            if chunks is None:
                 return Response(
                     {"error": "File not found"},
                     status=status.HTTP_404_NOT_FOUND,
                 )
+            return StreamingHttpResponse(
+                chunks, content_type="application/pdf"
+            )
+        except SuspiciousFileOperation:
+            return Response(
+                {"error": "File not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+@extend_schema(tags=["Кассовый чек - сканирование QR-кода"])
+@receipt_token_get_schema
+@query_budget(2)
+class ReceiptTokenView(APIView):
+    """
+    Эндпоинт для получения чека по короткой подписанной ссылке.
+
+    Токен проверяется без обращения к общему состоянию. Если файла
+    чека нет в хранилище этой реплики, PDF заново формируется
+    из сохранённых строк чека (Sale) и отдаётся без записи на диск.
+    Пока рендеринг PDF недоступен, отдаётся HTML-версия чека.
+
+    Пример GET-запроса:
+        /r/3hK9x2LmQp7Zt4
+    """
+
+    def get(self, request, token):
+        """
+        Обработка GET-запроса для получения чека по токену.
+
+        Args:
+            request (Request): Объект запроса Django.
+            token (str): Подписанный токен чека из ссылки.
+
+        Returns:
+            HttpResponse: PDF-файл чека.
+        """
+        try:
+            receipt = Receipt.objects.filter(
+                id=read_receipt_token(token)
+            ).first()
+        except BadToken as e:
+            logger.warning("Отклонён токен чека: %s", e)
+            receipt = None
+        if receipt is None:
+            return Response(
+                {"error": "File not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        try:
+            storage = get_receipt_storage()
+            if getattr(storage, "redirect_reads", False):
+                if storage.exists(receipt.file_name):
+                    return HttpResponseRedirect(storage.url(receipt.file_name))
+                return self.regenerate(receipt, storage)
+
+            chunks = storage.open_chunks(receipt.file_name)
+            if chunks is not None:
+                return StreamingHttpResponse(
+                    chunks, content_type="application/pdf"
+                )
+            return self.regenerate(receipt, storage)
         except Exception as e:
+            logger.exception("Произошла непредвиденная ошибка: %s", e)
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def regenerate(self, receipt: Receipt, storage):
+        """
+        Формирует PDF чека заново по сохранённым продажам.
+
+        Args:
+            receipt (Receipt): Чек, файла которого нет в хранилище.
+            storage (Storage): Хранилище чеков.
+
+        Returns:
+            HttpResponse: PDF-файл чека или его HTML-версия.
+
+        Описание:
+            Пока выключатель рендеринга разомкнут, отдаётся сохранённая
+            HTML-версия чека без обращения к продажам. Если PDF
+            сформировать не удалось, отдаётся HTML, построенный
+            по продажам. Когда рендерер восстановился, PDF чека
+            с HTML-версией записывается в хранилище, а HTML-версия
+            удаляется.
+        """
+        html_name = fallback_name(receipt.file_name)
+        breaker = pdf_breaker()
+        if breaker.state == OPEN:
+            chunks = storage.open_chunks(html_name)
+            if chunks is not None:
+                return StreamingHttpResponse(
+                    chunks, content_type=HTML_CONTENT_TYPE
+                )
+
+        sales = list(receipt.sales.order_by("id"))
+        if not sales:
+            return Response(
+                {"error": "File not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        lines = [sale for sale in sales for _ in range(sale.quantity)]
+        current_time = timezone.localtime(receipt.created_at).strftime(
+            "%d.%m.%Y %H:%M"
+        )
+        cash_machine = CashMachineView()
+        rendered_html = cash_machine.generate_html_content(lines, current_time)
+        try:
+            pdf_content = cash_machine.guarded_render_pdf(rendered_html)
+        except Exception as e:
+            logger.warning(
+                "PDF чека %s не сформирован, отдаётся HTML-версия: %s",
+                receipt.file_name,
+                e,
+            )
+            return HttpResponse(rendered_html, content_type=HTML_CONTENT_TYPE)
+
+        if storage.exists(html_name):
+            storage.replace(receipt.file_name, pdf_content)
+            storage.delete(html_name)
+            logger.info(
+                "PDF чека %s сформирован вместо HTML-версии.",
+                receipt.file_name,
+            )
+
+        logger.info("Чек %s сформирован заново.", receipt.file_name)
+
+        return HttpResponse(pdf_content, content_type="application/pdf")
+
 
 @extend_schema(tags=["БД - заполнение базы данных (при необходимости)"])
 @create_items_post_schema
+@query_budget(8)
 class CreateItemsView(APIView):
     """
     Эндпоинт для загрузки товаров в базу данных.
@@ -327,51 +837,588 @@ class CreateItemsView(APIView):
             {"id": 2, "title": "Огурцы", "price": 60},
             {"id": 3, "title": "Картошка", "price": 50}
         ]
+
+    Примечания:
+        Существующие идентификаторы проверяются одним запросом
+        (при большом списке - несколькими, по частям), а новые товары
+        создаются через bulk_create, поэтому количество запросов к БД
+        не зависит от размера загружаемого списка. Список длиннее
+        ITEMS_LOAD_MAX_ROWS отклоняется целиком, строки с некорректным
+        идентификатором, названием или ценой - по отдельности.
     """
 
+    parser_classes = [ORJSONParser, FormParser, MultiPartParser]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+
     @csrf_exempt
     def post(self, request):
         try:
-            items_data = request.data
-            created_item_ids = []
+            items_data = validate_item_rows(request.data)
             errors = []
 
+            rows = []
             for item_data in items_data:
-                item_id = item_data.get("id")
-                title = item_data.get("title")
-                price = item_data.get("price")
-
-                if not title or not price:
-                    errors.append(
-                        {"error": "Название и цена товара обязательны"}
-                    )
-                    continue
+                try:
+                    rows.append(validate_item_row(item_data))
+                except PayloadError as e:
+                    errors.append({"error": str(e)})
+
+            existing_ids = set(
+                filter_in_chunks(
+                    Item.objects.values_list("id", flat=True),
+                    "id",
+                    [row[0] for row in rows if row[0] is not None],
+                )
+            )
 
-                existing_item = Item.objects.filter(id=item_id).first()
-                if existing_item:
+            new_items = []
+            for item_id, title, price in rows:
+                if item_id in existing_ids:
                     errors.append(
                         {"error": f"Товар с id {item_id} уже существует"}
                     )
                     continue
+                if item_id is not None:
+                    existing_ids.add(item_id)
+
+                new_items.append(Item(id=item_id, title=title, price=price))
 
-                Item.objects.create(id=item_id, title=title, price=price)
-                created_item_ids.append(item_id)
+            with transaction.atomic():
+                version = CatalogState.next_version()
+                for item in new_items:
+                    item.version = version
+                Item.objects.bulk_create(new_items, batch_size=500)
+            created_item_ids = [item.id for item in new_items]
 
             if errors:
-                logger.error(f"Ошибки при создании товаров: {errors}")
+                logger.error(
+                    "Ошибки при создании товаров (%s): %s",
+                    len(errors),
+                    errors[:10],
+                )
                 return Response(errors, status=status.HTTP_400_BAD_REQUEST)
 
             response_data = {"items": created_item_ids}
-            logger.info(f"Товары успешно созданы: {created_item_ids}")
+            logger.info(
+                "Товары успешно созданы: %s шт.", len(created_item_ids)
+            )
             return Response(
                 response_data,
                 status=status.HTTP_201_CREATED,
                 content_type="application/json",
             )
 
+        except (PayloadError, ParseError) as e:
+            logger.warning("Некорректный запрос загрузки товаров: %s", e)
+            return Response(
+                {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
         except Exception as e:
-            logger.exception(f"Произошла непредвиденная ошибка: {e}")
+            logger.exception("Произошла непредвиденная ошибка: %s", e)
             return Response(
                 {"error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+@extend_schema(tags=["Чеки - выгрузка архива"])
+@receipts_export_get_schema
+@query_budget(2)
+class ReceiptExportView(APIView):
+    """
+    Эндпоинт выгрузки чеков за период в виде ZIP-архива.
+
+    Доступен только администраторам. Чеки выбираются по индексу
+    Receipt, архив формируется и отдаётся по частям по мере чтения
+    файлов, без буферизации в памяти и временных файлов.
+
+    Пример GET-запроса:
+        /api/v1/receipts/export/?from=2024-01-01&to=2024-01-31
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        Обработка GET-запроса для выгрузки чеков.
+
+        Args:
+            request (Request): Объект запроса с параметрами from и to
+            (дата или дата и время в формате ISO 8601).
+
+        Returns:
+            StreamingHttpResponse: ZIP-архив с чеками за период.
+        """
+        try:
+            date_from = parse_border(request.query_params.get("from"))
+            date_to = parse_border(request.query_params.get("to"), end=True)
+        except ValueError as e:
+            return Response(
+                {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        receipts = Receipt.objects.order_by("created_at", "id")
+        if date_from is not None:
+            receipts = receipts.filter(created_at__gte=date_from)
+        if date_to is not None:
+            receipts = receipts.filter(created_at__lt=date_to)
+
+        archive = stream_zip(self.iter_entries(receipts))
+        if request.query_params.get("store") == "true":
+            return self.store(archive, date_from, date_to)
+
+        response = StreamingHttpResponse(
+            archive, content_type="application/zip"
+        )
+        response["Content-Disposition"] = 'attachment; filename="receipts.zip"'
+        return response
+
+    def store(self, archive, date_from, date_to):
+        """
+        Сохраняет архив в объектное хранилище и перенаправляет на него.
+
+        Архив загружается по частям (multipart) по мере формирования,
+        а клиент получает подписанную ссылку на готовый файл.
+
+        Returns:
+            HttpResponse: Перенаправление на архив или 400,
+            если хранилище чеков не поддерживает сохранение архивов.
+        """
+        storage = get_receipt_storage()
+        if not hasattr(storage, "save_stream"):
+            return Response(
+                {"error": "Сохранение архивов доступно только для S3"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        border = "{:%Y%m%d%H%M}"
+        name = "exports/receipts_{}_{}_{}.zip".format(
+            border.format(date_from) if date_from else "start",
+            border.format(date_to) if date_to else "end",
+            timezone.now().strftime("%Y%m%d%H%M%S"),
+        )
+        storage.save_stream(name, archive, content_type="application/zip")
+        logger.info("Архив чеков сохранён: %s", name)
+        return HttpResponseRedirect(storage.url(name))
+
+    @staticmethod
+    def iter_entries(receipts):
+        """
+        Возвращает записи архива для выбранных чеков.
+
+        Чеки, отсутствующие в хранилище, пропускаются.
+        """
+        for receipt in receipts.iterator(chunk_size=500):
+            chunks = open_receipt_chunks(receipt.file_name)
+            if chunks is None:
+                logger.warning("Файл чека не найден: %s", receipt.file_name)
+                continue
+            date_time = timezone.localtime(receipt.created_at).timetuple()
+            yield receipt.file_name, date_time[:6], chunks
+
+
+def encode_cursor(created_at: datetime.datetime, receipt_id: int) -> str:
+    """
+    Формирует ключ страницы из времени создания и id последнего чека.
+    """
+    micros = (created_at - EPOCH) // datetime.timedelta(microseconds=1)
+    return f"{micros}_{receipt_id}"
+
+
+def decode_cursor(value: str) -> tuple:
+    """
+    Разбирает ключ страницы, сформированный encode_cursor.
+
+    Raises:
+        ValueError: Если ключ имеет неверный формат.
+    """
+    micros, receipt_id = value.split("_")
+    created_at = EPOCH + datetime.timedelta(microseconds=int(micros))
+    return created_at, int(receipt_id)
+
+
+@extend_schema(tags=["Чеки - поиск"])
+@receipts_list_get_schema
+@query_budget(1)
+class ReceiptListView(APIView):
+    """
+    Эндпоинт поиска чеков по периоду, сумме и товару.
+
+    Доступен только администраторам. Чеки возвращаются от новых
+    к старым страницами по ключу (время создания, id): ссылка next
+    продолжает выборку после последнего чека страницы, поэтому
+    стоимость запроса не зависит от номера страницы и размера таблицы.
+    Период и сумма проверяются по индексу (created_at, id, total),
+    а поиск по товару идёт по индексу продаж (item, created_at, receipt).
+
+    Пример GET-запроса:
+        /api/v1/receipts/?from=2024-01-01&to=2024-01-31&min_total=100
+    """
+
+    permission_classes = [IsAdminUser]
+
+    default_limit = 50
+    max_limit = 500
+    fields = ("id", "file_name", "created_at", "total", "line_count")
+
+    def get(self, request):
+        """
+        Обработка GET-запроса для поиска чеков.
+
+        Args:
+            request (Request): Объект запроса с параметрами from, to,
+            min_total, item, after и limit.
+
+        Returns:
+            Response: Страница найденных чеков и ссылка на следующую.
+        """
+        params = request.query_params
+        try:
+            date_from = parse_border(params.get("from"))
+            date_to = parse_border(params.get("to"), end=True)
+            min_total = params.get("min_total")
+            if min_total is not None:
+                min_total = Decimal(min_total)
+                if not min_total.is_finite():
+                    raise ValueError(min_total)
+            item = params.get("item")
+            if item is not None:
+                item = int(item)
+            after = params.get("after")
+            if after is not None:
+                after = decode_cursor(after)
+            limit = int(params.get("limit", self.default_limit))
+        except (ArithmeticError, ValueError):
+            return Response(
+                {
+                    "error": "Некорректные параметры: from и to - даты, "
+                    "min_total - число, item и limit - целые числа"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = max(1, min(limit, self.max_limit))
+
+        if item is None:
+            rows = Receipt.objects.all()
+            receipt, key = "", "id"
+        else:
+            # Время продажи совпадает со временем чека, поэтому период
+            # и порядок задаются по продажам товара, а данные чека
+            # добавляются соединением по внешнему ключу.
+            rows = Sale.objects.filter(item_id=item)
+            receipt, key = "receipt__", "receipt_id"
+
+        if date_from is not None:
+            rows = rows.filter(created_at__gte=date_from)
+        if date_to is not None:
+            rows = rows.filter(created_at__lt=date_to)
+        if min_total is not None:
+            rows = rows.filter(**{f"{receipt}total__gte": min_total})
+        if after is not None:
+            # Условие created_at <= ... задаёт границу диапазона индекса,
+            # чтобы выборка шла по индексу без сортировки.
+            rows = rows.filter(created_at__lte=after[0]).filter(
+                Q(created_at__lt=after[0]) | Q(**{f"{key}__lt": after[1]})
+            )
+
+        rows = [
+            dict(zip(self.fields, row))
+            for row in rows.order_by("-created_at", f"-{key}").values_list(
+                key, *(f"{receipt}{field}" for field in self.fields[1:])
+            )[: limit + 1]
+        ]
+        next_url = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            query = params.copy()
+            query["after"] = encode_cursor(
+                rows[-1]["created_at"], rows[-1]["id"]
+            )
+            next_url = request.build_absolute_uri(
+                f"{request.path}?{query.urlencode()}"
+            )
+
+        for row in rows:
+            row["total"] = str(row["total"])
+            row["token"] = make_receipt_token(row["id"])
+        return Response({"next": next_url, "receipts": rows})
+
+
+@extend_schema(tags=["Товары - каталог"])
+@items_list_get_schema
+@query_budget(3)
+class ItemListView(APIView):
+    """
+    Эндпоинт постраничной выгрузки каталога товаров для касс.
+
+    Страницы выбираются по ключу (id больше последнего полученного),
+    поэтому стоимость запроса не зависит от номера страницы.
+    Ответ содержит версию каталога и заголовок ETag: если каталог
+    не менялся, запрос с If-None-Match получает 304 Not Modified
+    после одного запроса к БД. Параметр since_version возвращает
+    только товары, изменённые после указанной версии,
+    и идентификаторы удалённых товаров.
+
+    Пример GET-запроса:
+        /api/v1/items/?after=1000&limit=1000&since_version=42
+    """
+
+    default_limit = 1000
+    max_limit = 5000
+
+    def get(self, request):
+        """
+        Обработка GET-запроса для получения страницы каталога.
+
+        Args:
+            request (Request): Объект запроса с параметрами after,
+            limit и since_version.
+
+        Returns:
+            StreamingHttpResponse: Страница каталога в формате JSON.
+        """
+        version = CatalogState.current_version()
+        etag = f'"catalog-{version}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+        try:
+            after = int(request.query_params.get("after", 0))
+            limit = int(request.query_params.get("limit", self.default_limit))
+            since_version = request.query_params.get("since_version")
+            if since_version is not None:
+                since_version = int(since_version)
+        except ValueError:
+            return Response(
+                {"error": "Параметры after, limit и since_version - числа"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = max(1, min(limit, self.max_limit))
+
+        items = Item.objects.filter(id__gt=after).order_by("id")
+        deleted = []
+        if since_version is not None:
+            items = items.filter(version__gt=since_version)
+            if not after:
+                deleted = list(
+                    DeletedItem.objects.filter(version__gt=since_version)
+                    .values_list("item_id", flat=True)
+                    .distinct()
+                )
+
+        rows = list(items.values_list("id", "title", "price")[: limit + 1])
+        next_url = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            query = request.query_params.copy()
+            query["after"] = rows[-1][0]
+            next_url = request.build_absolute_uri(
+                f"{request.path}?{query.urlencode()}"
+            )
+
+        response = StreamingHttpResponse(
+            iter_items_json(
+                {"version": version, "next": next_url, "deleted": deleted},
+                rows,
+            ),
+            content_type="application/json",
+        )
+        response["ETag"] = etag
+        return response
+
+
+@extend_schema(tags=["Товары - поиск"])
+@items_search_get_schema
+@query_budget(1)
+class ItemSearchView(APIView):
+    """
+    Эндпоинт поиска товаров по названию для автодополнения на кассе.
+
+    Каждое слово запроса ищется по началу слов названия без учёта
+    регистра, результаты упорядочены по релевантности.
+
+    Пример GET-запроса:
+        /api/v1/items/search/?q=мак&limit=10
+    """
+
+    max_limit = 100
+
+    def get(self, request):
+        """
+        Обработка GET-запроса для поиска товаров.
+
+        Args:
+            request (Request): Объект запроса с параметрами q и limit.
+
+        Returns:
+            Response: Список найденных товаров.
+        """
+        query = request.query_params.get("q", "")
+        try:
+            limit = int(request.query_params.get("limit", 20))
+        except ValueError:
+            return Response(
+                {"error": "Параметр limit должен быть числом"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = max(1, min(limit, self.max_limit))
+
+        items = search_items(query, limit)
+        return Response(ItemSerializer(items, many=True).data)
+
+
+@extend_schema(tags=["Отчёты - продажи"])
+@sales_report_get_schema
+@query_budget(1)
+class SalesReportView(APIView):
+    """
+    Эндпоинт отчёта о продажах за период.
+
+    Доступен только администраторам. Отчёт строится по накопительным
+    сводкам DailyItemSales и HourlySales, а не по исходным продажам,
+    поэтому время ответа зависит от длины периода, а не от числа чеков.
+
+    Пример GET-запроса:
+        /api/v1/reports/sales/?from=2024-01-01&to=2024-01-31&group=day
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        Обработка GET-запроса для получения отчёта.
+
+        Args:
+            request (Request): Объект запроса с параметрами from и to
+            (YYYY-MM-DD, включительно) и group (day, hour или item).
+
+        Returns:
+            Response: Строки отчёта.
+        """
+        group = request.query_params.get("group", "day")
+        try:
+            date_from, date_to = (
+                dateparse.parse_date(request.query_params.get(name, ""))
+                for name in ("from", "to")
+            )
+        except ValueError:
+            date_from = date_to = None
+        if date_from is None or date_to is None:
+            return Response(
+                {"error": "Параметры from и to обязательны (YYYY-MM-DD)"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        totals = {
+            "quantity_sum": Sum("quantity"),
+            "revenue_sum": Sum("revenue"),
+            "vat_sum": Sum("vat"),
+        }
+        daily = DailyItemSales.objects.filter(
+            day__gte=date_from, day__lte=date_to
+        )
+
+        if group == "day":
+            rows = daily.values("day").annotate(**totals).order_by("day")
+            serializer = DailySalesSerializer(rows, many=True)
+        elif group == "item":
+            rows = (
+                daily.values("item_id")
+                .annotate(title_value=Max("title"), **totals)
+                .order_by("-revenue_sum", "item_id")
+            )
+            serializer = ItemSalesSerializer(rows, many=True)
+        elif group == "hour":
+            rows = HourlySales.objects.filter(
+                hour__gte=parse_border(date_from.isoformat()),
+                hour__lt=parse_border(date_to.isoformat(), end=True),
+            ).order_by("hour")
+            serializer = HourlySalesSerializer(rows, many=True)
+        else:
+            return Response(
+                {"error": "Параметр group: day, hour или item"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(serializer.data)
+
+
+@extend_schema(tags=["Служебные - проверка состояния"])
+@healthz_get_schema
+@query_budget(0)
+class HealthzView(APIView):
+    """
+    Эндпоинт проверки живости процесса (liveness).
+
+    Не обращается к базе данных и рендереру, поэтому отвечает
+    сразу после запуска воркера.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        return Response({"status": "ok"})
+
+
+@extend_schema(tags=["Служебные - проверка состояния"])
+@readyz_get_schema
+@query_budget(1)
+class ReadyzView(APIView):
+    """
+    Эндпоинт проверки готовности к приёму трафика (readiness).
+
+    Проверяет доступность базы данных и сообщает результат прогрева
+    шаблонов и рендерера, выполненного при запуске воркера. Сам прогрев
+    здесь не запускается: эндпоинт открыт без аутентификации, и каждая
+    проба запускала бы wkhtmltopdf. Возвращает 503, пока хотя бы одна
+    из проверок не пройдена.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        checks = warmup.state()
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            checks["database"] = True
+        except Exception as e:
+            logger.error("База данных недоступна: %s", e)
+            checks["database"] = False
+
+        ready = all(checks.values())
+        return Response(
+            {"status": "ok" if ready else "unavailable", "checks": checks},
+            status=(
+                status.HTTP_200_OK
+                if ready
+                else status.HTTP_503_SERVICE_UNAVAILABLE
+            ),
+        )
+
+
+@extend_schema(tags=["Служебные - проверка состояния"])
+@metrics_get_schema
+@query_budget(0)
+class MetricsView(APIView):
+    """
+    Эндпоинт метрик обработки запросов в формате Prometheus.
+
+    Не обращается к базе данных: значения накапливаются
+    в памяти процесса middleware QueryCountMiddleware.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        return HttpResponse(
+            metrics.render_prometheus(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
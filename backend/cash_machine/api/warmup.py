@@ -0,0 +1,97 @@
+"""
+Прогрев приложения перед приёмом трафика.
+
+Компилирует шаблон чека, загружает тяжёлые зависимости и формирует
+пробный PDF: так проверяется, что wkhtmltopdf работает с набором
+шрифтов чека, а первый чек не платит за инициализацию рендерера.
+Прогрев выполняется один раз в каждом воркере (post_worker_init
+в gunicorn.conf.py), а эндпоинт /readyz только сообщает его результат
+(см. state): иначе каждая проба готовности запускала бы wkhtmltopdf.
+"""
+
+import logging
+import os
+
+from django.conf import settings
+
+from .documents import render_receipt_html
+
+logger = logging.getLogger(__name__)
+
+_state = {"templates": False, "renderer": False}
+
+# Документ для пробного рендеринга: одна строка текста шрифтом чека.
+PROBE_HTML = (
+    '<html><head><meta charset="utf-8"></head>'
+    '<body style="font-family: Arial">Прогрев</body></html>'
+)
+
+
+def warm_templates() -> bool:
+    """
+    Создаёт окружение Jinja2 и компилирует шаблон чека.
+
+    Returns:
+        bool: True, если шаблон успешно отрендерен.
+    """
+    try:
+        render_receipt_html(
+            {"items": [], "total_price": 0, "total_nds_price": 0}
+        )
+    except Exception:
+        logger.exception("Не удалось прогреть шаблон чека.")
+        return False
+    return True
+
+
+def warm_renderer() -> bool:
+    """
+    Формирует пробный PDF тем же способом, что и PDF чека.
+
+    Если задан набор шрифтов RECEIPT_FONTCONFIG_FILE, проверяет,
+    что файл конфигурации существует: иначе fontconfig молча
+    перешёл бы на шрифты по умолчанию.
+
+    Returns:
+        bool: True, если wkhtmltopdf сформировал PDF.
+    """
+    # Импорт внутри функции: модуль views сам импортирует warmup.
+    from .views import CashMachineView
+
+    fontconfig_file = settings.RECEIPT_FONTCONFIG_FILE
+    if fontconfig_file and not os.path.isfile(fontconfig_file):
+        logger.error("Набор шрифтов чека не найден: %s", fontconfig_file)
+        return False
+    try:
+        content = CashMachineView().render_pdf(PROBE_HTML)
+    except Exception as e:
+        logger.error("wkhtmltopdf недоступен: %s", e)
+        return False
+    if not content.startswith(b"%PDF"):
+        logger.error("wkhtmltopdf не сформировал пробный PDF.")
+        return False
+    return True
+
+
+def warm_up() -> dict:
+    """
+    Выполняет все ещё не пройденные шаги прогрева.
+
+    Returns:
+        dict: Состояние шагов прогрева.
+    """
+    if not _state["templates"]:
+        _state["templates"] = warm_templates()
+    if not _state["renderer"]:
+        _state["renderer"] = warm_renderer()
+    return dict(_state)
+
+
+def state() -> dict:
+    """
+    Возвращает состояние шагов прогрева, не выполняя их.
+
+    Returns:
+        dict: Состояние шагов прогрева.
+    """
+    return dict(_state)
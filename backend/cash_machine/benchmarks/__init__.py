@@ -0,0 +1,55 @@
+"""
+Нагрузочные замеры (бенчмарки) проекта.
+
+Запуск из каталога backend/cash_machine:
+
+    python -m benchmarks.bench_json
+"""
+
+import contextlib
+import os
+import time
+
+
+def setup_django():
+    """
+    Настраивает Django для запуска бенчмарка вне manage.py.
+    """
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cash_machine.settings")
+    django.setup()
+
+
+def measure(func, repeat: int = 5) -> float:
+    """
+    Возвращает лучшее время выполнения функции в секундах.
+
+    Args:
+        func (callable): Замеряемая функция без аргументов.
+        repeat (int): Количество повторов.
+
+    Returns:
+        float: Минимальное время одного вызова.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@contextlib.contextmanager
+def test_database():
+    """
+    Создаёт временную тестовую базу данных на время бенчмарка.
+    """
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
@@ -0,0 +1,60 @@
+"""
+Замер формирования ответа POST /cash_machine в разных форматах:
+QR-код PNG и SVG против чека в командах ESC/POS.
+
+Запуск:
+
+    python -m benchmarks.bench_escpos [строк в чеке]
+"""
+
+import sys
+from decimal import Decimal
+
+from benchmarks import measure, setup_django
+
+
+def main(lines: int = 5):
+    setup_django()
+
+    from api.renderers import (
+        ESCPOSRenderer,
+        QRCodePNGRenderer,
+        QRCodeSVGRenderer,
+    )
+    from api.views import CashMachineView
+
+    class Row:
+        def __init__(self, number):
+            self.title = f"Товар {number}"
+            self.price = Decimal(100 + number)
+
+    view = CashMachineView()
+    receipt = view.receipt_context(
+        [Row(number) for number in range(lines)], "01.01.2024 10:00"
+    )
+    data = {
+        "url": "http://localhost:8000/r/3hK9x2LmQp7Zt4",
+        "total_price": str(receipt["total_price"]),
+        "total_nds_price": f"{receipt['total_nds_price']:.2f}",
+    }
+    context = {"receipt": receipt}
+
+    print(f"Строк в чеке: {lines}")
+    for renderer in (
+        QRCodePNGRenderer(),
+        QRCodeSVGRenderer(),
+        ESCPOSRenderer(),
+    ):
+        content = renderer.render(data, renderer.media_type, context)
+        seconds = measure(
+            lambda: renderer.render(data, renderer.media_type, context),
+            repeat=200,
+        )
+        print(
+            f"{renderer.media_type:>24}: {seconds * 1e6:9.1f} мкс, "
+            f"{len(content)} байт"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
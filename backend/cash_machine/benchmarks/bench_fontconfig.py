@@ -0,0 +1,154 @@
+"""
+Замер поиска шрифтов при запуске рендерера: системный fontconfig
+против набора шрифтов чека (fonts/fonts.conf) без кэша и с кэшем,
+построенным заранее, как при сборке образа.
+
+Каждый запуск wkhtmltopdf - новый процесс, который инициализирует
+fontconfig и ищет шрифт для font-family чека. Здесь это имитируется
+дочерним процессом Python, который через libfontconfig загружает
+конфигурацию и подбирает шрифт для "Arial"; время замеряется внутри
+процесса, без запуска интерпретатора.
+
+Без кэша fontconfig читает все файлы шрифтов и, если каталог кэша
+доступен для записи, сохраняет кэш. Поэтому вариант без кэша
+перед каждым запуском очищает каталог кэша: так выглядит первый
+чек в новом контейнере или каждый чек при файловой системе только
+для чтения.
+
+Если в fonts/truetype нет шрифтов (локальная разработка),
+для замера копируются шрифты из /usr/share/fonts. Чтобы оценить
+образ с большим количеством шрифтов, набор можно скопировать
+несколько раз (второй аргумент).
+
+Запуск:
+
+    python -m benchmarks.bench_fontconfig [запусков] [копий набора]
+"""
+
+import ctypes
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FONTS_DIR = BASE_DIR / "fonts"
+SYSTEM_FONTS_DIR = Path("/usr/share/fonts")
+# Каталог шрифтов в образе, указанный в fonts.conf.
+IMAGE_FONTS_DIR = "/backend/fonts"
+LIBRARY = "libfontconfig.so.1"
+
+PROBE = f"""
+import ctypes, time
+
+started = time.perf_counter()
+fc = ctypes.CDLL("{LIBRARY}")
+fc.FcInitLoadConfigAndFonts.restype = ctypes.c_void_p
+fc.FcNameParse.restype = ctypes.c_void_p
+fc.FcFontMatch.restype = ctypes.c_void_p
+fc.FcPatternFormat.restype = ctypes.c_char_p
+config = ctypes.c_void_p(fc.FcInitLoadConfigAndFonts())
+pattern = ctypes.c_void_p(fc.FcNameParse(b"Arial"))
+fc.FcConfigSubstitute(config, pattern, 0)
+fc.FcDefaultSubstitute(pattern)
+result = ctypes.c_int()
+font = fc.FcFontMatch(config, pattern, ctypes.byref(result))
+seconds = time.perf_counter() - started
+name = fc.FcPatternFormat(ctypes.c_void_p(font), b"%{{family[0]}}")
+print(seconds, name.decode())
+"""
+
+
+def probe(fontconfig_file: str = None) -> tuple:
+    """
+    Запускает процесс поиска шрифта и возвращает время и семейство.
+    """
+    env = dict(os.environ)
+    if fontconfig_file:
+        env["FONTCONFIG_FILE"] = fontconfig_file
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    seconds, family = output.split(" ", 1)
+    return float(seconds), family.strip()
+
+
+def build_cache(fontconfig_file: str, fonts_dir: Path):
+    """
+    Строит кэш fontconfig, как fc-cache при сборке образа.
+    """
+    if shutil.which("fc-cache"):
+        subprocess.run(
+            ["fc-cache", "-f"],
+            env=dict(os.environ, FONTCONFIG_FILE=fontconfig_file),
+            check=True,
+        )
+        return
+    os.environ["FONTCONFIG_FILE"] = fontconfig_file
+    fc = ctypes.CDLL(LIBRARY)
+    fc.FcInitLoadConfig.restype = ctypes.c_void_p
+    config = ctypes.c_void_p(fc.FcInitLoadConfig())
+    fc.FcDirCacheRead(str(fonts_dir).encode(), 1, config)
+    del os.environ["FONTCONFIG_FILE"]
+
+
+def bundle(directory: Path, copies: int = 1) -> Path:
+    """
+    Копирует fonts.conf и шрифты чека во временный каталог.
+
+    Пути каталогов шрифтов и кэша в fonts.conf заменяются
+    на временный каталог.
+    """
+    fonts = sorted((FONTS_DIR / "truetype").glob("*.ttf"))
+    if not fonts:
+        fonts = sorted(SYSTEM_FONTS_DIR.rglob("*.ttf"))
+    (directory / "truetype").mkdir()
+    (directory / "cache").mkdir()
+    for copy in range(copies):
+        for font in fonts:
+            shutil.copy(font, directory / "truetype" / f"{copy}-{font.name}")
+    config = (FONTS_DIR / "fonts.conf").read_text()
+    (directory / "fonts.conf").write_text(
+        config.replace(IMAGE_FONTS_DIR, str(directory))
+    )
+    print(f"Шрифтов в наборе: {len(fonts) * copies}")
+    return directory / "fonts.conf"
+
+
+def report(name: str, results: list):
+    times = [seconds for seconds, _ in results]
+    families = sorted({family for _, family in results})
+    print(
+        f"{name:>18}: медиана {statistics.median(times) * 1000:6.1f} мс, "
+        f"максимум {max(times) * 1000:6.1f} мс, шрифт {', '.join(families)}"
+    )
+
+
+def main(runs: int = 20, copies: int = 1):
+    with tempfile.TemporaryDirectory() as directory:
+        fontconfig_file = str(bundle(Path(directory), copies))
+
+        report("системный", [probe() for _ in range(runs)])
+        cache_dir = Path(directory) / "cache"
+        results = []
+        for _ in range(runs):
+            shutil.rmtree(cache_dir)
+            cache_dir.mkdir()
+            results.append(probe(fontconfig_file))
+        report("набор без кэша", results)
+        build_cache(fontconfig_file, Path(directory) / "truetype")
+        report(
+            "набор с кэшем",
+            [probe(fontconfig_file) for _ in range(runs)],
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
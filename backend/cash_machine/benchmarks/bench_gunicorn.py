@@ -0,0 +1,217 @@
+"""
+Замер задержки обычных чеков при смешанной нагрузке с большими
+чеками через gunicorn: sync-воркеры против gthread-воркеров
+(gunicorn.conf.py) с тем же количеством процессов.
+
+В отличие от benchmarks.bench_lanes, где клиенты - потоки одного
+процесса, здесь чеки пробиваются HTTP-запросами к gunicorn, как
+в production. Несколько клиентов непрерывно пробивают чеки из 3
+строк, одновременно другие клиенты пробивают чеки из сотен строк.
+wkhtmltopdf имитируется скриптом, время работы которого растёт
+с количеством строк. База данных и MEDIA_ROOT - временные.
+
+Запуск:
+
+    python -m benchmarks.bench_gunicorn [секунд на вариант] [воркеров]
+"""
+
+import json
+import os
+import socket
+import statistics
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from benchmarks import setup_django
+
+SMALL_LINES = 3
+LARGE_LINES = 400
+SMALL_CLIENTS = 4
+LARGE_CLIENTS = 3
+THREADS = 8
+
+SETTINGS = """
+from cash_machine.settings import *  # noqa: F401,F403
+
+MEDIA_ROOT = {media_root!r}
+WKHTMLTOPDF_DOCKER_PATH = {renderer!r}
+"""
+
+# Время рендеринга: запуск процесса и время на строку, как у
+# benchmarks.bench_lanes.
+RENDERER = """#!/bin/sh
+lines=$(grep -o "<tr>" | wc -l)
+sleep $(awk "BEGIN {print 0.02 + $lines * 0.001}")
+printf '%%PDF-1.4 benchmark'
+"""
+
+
+def prepare(directory: Path) -> dict:
+    """
+    Создаёт настройки, базу данных с товарами и имитацию wkhtmltopdf.
+
+    Returns:
+        dict: Окружение процессов gunicorn.
+    """
+    renderer = directory / "wkhtmltopdf"
+    renderer.write_text(RENDERER)
+    renderer.chmod(renderer.stat().st_mode | stat.S_IEXEC)
+    (directory / "media").mkdir()
+    (directory / "bench_settings.py").write_text(
+        SETTINGS.format(
+            media_root=str(directory / "media"), renderer=str(renderer)
+        )
+    )
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE="bench_settings",
+        PYTHONPATH=os.pathsep.join([str(directory), os.getcwd()]),
+        SQLITE_PATH=str(directory / "db.sqlite3"),
+    )
+    os.environ.update(env)
+    sys.path.insert(0, str(directory))
+    setup_django()
+
+    from django.core.management import call_command
+
+    from receipts.models import Item
+
+    call_command("migrate", verbosity=0)
+    Item.objects.bulk_create(
+        Item(title=f"Товар {number}", price=100 + number % 50)
+        for number in range(LARGE_LINES)
+    )
+    return env
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"{url}/healthz", timeout=1)
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn не запустился")
+
+
+def post_receipt(url: str, lines: int) -> float:
+    request = urllib.request.Request(
+        f"{url}/cash_machine",
+        data=json.dumps({"items": list(range(1, lines + 1))}).encode(),
+        headers={
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        },
+    )
+    started = time.perf_counter()
+    urllib.request.urlopen(request, timeout=120).read()
+    return time.perf_counter() - started
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def run(url: str, duration: float) -> tuple:
+    latencies = {SMALL_LINES: [], LARGE_LINES: []}
+    errors = []
+    stop = time.monotonic() + duration
+
+    def client(lines):
+        while time.monotonic() < stop:
+            try:
+                latencies[lines].append(post_receipt(url, lines))
+            except urllib.error.HTTPError as e:
+                errors.append(e.code)
+
+    threads = [
+        threading.Thread(target=client, args=(lines,))
+        for lines, count in (
+            (SMALL_LINES, SMALL_CLIENTS),
+            (LARGE_LINES, LARGE_CLIENTS),
+        )
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, len(errors)
+
+
+def main(duration: float = 10, workers: int = 2):
+    workers = int(workers)
+    variants = {
+        # При threads > 1 gunicorn заменяет sync на gthread.
+        f"sync ({workers})": ["--worker-class", "sync", "--threads", "1"],
+        f"gthread ({workers} x {THREADS})": [
+            "--worker-class",
+            "gthread",
+            "--threads",
+            str(THREADS),
+        ],
+    }
+    print(
+        f"Клиентов: {SMALL_CLIENTS} x {SMALL_LINES} строк, "
+        f"{LARGE_CLIENTS} x {LARGE_LINES} строк"
+    )
+    print(
+        f"{'вариант':>18}{'обычные p50':>14}{'p99':>10}"
+        f"{'большие p50':>14}{'чеков/с':>10}{'ошибок':>8}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        env = prepare(Path(directory))
+        for name, options in variants.items():
+            port = free_port()
+            url = f"http://127.0.0.1:{port}"
+            server = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "gunicorn",
+                    "cash_machine.wsgi:application",
+                    "--config",
+                    "gunicorn.conf.py",
+                    "--bind",
+                    f"127.0.0.1:{port}",
+                    "--workers",
+                    str(workers),
+                    *options,
+                ],
+                env=env,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_ready(url)
+                latencies, errors = run(url, duration)
+            finally:
+                server.terminate()
+                server.wait()
+            small, large = latencies[SMALL_LINES], latencies[LARGE_LINES]
+            print(
+                f"{name:>18}"
+                f"{statistics.median(small) * 1000:>11.0f} мс"
+                f"{percentile(small, 0.99) * 1000:>7.0f} мс"
+                f"{statistics.median(large) * 1000:>11.0f} мс"
+                f"{(len(small) + len(large)) / duration:>10.1f}"
+                f"{errors:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:]))
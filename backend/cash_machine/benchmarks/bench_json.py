@@ -0,0 +1,60 @@
+"""
+Сравнение скорости стандартных JSONParser/JSONRenderer из DRF
+с ORJSONParser/ORJSONRenderer на больших каталогах товаров.
+
+Запуск:
+
+    python -m benchmarks.bench_json [количество товаров]
+"""
+
+import io
+import sys
+from decimal import Decimal
+
+from benchmarks import measure, setup_django
+
+
+def main(count: int = 50_000):
+    setup_django()
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.parsers import ORJSONParser
+    from api.renderers import ORJSONRenderer
+
+    items = [
+        {
+            "id": i,
+            "title": f"Товар номер {i}",
+            "price": Decimal(f"{i % 1000}.{i % 100:02d}"),
+        }
+        for i in range(1, count + 1)
+    ]
+    payload = JSONRenderer().render(items)
+
+    print(f"Товаров: {count}, размер JSON: {len(payload) / 1024:.0f} КиБ")
+    print(f"{'':12}{'stdlib, мс':>14}{'orjson, мс':>14}{'ускорение':>12}")
+
+    for name, default, fast in (
+        (
+            "render",
+            lambda: JSONRenderer().render(items),
+            lambda: ORJSONRenderer().render(items),
+        ),
+        (
+            "parse",
+            lambda: JSONParser().parse(io.BytesIO(payload)),
+            lambda: ORJSONParser().parse(io.BytesIO(payload)),
+        ),
+    ):
+        default_time = measure(default)
+        fast_time = measure(fast)
+        print(
+            f"{name:12}{default_time * 1000:14.1f}{fast_time * 1000:14.1f}"
+            f"{default_time / fast_time:11.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
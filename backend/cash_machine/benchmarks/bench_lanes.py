@@ -0,0 +1,143 @@
+"""
+Замер задержки обычных чеков при смешанной нагрузке с большими
+чеками: общий пул рендеринга против отдельной полосы для больших
+чеков (RECEIPT_LARGE_WORKERS).
+
+Несколько клиентов непрерывно пробивают чеки из 3 строк,
+одновременно другие клиенты пробивают чеки из сотен строк.
+Рендеринг PDF имитируется внешним процессом, время работы которого
+растёт с количеством строк, как у wkhtmltopdf. В обоих вариантах
+всего RECEIPT_PIPELINE_WORKERS + RECEIPT_LARGE_WORKERS = 4 потока.
+
+Клиенты здесь - потоки одного процесса, поэтому замер показывает
+только работу пулов. Изоляцию под gunicorn (воркеры gthread против
+sync) замеряет benchmarks.bench_gunicorn.
+
+Запуск:
+
+    python -m benchmarks.bench_lanes [секунд на вариант]
+"""
+
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from benchmarks import setup_django
+
+SMALL_LINES = 3
+LARGE_LINES = 400
+SMALL_CLIENTS = 4
+LARGE_CLIENTS = 3
+
+
+def render_seconds(lines: int) -> float:
+    """
+    Время рендеринга чека: запуск процесса и время на строку.
+    """
+    return 0.02 + lines * 0.001
+
+
+def fake_render_pdf(view, html):
+    lines = html.count("<tr>")
+    subprocess.run(["sleep", str(render_seconds(lines))], check=True)
+    return b"%PDF-1.4 benchmark"
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def run(duration: float) -> dict:
+    from api.renderers import ORJSONRenderer
+    from api.views import CashMachineView
+
+    request = mock.Mock(accepted_renderer=ORJSONRenderer())
+    latencies = {SMALL_LINES: [], LARGE_LINES: []}
+    stop = time.monotonic() + duration
+    counter = iter(range(10**9))
+    lock = threading.Lock()
+
+    def client(lines):
+        html = "<tr></tr>" * lines
+        while time.monotonic() < stop:
+            with lock:
+                name = f"check_{next(counter)}.pdf"
+            started = time.perf_counter()
+            CashMachineView().create_pdf_receipt(
+                request, name, html, {}, line_count=lines
+            )
+            latencies[lines].append(time.perf_counter() - started)
+
+    threads = [
+        threading.Thread(target=client, args=(lines,))
+        for lines, count in (
+            (SMALL_LINES, SMALL_CLIENTS),
+            (LARGE_LINES, LARGE_CLIENTS),
+        )
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def main(duration: float = 5):
+    setup_django()
+
+    from django.test import override_settings
+
+    from api.renderers import large_executor, pipeline_executor
+    from api.views import CashMachineView
+
+    variants = {
+        "общий пул (4)": {
+            "RECEIPT_PIPELINE_WORKERS": 4,
+            "RECEIPT_LARGE_WORKERS": 0,
+        },
+        "полосы (3 + 1)": {
+            "RECEIPT_PIPELINE_WORKERS": 3,
+            "RECEIPT_LARGE_WORKERS": 1,
+        },
+    }
+    print(
+        f"Клиентов: {SMALL_CLIENTS} x {SMALL_LINES} строк, "
+        f"{LARGE_CLIENTS} x {LARGE_LINES} строк; "
+        f"рендеринг {render_seconds(SMALL_LINES) * 1000:.0f} и "
+        f"{render_seconds(LARGE_LINES) * 1000:.0f} мс"
+    )
+    print(
+        f"{'вариант':>16}{'обычные p50':>14}{'p99':>10}"
+        f"{'большие p50':>14}{'чеков/с':>10}"
+    )
+    with tempfile.TemporaryDirectory() as media_root, mock.patch.object(
+        CashMachineView, "render_pdf", fake_render_pdf
+    ):
+        for name, options in variants.items():
+            pipeline_executor.cache_clear()
+            large_executor.cache_clear()
+            with override_settings(
+                MEDIA_ROOT=media_root,
+                RECEIPT_PERSIST="sync",
+                RECEIPT_LARGE_LINES=50,
+                **options,
+            ):
+                latencies = run(duration)
+            small, large = latencies[SMALL_LINES], latencies[LARGE_LINES]
+            print(
+                f"{name:>16}"
+                f"{statistics.median(small) * 1000:>11.0f} мс"
+                f"{percentile(small, 0.99) * 1000:>7.0f} мс"
+                f"{statistics.median(large) * 1000:>11.0f} мс"
+                f"{(len(small) + len(large)) / duration:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:]))
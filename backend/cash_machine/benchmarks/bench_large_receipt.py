@@ -0,0 +1,120 @@
+"""
+Замер пиковой памяти и времени формирования PDF очень больших
+чеков: HTML, собранный в строку, против рендеринга шаблона
+по частям с потоковой передачей в wkhtmltopdf (api.documents).
+
+Варианты:
+    django+jinja - прежний способ: шаблон рендерится Django,
+        результат повторно компилируется и рендерится Jinja2,
+        HTML передаётся процессу одной строкой;
+    строка - шаблон рендерится Jinja2 в строку;
+    по частям - ReceiptDocument и run_streaming.
+
+wkhtmltopdf имитируется процессом, который читает HTML целиком
+и выводит короткий PDF, поэтому замеряется память Python-процесса
+(tracemalloc) без учёта самого рендерера. Данные чека создаются
+до начала замера.
+
+Запуск:
+
+    python -m benchmarks.bench_large_receipt [строк в чеке ...]
+"""
+
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from decimal import Decimal
+
+from benchmarks import setup_django
+
+LINES = (1000, 10_000, 50_000)
+
+
+def fake_wkhtmltopdf(directory: str) -> str:
+    path = os.path.join(directory, "wkhtmltopdf")
+    with open(path, "w") as file:
+        file.write("#!/bin/sh\ncat > /dev/null\nprintf '%%PDF-1.4'\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def main(*lines: int):
+    setup_django()
+
+    from django.conf import settings
+    from django.template.loader import render_to_string
+
+    from api import lazy
+    from api.documents import (
+        ReceiptDocument,
+        page_count,
+        paginate,
+        render_receipt_html,
+        run_streaming,
+    )
+    from api.views import CashMachineView
+
+    class Row:
+        def __init__(self, number):
+            self.title = f"Товар {number}"
+            self.price = Decimal(100 + number % 50)
+
+    def django_jinja(context, args):
+        per_page = settings.RECEIPT_PAGE_LINES
+        first_page = settings.RECEIPT_FIRST_PAGE_LINES
+        items = context["items"]
+        html = render_to_string(
+            "receipt.html",
+            dict(
+                context,
+                pages=list(paginate(items, per_page, first_page)),
+                page_count=page_count(len(items), per_page, first_page),
+            ),
+        )
+        html = lazy.jinja_environment().from_string(html).render()
+        return subprocess.run(
+            args, input=html.encode(), capture_output=True
+        ).stdout
+
+    def string(context, args):
+        html = render_receipt_html(context)
+        return subprocess.run(
+            args, input=html.encode(), capture_output=True
+        ).stdout
+
+    def streaming(context, args):
+        return run_streaming(args, ReceiptDocument(context), 600)[1]
+
+    variants = (
+        ("django+jinja", django_jinja),
+        ("строка", string),
+        ("по частям", streaming),
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        args = [fake_wkhtmltopdf(directory)]
+        view = CashMachineView()
+        for count in lines or LINES:
+            context = view.receipt_context(
+                [Row(number) for number in range(count)], "01.01.2024 10:00"
+            )
+            html_size = len(render_receipt_html(context).encode())
+            print(f"Строк в чеке: {count}, HTML {html_size / 2**20:.1f} МиБ")
+            for name, render in variants:
+                tracemalloc.start()
+                started = time.perf_counter()
+                render(context, args)
+                seconds = time.perf_counter() - started
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(
+                    f"{name:>14}: пик {peak / 2**20:8.2f} МиБ, "
+                    f"{seconds * 1000:8.0f} мс"
+                )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,103 @@
+"""
+Замер накладных расходов логирования на один запрос.
+
+Сравниваются синхронный StreamHandler с f-строками (как было раньше)
+и QueueListenerHandler с ленивым %-форматированием, JSON-форматом
+и выборочной записью информационных сообщений. Вывод идёт в поток,
+каждая запись в который занимает delay миллисекунд, что имитирует
+медленный или переполненный pipe stdout.
+
+Запуск:
+
+    python -m benchmarks.bench_logging [задержка записи, мс]
+"""
+
+import logging
+import sys
+import time
+
+from benchmarks import measure
+
+REQUESTS = 200
+ITEM_IDS = list(range(10_000))
+
+
+class SlowStream:
+    """
+    Поток вывода, каждая запись в который занимает delay секунд.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def write(self, text):
+        time.sleep(self.delay)
+
+    def flush(self):
+        pass
+
+
+def eager_request(logger):
+    logger.info("HTML-код успешно сгенерирован.")
+    logger.info("Файл чека в формате .pdf успешно сгенерирован.")
+    logger.info("Данные чека успешно сформированы.")
+    logger.info(f"Товары успешно созданы: {ITEM_IDS}")
+
+
+def lazy_request(logger):
+    logger.info("HTML-код успешно сгенерирован.")
+    logger.info("Файл чека в формате .pdf успешно сгенерирован.")
+    logger.info("Данные чека успешно сформированы.")
+    logger.info("Товары успешно созданы: %s шт.", len(ITEM_IDS))
+
+
+def run(logger, request):
+    for _ in range(REQUESTS):
+        request(logger)
+
+
+def main(delay_ms: float = 0.2):
+    from cash_machine.log import (
+        JSONFormatter,
+        QueueListenerHandler,
+        SamplingFilter,
+    )
+
+    stream = SlowStream(delay_ms / 1000)
+
+    sync_logger = logging.getLogger("bench.sync")
+    sync_logger.propagate = False
+    sync_logger.addHandler(logging.StreamHandler(stream))
+    sync_logger.setLevel(logging.INFO)
+
+    console = logging.StreamHandler(stream)
+    console.setFormatter(JSONFormatter())
+    queue_handler = QueueListenerHandler([console], queue_size=100_000)
+    queue_logger = logging.getLogger("bench.queue")
+    queue_logger.propagate = False
+    queue_logger.addHandler(queue_handler)
+    queue_logger.setLevel(logging.INFO)
+
+    sampled_handler = QueueListenerHandler([console], queue_size=100_000)
+    sampled_handler.addFilter(SamplingFilter(rates={"bench": 0.1}))
+    sampled_logger = logging.getLogger("bench.sampled")
+    sampled_logger.propagate = False
+    sampled_logger.addHandler(sampled_handler)
+    sampled_logger.setLevel(logging.INFO)
+
+    print(f"Задержка записи: {delay_ms} мс, запросов: {REQUESTS}")
+    print(f"{'':40}{'мкс/запрос':>12}")
+    for name, logger, request in (
+        ("StreamHandler, f-строки", sync_logger, eager_request),
+        ("QueueListenerHandler, JSON", queue_logger, lazy_request),
+        ("QueueListenerHandler, JSON, 10%", sampled_logger, lazy_request),
+    ):
+        elapsed = measure(lambda: run(logger, request), repeat=3)
+        print(f"{name:40}{elapsed / REQUESTS * 1e6:12.1f}")
+
+    queue_handler.stop()
+    sampled_handler.stop()
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:2]))
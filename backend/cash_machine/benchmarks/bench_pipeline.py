@@ -0,0 +1,93 @@
+"""
+Замер задержки POST /cash_machine при последовательной
+и параллельной генерации PDF и QR-кода (RECEIPT_PIPELINE_WORKERS).
+
+Если wkhtmltopdf не установлен, рендеринг PDF заменяется внешним
+процессом, который работает pdf_ms миллисекунд, что соответствует
+запуску wkhtmltopdf для чека формата A7.
+
+Запуск:
+
+    python -m benchmarks.bench_pipeline [pdf_ms]
+"""
+
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+from benchmarks import measure, setup_django, test_database
+
+
+def fake_render_pdf(pdf_ms: float):
+    command = ["sleep", str(pdf_ms / 1000)]
+
+    def render_pdf(view, html):
+        subprocess.run(command, check=True)
+        return b"%PDF-1.4 benchmark"
+
+    return render_pdf
+
+
+def main(pdf_ms: float = 150):
+    setup_django()
+
+    from django.test import override_settings
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from api.views import CashMachineView
+    from receipts.models import Item
+
+    setup_test_environment()
+    patches = []
+    if shutil.which("wkhtmltopdf") is None:
+        patches.append(
+            mock.patch.object(
+                CashMachineView, "render_pdf", fake_render_pdf(pdf_ms)
+            )
+        )
+        print(f"wkhtmltopdf не найден, PDF имитируется процессом {pdf_ms} мс")
+
+    with test_database(), tempfile.TemporaryDirectory() as media_root:
+        ids = [
+            Item.objects.create(title=f"Товар {i}", price=10 + i).id
+            for i in range(10)
+        ]
+        client = APIClient()
+
+        def request():
+            response = client.post(
+                reverse("cash_machine"),
+                {"items": ids},
+                format="json",
+                HTTP_ACCEPT="image/png",
+            )
+            assert response.status_code == 200, response.content
+
+        results = {}
+        for patch in patches:
+            patch.start()
+        try:
+            for workers in (0, 4):
+                with override_settings(
+                    MEDIA_ROOT=media_root,
+                    RECEIPT_PIPELINE_WORKERS=workers,
+                    RECEIPT_PERSIST="sync",
+                ):
+                    request()
+                    results[workers] = measure(request, repeat=10)
+        finally:
+            for patch in patches:
+                patch.stop()
+
+    sequential, pipelined = results[0], results[4]
+    print(f"Последовательно: {sequential * 1000:.1f} мс на запрос")
+    print(f"Параллельно:     {pipelined * 1000:.1f} мс на запрос")
+    print(f"Выигрыш:         {(sequential - pipelined) * 1000:.1f} мс")
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,96 @@
+"""
+Замер поиска чеков (GET /api/v1/receipts/) на большой таблице:
+первая страница, страница в середине выборки по ключу after,
+отбор по сумме и по товару.
+
+Запуск:
+
+    python -m benchmarks.bench_receipt_lookup [количество чеков]
+"""
+
+import datetime
+import sys
+
+from benchmarks import measure, setup_django, test_database
+
+
+def fill(count: int):
+    from django.utils import timezone
+
+    from receipts.models import Item, Receipt, Sale
+
+    items = [
+        Item.objects.create(title=f"Товар {i}", price=10 + i)
+        for i in range(100)
+    ]
+    start = timezone.now() - datetime.timedelta(seconds=count)
+    batch_size = 10_000
+    for offset in range(0, count, batch_size):
+        receipts = Receipt.objects.bulk_create(
+            Receipt(
+                file_name=f"check_{number}.pdf",
+                created_at=start + datetime.timedelta(seconds=number),
+                total=items[number % 100].price,
+                line_count=1,
+            )
+            for number in range(offset, min(offset + batch_size, count))
+        )
+        Sale.objects.bulk_create(
+            Sale(
+                receipt=receipt,
+                item=items[receipt.id % 100],
+                title="Товар",
+                price=receipt.total,
+                total=receipt.total,
+                created_at=receipt.created_at,
+            )
+            for receipt in receipts
+        )
+    return items
+
+
+def main(count: int = 200_000):
+    setup_django()
+
+    from django.contrib.auth.models import User
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from api.views import encode_cursor
+    from receipts.models import Receipt
+
+    setup_test_environment()
+    with test_database():
+        items = fill(count)
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_user(username="admin", is_staff=True)
+        )
+        middle = Receipt.objects.get(file_name=f"check_{count // 2}.pdf")
+        url = reverse("receipts_list")
+        cases = {
+            "первая страница": {},
+            "середина по after": {
+                "after": encode_cursor(middle.created_at, middle.id)
+            },
+            "min_total": {"min_total": 105},
+            "item": {"item": items[7].id},
+            "item + after": {
+                "item": items[7].id,
+                "after": encode_cursor(middle.created_at, middle.id),
+            },
+        }
+
+        print(f"Чеков: {count}")
+        for name, params in cases.items():
+
+            def request():
+                response = client.get(url, params)
+                assert response.status_code == 200, response.content
+
+            print(f"{name:>20}: {measure(request) * 1000:.2f} мс")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
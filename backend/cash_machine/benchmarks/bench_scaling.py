@@ -0,0 +1,142 @@
+"""
+Замер масштабируемости эндпоинтов на синтетических данных
+(receipts.fixtures, команда gen_fixtures):
+
+- POST /cash_machine, POST /api/v1/create_items/ и GET файла чека
+  в зависимости от размера каталога;
+- POST /cash_machine в зависимости от размера корзины;
+- POST /cash_machine и GET файла чека в зависимости от количества
+  чеков в хранилище.
+
+Рендеринг PDF заменяется готовым содержимым, поэтому замеры
+показывают накладные расходы сервиса без wkhtmltopdf.
+
+Запуск:
+
+    python -m benchmarks.bench_scaling [каталоги] [корзины] [чеки]
+
+    python -m benchmarks.bench_scaling 1000,10000,100000 1,10,50 1000,10000
+"""
+
+import itertools
+import random
+import sys
+import tempfile
+from unittest import mock
+
+from benchmarks import measure, setup_django, test_database
+
+CATALOG_SIZES = (1_000, 10_000, 100_000)
+CART_SIZES = (1, 10, 50, 200)
+RECEIPT_COUNTS = (1_000, 10_000)
+
+
+def sizes(arg: str) -> tuple:
+    return tuple(int(value) for value in arg.split(","))
+
+
+def main(
+    catalog_sizes=CATALOG_SIZES,
+    cart_sizes=CART_SIZES,
+    receipt_counts=RECEIPT_COUNTS,
+):
+    setup_django()
+
+    from django.test import override_settings
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from api.views import CashMachineView
+    from receipts.fixtures import (
+        generate_items,
+        generate_receipts,
+        receipt_pdf,
+    )
+    from receipts.models import Item, Receipt
+
+    setup_test_environment()
+    rng = random.Random(0)
+    client = APIClient()
+    new_ids = itertools.count(10**9)
+
+    def check(cart):
+        def request():
+            response = client.post(
+                reverse("cash_machine"),
+                {"items": cart},
+                format="json",
+                HTTP_ACCEPT="application/json",
+            )
+            assert response.status_code == 200, response.content
+
+        return request
+
+    def create_items():
+        data = [
+            {"id": next(new_ids), "title": "Новый товар", "price": 10}
+            for _ in range(100)
+        ]
+        response = client.post(reverse("create_items"), data, format="json")
+        assert response.status_code == 201, response.content
+
+    def read_file():
+        name = Receipt.objects.values_list("file_name", flat=True).first()
+        url = reverse("qr_code_file", kwargs={"file_name": name})
+
+        def request():
+            response = client.get(url)
+            assert response.status_code == 200
+            b"".join(response.streaming_content)
+
+        return request
+
+    def cart(size, catalog):
+        return rng.sample(range(1, catalog + 1), size)
+
+    def row(*cells):
+        print("".join(f"{cell:>16}" for cell in cells))
+
+    render = mock.patch.object(
+        CashMachineView,
+        "render_pdf",
+        lambda view, html: receipt_pdf("benchmark"),
+    )
+    with test_database(), tempfile.TemporaryDirectory() as media_root:
+        with override_settings(
+            MEDIA_ROOT=media_root, RECEIPT_PERSIST="sync"
+        ), render:
+            print("Размер каталога (мс на запрос):")
+            row("товаров", "cash_machine", "create_items", "файл чека")
+            total = 0
+            for size in catalog_sizes:
+                generate_items(size - total)
+                total = size
+                row(
+                    size,
+                    f"{measure(check(cart(5, total))) * 1000:.2f}",
+                    f"{measure(create_items) * 1000:.2f}",
+                    f"{measure(read_file()) * 1000:.2f}",
+                )
+                Item.objects.filter(id__gte=10**9).delete()
+
+            print(f"\nРазмер корзины (каталог {total} товаров):")
+            row("товаров в чеке", "cash_machine")
+            for size in cart_sizes:
+                row(size, f"{measure(check(cart(size, total))) * 1000:.2f}")
+
+            print("\nКоличество чеков в хранилище:")
+            row("чеков", "cash_machine", "файл чека")
+            count = Receipt.objects.count()
+            for size in receipt_counts:
+                generate_receipts(max(0, size - count), seed=size)
+                count = max(count, size)
+                row(
+                    count,
+                    f"{measure(check(cart(5, total))) * 1000:.2f}",
+                    f"{measure(read_file()) * 1000:.2f}",
+                )
+
+
+if __name__ == "__main__":
+    main(*(sizes(arg) for arg in sys.argv[1:]))
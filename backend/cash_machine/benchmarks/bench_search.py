@@ -0,0 +1,61 @@
+"""
+Замер задержки поиска товаров на большом каталоге.
+
+Запуск:
+
+    python -m benchmarks.bench_search [количество товаров]
+"""
+
+import random
+import sys
+import time
+
+from benchmarks import setup_django, test_database
+
+WORDS = (
+    "макароны огурцы картошка молоко кефир сыр хлеб батон масло яйца "
+    "сахар соль чай кофе сок вода йогурт творог сметана колбаса "
+    "pasta milk bread cheese butter coffee tea juice water sugar"
+).split()
+
+
+def main(count: int = 1_000_000, queries: int = 200):
+    setup_django()
+
+    from django.db import connection, transaction
+
+    from receipts.search import search_items
+
+    rng = random.Random(1)
+    with test_database():
+        start = time.perf_counter()
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO receipts_item (title, price) VALUES (%s, %s)",
+                (
+                    (
+                        " ".join(rng.sample(WORDS, 3)) + f" {i}",
+                        rng.randint(1, 1000),
+                    )
+                    for i in range(count)
+                ),
+            )
+        print(
+            f"Товаров: {count}, загрузка с индексацией: "
+            f"{time.perf_counter() - start:.1f} с"
+        )
+
+        for query in ("мак", "молоко сыр", "pas", "кофе 12"):
+            timings = []
+            for _ in range(queries):
+                start = time.perf_counter()
+                search_items(query, 20)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            p50 = timings[len(timings) // 2] * 1000
+            p99 = timings[int(len(timings) * 0.99)] * 1000
+            print(f"q={query!r:14} p50={p50:.2f} мс p99={p99:.2f} мс")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
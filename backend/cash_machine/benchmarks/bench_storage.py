@@ -0,0 +1,91 @@
+"""
+Сравнение хранения чеков отдельными файлами и в пакетном хранилище:
+скорость записи и чтения и занимаемое на диске место.
+
+Запуск:
+
+    python -m benchmarks.bench_storage [количество чеков]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import setup_django, test_database
+
+# Типичный чек A7 из wkhtmltopdf занимает около 15-20 КиБ.
+RECEIPT_SIZE = 18 * 1024
+
+
+def disk_usage(path: Path) -> int:
+    """
+    Возвращает занятое на диске место (по блокам) для каталога.
+    """
+    return sum(
+        os.stat(os.path.join(root, name)).st_blocks * 512
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def bench_files(location: Path, receipts: list) -> dict:
+    start = time.perf_counter()
+    for name, content in receipts:
+        with open(location / name, "wb") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+    write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name, _ in receipts:
+        with open(location / name, "rb") as file:
+            file.read()
+    read = time.perf_counter() - start
+    return {"write": write, "read": read, "disk": disk_usage(location)}
+
+
+def bench_pack(location: Path, receipts: list) -> dict:
+    from django.core.files.base import ContentFile
+
+    from receipts.storage import PackFileStorage
+
+    storage = PackFileStorage(location)
+    start = time.perf_counter()
+    for name, content in receipts:
+        storage.save(name, ContentFile(content))
+    write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name, _ in receipts:
+        bytes(storage.open_view(name))
+    read = time.perf_counter() - start
+    return {"write": write, "read": read, "disk": disk_usage(location)}
+
+
+def main(count: int = 2000):
+    setup_django()
+    receipts = [
+        (f"check_01.01.2024_12_00_{i}.pdf", os.urandom(RECEIPT_SIZE))
+        for i in range(count)
+    ]
+
+    with test_database(), tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, "files").mkdir()
+        files = bench_files(Path(tmp, "files"), receipts)
+        pack = bench_pack(Path(tmp, "pack"), receipts)
+
+    print(f"Чеков: {count} по {RECEIPT_SIZE // 1024} КиБ")
+    print(f"{'':10}{'запись/с':>12}{'чтение/с':>12}{'на диске, МиБ':>16}")
+    for name, result in (("files", files), ("pack", pack)):
+        print(
+            f"{name:10}{count / result['write']:12.0f}"
+            f"{count / result['read']:12.0f}"
+            f"{result['disk'] / 2**20:16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
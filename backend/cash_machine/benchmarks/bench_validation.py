@@ -0,0 +1,110 @@
+"""
+Замер доли проверки тела запроса (api.validation) во времени
+обработки POST /cash_machine и POST /api/v1/create_items/.
+
+Рендеринг PDF заменяется готовым содержимым, поэтому доля
+считается от времени запроса без wkhtmltopdf, то есть завышена.
+
+Запуск:
+
+    python -m benchmarks.bench_validation
+"""
+
+import itertools
+import tempfile
+from unittest import mock
+
+from benchmarks import measure, setup_django, test_database
+
+CART_SIZES = (10, 100, 1000)
+LOAD_SIZES = (1000, 10_000)
+
+
+def main():
+    setup_django()
+
+    from django.test import override_settings
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from api.validation import (
+        validate_cart,
+        validate_item_row,
+        validate_item_rows,
+    )
+    from api.views import CashMachineView
+    from receipts.fixtures import generate_items, receipt_pdf
+
+    setup_test_environment()
+    client = APIClient()
+    new_ids = itertools.count(10**6)
+
+    def row(*cells):
+        print("".join(f"{cell:>16}" for cell in cells))
+
+    render = mock.patch.object(
+        CashMachineView,
+        "render_pdf",
+        lambda view, html: receipt_pdf("benchmark"),
+    )
+    with test_database(), tempfile.TemporaryDirectory() as media_root:
+        ids = list(generate_items(max(CART_SIZES)))
+        with override_settings(
+            MEDIA_ROOT=media_root, RECEIPT_PERSIST="sync"
+        ), render:
+            print("POST /cash_machine:")
+            row("товаров", "проверка, мкс", "запрос, мс", "доля, %")
+            for size in CART_SIZES:
+                data = {"items": ids[:size]}
+
+                def request():
+                    response = client.post(
+                        reverse("cash_machine"),
+                        data,
+                        format="json",
+                        HTTP_ACCEPT="application/json",
+                    )
+                    assert response.status_code == 200, response.content
+
+                check = measure(lambda: validate_cart(data), repeat=50)
+                total = measure(request)
+                row(
+                    size,
+                    f"{check * 1e6:.1f}",
+                    f"{total * 1000:.2f}",
+                    f"{check / total * 100:.2f}",
+                )
+
+            print("\nPOST /api/v1/create_items/:")
+            row("строк", "проверка, мс", "запрос, мс", "доля, %")
+            for size in LOAD_SIZES:
+
+                def rows():
+                    return [
+                        {"id": next(new_ids), "title": "Товар", "price": 9.99}
+                        for _ in range(size)
+                    ]
+
+                def validate(data=rows()):
+                    for item in validate_item_rows(data):
+                        validate_item_row(item)
+
+                def request():
+                    response = client.post(
+                        reverse("create_items"), rows(), format="json"
+                    )
+                    assert response.status_code == 201, response.content
+
+                check = measure(validate)
+                total = measure(request, repeat=3)
+                row(
+                    size,
+                    f"{check * 1000:.2f}",
+                    f"{total * 1000:.2f}",
+                    f"{check / total * 100:.2f}",
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Отчёт о времени импорта приложения на основе `python -X importtime`.
+
+Замеряет загрузку Django и всех URL-конфигураций в отдельном процессе,
+как это делает воркер gunicorn, и выводит самые медленные модули.
+Завершается с ошибкой, если при загрузке были импортированы тяжёлые
+зависимости из api.lazy.HEAVY_MODULES или общее время превысило порог.
+
+Запуск:
+
+    python -m benchmarks.importtime [--top 15] [--budget-ms 1000]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from api.lazy import HEAVY_MODULES
+
+# jinja2 подгружается самим django.test (через drf_spectacular.plumbing),
+# поэтому проверяются только зависимости, которые импортирует наш код.
+CHECKED_MODULES = set(HEAVY_MODULES) - {"jinja2"}
+
+BOOT_CODE = (
+    "import django; django.setup(); "
+    "import cash_machine.urls, cash_machine.wsgi"
+)
+
+
+def collect() -> list[tuple[int, int, str]]:
+    """
+    Запускает загрузку приложения и разбирает вывод -X importtime.
+
+    Returns:
+        list: Кортежи (собственное время, суммарное время, модуль) в мкс.
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE="cash_machine.settings")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT_CODE],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line.removeprefix("import time:").split("|")
+        self_us, cumulative_us, name = fields
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    rows = collect()
+    total_ms = sum(row[0] for row in rows) / 1000
+    imported = {row[2] for row in rows}
+
+    print(f"Модулей импортировано: {len(rows)}, всего: {total_ms:.1f} мс")
+    print(f"{'суммарно, мс':>14}  модуль")
+    for _, cumulative_us, name in sorted(rows, key=lambda r: -r[1])[
+        : args.top
+    ]:
+        print(f"{cumulative_us / 1000:14.1f}  {name}")
+
+    failed = False
+    heavy = sorted(CHECKED_MODULES & imported)
+    if heavy:
+        print(f"Тяжёлые модули загружаются при старте: {', '.join(heavy)}")
+        failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"Превышен бюджет времени импорта: {args.budget_ms} мс")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
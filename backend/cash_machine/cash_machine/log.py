@@ -0,0 +1,173 @@
+"""
+Неблокирующее логирование для обработки запросов.
+
+Записи журнала помещаются в очередь QueueListenerHandler и выводятся
+фоновым потоком QueueListener, поэтому медленный или заблокированный
+stdout не задерживает воркеры. Сообщения форматируются в потоке
+вывода, уже после фильтрации: при выборочной записи (SamplingFilter)
+отброшенные сообщения не форматируются вовсе. JSONFormatter выводит
+каждую запись одной строкой JSON. Количество записей, отброшенных
+при переполнении очереди, отдаётся эндпоинтом /metrics
+(см. dropped_records).
+
+Аргументы сообщений передаются в потоковый обработчик по ссылке,
+поэтому изменяемые объекты нельзя менять после вызова логгера.
+"""
+
+import atexit
+import datetime
+import json
+import logging
+import os
+import queue
+import threading
+import weakref
+from logging.handlers import QueueHandler, QueueListener
+
+# Созданные обработчики QueueListenerHandler для сбора метрик.
+_handlers = weakref.WeakSet()
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Форматтер, выводящий запись журнала одной строкой JSON.
+
+    Поля: time, level, logger, message и, при наличии, exc_info.
+    """
+
+    def format(self, record):
+        data = {
+            "time": datetime.datetime.fromtimestamp(
+                record.created, datetime.timezone.utc
+            ).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and record.exc_info[0] is not None:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Фильтр, пропускающий только часть информационных сообщений.
+
+    Для логгеров из rates (и их потомков) записи уровня ниже
+    WARNING пропускаются с указанной долей: при доле 0.1 выводится
+    каждая десятая запись каждого логгера. Предупреждения и ошибки
+    выводятся всегда.
+
+    Attributes:
+        rates (dict): Доля выводимых записей по именам логгеров.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def rate_for(self, name: str) -> float:
+        """
+        Возвращает долю выводимых записей для логгера name.
+        """
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record.name)
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+
+        with self._lock:
+            count = self._counters.get(record.name, 0)
+            self._counters[record.name] = count + 1
+        return count % round(1 / rate) == 0
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Обработчик, передающий записи в очередь фонового потока вывода.
+
+    Очередь ограничена queue_size записями: при переполнении новые
+    записи отбрасываются и подсчитываются в dropped (под блокировкой:
+    enqueue вызывается из разных потоков), чтобы запросы не ждали
+    вывода. После fork (воркеры gunicorn при preload_app)
+    очередь и поток вывода создаются в дочернем процессе заново.
+
+    Attributes:
+        listener (QueueListener): Поток, выводящий записи в handlers.
+        dropped (int): Количество отброшенных записей.
+    """
+
+    def __init__(self, handlers, queue_size=10000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        # ConvertingList из dictConfig превращает ссылки cfg://
+        # в объекты обработчиков только при обращении по индексу.
+        self.handlers = [handlers[i] for i in range(len(handlers))]
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self.listener = None
+        _handlers.add(self)
+        self.start()
+        atexit.register(self.stop)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._restart)
+
+    def start(self):
+        """
+        Запускает поток вывода записей.
+        """
+        self.listener = QueueListener(
+            self.queue, *self.handlers, respect_handler_level=True
+        )
+        self.listener.start()
+
+    def stop(self):
+        """
+        Выводит оставшиеся записи и останавливает поток вывода.
+        """
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+
+    def _restart(self):
+        self.queue = queue.Queue(maxsize=self.queue_size)
+        # Блокировка могла быть захвачена другим потоком в момент fork.
+        self._dropped_lock = threading.Lock()
+        self.dropped = 0
+        self.start()
+
+    def prepare(self, record):
+        # Форматирование выполняется в потоке вывода.
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+def dropped_records() -> dict:
+    """
+    Возвращает количество отброшенных записей журнала.
+
+    Returns:
+        dict: Количество отброшенных записей по именам обработчиков
+        (имя обработчика из LOGGING, по умолчанию "queue").
+    """
+    dropped = {}
+    for handler in list(_handlers):
+        name = handler.name or "queue"
+        dropped[name] = dropped.get(name, 0) + handler.dropped
+    return dropped
@@ -22,12 +22,12 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
     "drf_spectacular",
-    "jinja2",
     "api.apps.ApiConfig",
     "receipts.apps.ReceiptsConfig",
 ]
 
 MIDDLEWARE = [
+    "api.middleware.QueryCountMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -43,6 +43,20 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Быстрые JSON-парсер и рендерер на основе orjson (опционально).
+FAST_JSON = os.getenv("FAST_JSON", "False") == "True"
+
+if FAST_JSON:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = [
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ]
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = [
+        "api.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ]
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -67,7 +81,8 @@ WSGI_APPLICATION = "cash_machine.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        # В контейнере база лежит на томе (SQLITE_PATH задан в образе).
+        "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
     }
 }
 
@@ -105,27 +120,153 @@ MEDIA_URL = "/media/"
 
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Хранилище чеков: "files" - отдельный PDF-файл на каждый чек в MEDIA_ROOT,
+# "pack" - сегменты append-only с индексом в БД (receipts.storage),
+# "s3" - S3-совместимое объектное хранилище (receipts.s3, extra "s3").
+RECEIPT_STORAGE = os.getenv("RECEIPT_STORAGE", "files")
+
+RECEIPT_PACK_ROOT = BASE_DIR / "packs"
+
+RECEIPT_PACK_SEGMENT_SIZE = int(
+    os.getenv("RECEIPT_PACK_SEGMENT_SIZE", 64 * 1024 * 1024)
+)
+
+RECEIPT_S3_BUCKET = os.getenv("RECEIPT_S3_BUCKET", "receipts")
+
+RECEIPT_S3_PREFIX = os.getenv("RECEIPT_S3_PREFIX", "")
+
+# Адрес S3-совместимого хранилища, например http://minio:9000.
+# Пустое значение - AWS S3.
+RECEIPT_S3_ENDPOINT_URL = os.getenv("RECEIPT_S3_ENDPOINT_URL", "")
+
+RECEIPT_S3_REGION = os.getenv("RECEIPT_S3_REGION", "")
+
+RECEIPT_S3_ACCESS_KEY = os.getenv("RECEIPT_S3_ACCESS_KEY", "")
+
+RECEIPT_S3_SECRET_KEY = os.getenv("RECEIPT_S3_SECRET_KEY", "")
+
+RECEIPT_S3_MAX_POOL_CONNECTIONS = int(
+    os.getenv("RECEIPT_S3_MAX_POOL_CONNECTIONS", 20)
+)
+
+RECEIPT_S3_MULTIPART_THRESHOLD = int(
+    os.getenv("RECEIPT_S3_MULTIPART_THRESHOLD", 8 * 1024 * 1024)
+)
+
+RECEIPT_S3_PRESIGN_EXPIRES = int(os.getenv("RECEIPT_S3_PRESIGN_EXPIRES", 300))
+
+# Отдавать чеки перенаправлением на подписанную ссылку S3.
+RECEIPT_S3_REDIRECT = os.getenv("RECEIPT_S3_REDIRECT", "True") == "True"
+
+# Превышение бюджета запросов к БД (api.decorators.query_budget):
+# False - предупреждение в лог, True - исключение (для тестов).
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "False") == "True"
+
+# Запись PDF чека в хранилище: "sync" - до ответа клиенту,
+# "async" - рендеринг и запись в фоновом потоке после ответа (файл,
+# который ещё не записан, формируется заново по ссылке /r/<token>).
+RECEIPT_PERSIST = os.getenv("RECEIPT_PERSIST", "sync")
+
+# Количество потоков, в которых параллельно генерируются QR-код
+# и PDF чека (0 - последовательно, в потоке запроса).
+RECEIPT_PIPELINE_WORKERS = int(os.getenv("RECEIPT_PIPELINE_WORKERS", 4))
+
+# Полоса больших чеков: чек больше RECEIPT_LARGE_LINES строк или
+# RECEIPT_LARGE_HTML_BYTES байт HTML рендерится в отдельном пуле
+# из RECEIPT_LARGE_WORKERS потоков (0 - без отдельной полосы).
+RECEIPT_LARGE_LINES = int(os.getenv("RECEIPT_LARGE_LINES", 50))
+RECEIPT_LARGE_HTML_BYTES = int(
+    os.getenv("RECEIPT_LARGE_HTML_BYTES", 32 * 1024)
+)
+RECEIPT_LARGE_WORKERS = int(os.getenv("RECEIPT_LARGE_WORKERS", 1))
+
+# Строк чека на странице PDF (A7). Шапка таблицы повторяется
+# на каждой странице, у многостраничного чека выводятся итоги страниц.
+RECEIPT_PAGE_LINES = int(os.getenv("RECEIPT_PAGE_LINES", 10))
+# Строк чека на первой странице, над таблицей которой выводится шапка
+# чека (реквизиты, время). Значения по умолчанию оценены по CSS шаблона;
+# при смене шаблона или шрифтов их проверяет RenderedPagesTest.
+RECEIPT_FIRST_PAGE_LINES = int(os.getenv("RECEIPT_FIRST_PAGE_LINES", 4))
+
+# Конфигурация fontconfig с набором шрифтов чека (fonts/fonts.conf
+# и кэш, построенный при сборке образа). Передаётся wkhtmltopdf
+# в переменной FONTCONFIG_FILE; пусто - системные шрифты.
+RECEIPT_FONTCONFIG_FILE = os.getenv("RECEIPT_FONTCONFIG_FILE", "")
+
+# Таймаут рендеринга PDF одного чека (wkhtmltopdf), секунды.
+RECEIPT_PDF_TIMEOUT = float(os.getenv("RECEIPT_PDF_TIMEOUT", 10))
+
+# Выключатель рендеринга PDF: после RECEIPT_BREAKER_FAILURES ошибок
+# подряд чеки сохраняются в HTML, пробный рендеринг PDF выполняется
+# не раньше чем через RECEIPT_BREAKER_RESET секунд.
+RECEIPT_BREAKER_FAILURES = int(os.getenv("RECEIPT_BREAKER_FAILURES", 3))
+RECEIPT_BREAKER_RESET = float(os.getenv("RECEIPT_BREAKER_RESET", 30))
+
+# Ограничения тела запросов: товаров в одном чеке
+# и строк в одной загрузке каталога (api.validation).
+RECEIPT_MAX_ITEMS = int(os.getenv("RECEIPT_MAX_ITEMS", 5000))
+ITEMS_LOAD_MAX_ROWS = int(os.getenv("ITEMS_LOAD_MAX_ROWS", 50_000))
+
+# Наибольшее количество значений в одном фильтре __in; для SQLite
+# дополнительно ограничивается количеством параметров запроса.
+DB_IN_CHUNK_SIZE = int(os.getenv("DB_IN_CHUNK_SIZE", 5000))
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Формат журнала: json (одна строка JSON на запись) или text.
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+
+# Доля выводимых информационных сообщений api (предупреждения
+# и ошибки выводятся всегда), например 0.1 - каждое десятое.
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "formatters": {
+        "json": {
+            "()": "cash_machine.log.JSONFormatter",
+        },
+        "text": {
+            "format": "%(asctime)s %(levelname)s %(name)s %(message)s",
+        },
+    },
+    "filters": {
+        "sampling": {
+            "()": "cash_machine.log.SamplingFilter",
+            "rates": {
+                "api": LOG_SAMPLE_RATE,
+                "receipts": LOG_SAMPLE_RATE,
+            },
+        },
+    },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
+            "formatter": LOG_FORMAT,
+        },
+        "queue": {
+            "()": "cash_machine.log.QueueListenerHandler",
+            "handlers": ["cfg://handlers.console"],
+            "filters": ["sampling"],
         },
     },
     "loggers": {
         "django": {
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": True,
         },
-        "api": {  # Замените 'your_app_name' на имя вашего приложения
-            "handlers": ["console"],
+        "api": {
+            "handlers": ["queue"],
             "level": "DEBUG",
             "propagate": True,
         },
+        "receipts": {
+            "handlers": ["queue"],
+            "level": "INFO",
+            "propagate": True,
+        },
     },
 }
 
@@ -3,12 +3,23 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
-from api.views import CashMachineView, QRCodeFileView
+from api.views import (
+    CashMachineView,
+    HealthzView,
+    MetricsView,
+    QRCodeFileView,
+    ReadyzView,
+    ReceiptTokenView,
+)
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", include("api.urls")),
     path("cash_machine", CashMachineView.as_view(), name="cash_machine"),
+    path("healthz", HealthzView.as_view(), name="healthz"),
+    path("readyz", ReadyzView.as_view(), name="readyz"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
+    path("r/<str:token>", ReceiptTokenView.as_view(), name="receipt_token"),
     path(
         "media/<str:file_name>/",
         QRCodeFileView.as_view(),
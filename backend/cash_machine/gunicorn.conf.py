@@ -0,0 +1,42 @@
+"""
+Настройки gunicorn.
+
+При GUNICORN_PRELOAD=True приложение и тяжёлые зависимости генерации
+чеков загружаются один раз в мастер-процессе, а воркеры получают их
+уже импортированными после fork.
+
+Воркеры gthread обрабатывают запросы в GUNICORN_THREADS потоках.
+Запрос, ждущий PDF в полосе рендеринга (api.renderers.lane_executor),
+занимает только свой поток, поэтому большой чек не задерживает
+обычные чеки того же воркера: они рендерятся в общем пуле. С sync
+воркером процесс обслуживает один запрос, и полосы не изолируют
+обычные чеки от больших (замер: python -m benchmarks.bench_gunicorn).
+"""
+
+import os
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.getenv("GUNICORN_WORKERS", 2))
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+
+
+def when_ready(server):
+    """
+    Предзагружает тяжёлые зависимости в мастер-процессе.
+    """
+    if server.cfg.preload_app:
+        from api import lazy
+
+        lazy.preload()
+        server.log.info("Тяжёлые зависимости предзагружены в мастере.")
+
+
+def post_worker_init(worker):
+    """
+    Прогревает шаблоны и рендерер в каждом воркере до приёма запросов.
+    """
+    from api import warmup
+
+    worker.log.info("Прогрев воркера: %s", warmup.warm_up())
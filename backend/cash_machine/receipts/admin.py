@@ -1,6 +1,157 @@
-from django.contrib import admin
+import csv
+import json
+from decimal import Decimal
 
-from .models import Item
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.functions import Round
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
+
+from .models import CatalogState, Item
+from .search import filter_items
+
+
+def estimate_count(model) -> int:
+    """
+    Возвращает приблизительное количество строк в таблице модели.
+
+    На PostgreSQL используется статистика планировщика (pg_class),
+    на SQLite - максимальный rowid, который берётся из индекса
+    первичного ключа без обхода таблицы.
+
+    Args:
+        model: Класс модели.
+
+    Returns:
+        int: Оценка количества строк или None, если оценки нет.
+    """
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [table],
+            )
+        elif connection.vendor == "sqlite":
+            cursor.execute(
+                f"SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}"
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def estimate_query_count(queryset) -> int:
+    """
+    Возвращает оценку планировщика для количества строк запроса.
+
+    Оценка берётся из EXPLAIN (FORMAT JSON) на PostgreSQL, запрос
+    при этом не выполняется.
+
+    Args:
+        queryset (QuerySet): Отфильтрованная выборка.
+
+    Returns:
+        int: Оценка количества строк или None, если оценки нет.
+    """
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор, не выполняющий полный COUNT(*) по большой таблице.
+
+    Для списка без фильтров используется оценка количества строк,
+    если она превышает max_exact_count. Отфильтрованные строки
+    подсчитываются точно до max_exact_count, поэтому время подсчёта
+    не растёт вместе с каталогом; если строк больше, используется
+    оценка планировщика (PostgreSQL), а без неё количество
+    ограничивается max_exact_count. Вид подсчёта показывается
+    в списке (см. count_label): "≈N" для оценки и "N+"
+    для ограниченного подсчёта.
+
+    Attributes:
+        max_exact_count (int): Максимальное точно подсчитываемое
+        количество строк.
+        count_kind (str): EXACT, ESTIMATED или TRUNCATED.
+    """
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    TRUNCATED = "truncated"
+
+    max_exact_count = 10000
+    count_kind = EXACT
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_count(queryset.model)
+            if estimate is not None and estimate > self.max_exact_count:
+                self.count_kind = self.ESTIMATED
+                return estimate
+        count = queryset[: self.max_exact_count + 1].count()
+        if count <= self.max_exact_count:
+            return count
+        estimate = estimate_query_count(queryset)
+        if estimate is not None and estimate > self.max_exact_count:
+            self.count_kind = self.ESTIMATED
+            return estimate
+        self.count_kind = self.TRUNCATED
+        return self.max_exact_count
+
+    @property
+    def count_label(self) -> str:
+        """
+        Возвращает количество строк для показа в списке.
+        """
+        count = self.count
+        if self.count_kind == self.ESTIMATED:
+            return f"≈{count}"
+        if self.count_kind == self.TRUNCATED:
+            return f"{count}+"
+        return str(count)
+
+
+class PriceActionForm(ActionForm):
+    """
+    Форма действий над товарами с полем для изменения цены в процентах.
+    """
+
+    percent = forms.DecimalField(
+        label="Изменение цены, %",
+        required=False,
+        min_value=Decimal("-99"),
+        max_value=Decimal("1000"),
+        decimal_places=2,
+    )
+
+
+class Echo:
+    """
+    Буфер для csv.writer, возвращающий записанную строку.
+    """
+
+    def write(self, value):
+        return value
 
 
 @admin.register(Item)
@@ -8,9 +159,89 @@ class ItemAdmin(admin.ModelAdmin):
     """
     Класс настройки административного интерфейса для модели Item.
 
+    Рассчитан на каталоги из сотен тысяч товаров: полный подсчёт
+    строк не выполняется, поиск идёт по полнотекстовому индексу,
+    сортировка доступна только по первичному ключу, а массовые
+    действия выполняются одним запросом UPDATE или потоковой выгрузкой.
+
     Attributes:
         list_display (tuple): Список полей модели,
         отображаемых в списке объектов в административном интерфейсе.
+        search_fields (tuple): Поля, по которым выполняется поиск.
+        sortable_by (tuple): Поля, по которым разрешена сортировка.
+        paginator (Paginator): Пагинатор с оценкой количества строк.
+        action_form (ActionForm): Форма с параметрами массовых действий.
     """
 
     list_display = ("id", "title", "price")
+    search_fields = ("title",)
+    search_help_text = "Поиск по словам или их началу в названии товара."
+    ordering = ("id",)
+    sortable_by = ("id",)
+    list_per_page = 100
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    action_form = PriceActionForm
+    actions = ("change_price", "export_csv")
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Выполняет поиск товаров по полнотекстовому индексу.
+
+        Returns:
+            tuple: Отфильтрованный queryset и признак возможных дублей.
+        """
+        return filter_items(queryset, search_term), False
+
+    @admin.action(description="Изменить цену на указанный процент")
+    def change_price(self, request, queryset):
+        """
+        Изменяет цены выбранных товаров одним запросом UPDATE.
+
+        Цена округляется до копеек, товарам присваивается
+        новая версия каталога.
+        """
+        field = PriceActionForm.base_fields["percent"]
+        try:
+            percent = field.clean(request.POST.get("percent"))
+        except ValidationError:
+            percent = None
+        if percent is None:
+            self.message_user(
+                request,
+                "Укажите изменение цены в процентах от -99 до 1000.",
+                messages.ERROR,
+            )
+            return None
+
+        factor = (100 + percent) / 100
+        with transaction.atomic():
+            updated = queryset.order_by().update(
+                price=Round(F("price") * factor, 2),
+                version=CatalogState.next_version(),
+            )
+        self.message_user(request, f"Цены изменены у {updated} товаров.")
+        return None
+
+    @admin.action(description="Выгрузить в CSV")
+    def export_csv(self, request, queryset):
+        """
+        Выгружает выбранные товары в CSV потоком, без загрузки
+        всего списка в память.
+
+        Returns:
+            StreamingHttpResponse: Файл items.csv.
+        """
+        writer = csv.writer(Echo())
+        rows = queryset.order_by("id").values_list("id", "title", "price")
+
+        def iter_rows():
+            yield writer.writerow(["id", "title", "price"])
+            for row in rows.iterator(chunk_size=2000):
+                yield writer.writerow(row)
+
+        response = StreamingHttpResponse(
+            iter_rows(), content_type="text/csv; charset=utf-8"
+        )
+        response["Content-Disposition"] = 'attachment; filename="items.csv"'
+        return response
@@ -13,3 +13,9 @@ class ReceiptsConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "receipts"
+
+    def ready(self):
+        """
+        Подключает обработчики сигналов приложения.
+        """
+        from . import signals  # noqa: F401
@@ -0,0 +1,266 @@
+"""
+Генерация синтетических данных для нагрузочных замеров.
+
+Каталог товаров, корзины и чеки создаются пачками через bulk_create,
+а файлы чеков записываются в текущее хранилище чеков. Размеры корзин
+выбираются из логнормального распределения: большинство покупок
+содержит несколько товаров, но встречаются и корзины на десятки
+позиций. Генерация воспроизводима при одинаковом seed.
+"""
+
+import datetime
+import math
+import random
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import CatalogState, Item, Receipt, Sale
+from .sales import rebuild_rollups
+from .storage import save_receipt
+
+NOUNS = (
+    "Молоко",
+    "Хлеб",
+    "Сыр",
+    "Макароны",
+    "Огурцы",
+    "Кофе",
+    "Чай",
+    "Яблоки",
+    "Гречка",
+    "Шоколад",
+    "Сок",
+    "Йогурт",
+    "Печенье",
+    "Масло",
+    "Рис",
+    "Колбаса",
+)
+KINDS = (
+    "отборный",
+    "фермерский",
+    "домашний",
+    "классический",
+    "цельнозерновой",
+    "органический",
+    "премиум",
+    "детский",
+)
+
+SALE_COLUMNS = (
+    "receipt_id",
+    "item_id",
+    "title",
+    "price",
+    "quantity",
+    "total",
+    "created_at",
+)
+
+# Типичный чек A7 из wkhtmltopdf занимает около 15-20 КиБ.
+RECEIPT_SIZE = 18 * 1024
+
+
+def cart_size(rng: random.Random, mean: float = 6, limit: int = 100) -> int:
+    """
+    Возвращает размер корзины из логнормального распределения.
+
+    Args:
+        rng (Random): Генератор случайных чисел.
+        mean (float): Средний размер корзины.
+        limit (int): Максимальный размер корзины.
+
+    Returns:
+        int: Количество товаров в корзине (от 1 до limit).
+    """
+    sigma = 0.8
+    mu = math.log(mean) - sigma**2 / 2
+    return max(1, min(limit, round(rng.lognormvariate(mu, sigma))))
+
+
+def item_price(rng: random.Random) -> Decimal:
+    """
+    Возвращает цену товара: медиана около 120, редкие дорогие товары.
+    """
+    price = rng.lognormvariate(math.log(120), 0.9)
+    return Decimal(f"{min(price, 99_999):.2f}")
+
+
+def receipt_pdf(name: str, size: int = RECEIPT_SIZE) -> bytes:
+    """
+    Возвращает содержимое файла-заглушки чека заданного размера.
+    """
+    header = f"%PDF-1.4\n% {name}\n".encode()
+    return header + b"0" * max(0, size - len(header) - 6) + b"\n%%EOF"
+
+
+def adapt_decimal(value: Decimal):
+    return connection.ops.adapt_decimalfield_value(value, 12, 2)
+
+
+def insert_rows(model, columns, rows):
+    """
+    Вставляет строки одним executemany, минуя создание объектов модели.
+
+    Для десятков тысяч строк это в несколько раз быстрее bulk_create,
+    который подготавливает значение каждого поля через ORM.
+    """
+    quote = connection.ops.quote_name
+    sql = (
+        f"INSERT INTO {quote(model._meta.db_table)} "
+        f"({', '.join(quote(column) for column in columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def generate_items(
+    count: int, seed: int = 0, batch_size: int = 10_000
+) -> range:
+    """
+    Добавляет в каталог count товаров.
+
+    Все товары получают одну новую версию каталога, идентификаторы
+    продолжают уже существующие.
+
+    Args:
+        count (int): Количество товаров.
+        seed (int): Начальное значение генератора случайных чисел.
+        batch_size (int): Размер пачки bulk_create.
+
+    Returns:
+        range: Идентификаторы созданных товаров.
+    """
+    rng = random.Random(seed)
+    with transaction.atomic():
+        version = CatalogState.next_version()
+        first_id = (Item.objects.aggregate(Max("id"))["id__max"] or 0) + 1
+        for start in range(first_id, first_id + count, batch_size):
+            stop = min(start + batch_size, first_id + count)
+            Item.objects.bulk_create(
+                Item(
+                    id=item_id,
+                    title=(
+                        f"{rng.choice(NOUNS)} {rng.choice(KINDS)} "
+                        f"№{item_id}"
+                    ),
+                    price=item_price(rng),
+                    version=version,
+                )
+                for item_id in range(start, stop)
+            )
+    return range(first_id, first_id + count)
+
+
+def random_cart(
+    rng: random.Random, item_ids, mean: float = 6, limit: int = 100
+) -> list:
+    """
+    Возвращает корзину: список различных идентификаторов товаров.
+    """
+    size = min(cart_size(rng, mean, limit), len(item_ids))
+    return rng.sample(item_ids, size)
+
+
+def generate_receipts(
+    count: int,
+    days: int = 30,
+    seed: int = 0,
+    cart_mean: float = 6,
+    files: bool = True,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Создаёт чеки с продажами за последние days дней.
+
+    Время чеков распределено равномерно, имена файлов формируются
+    так же, как при пробитии чека. Продажи записываются пачками,
+    после чего сводки продаж пересчитываются за весь период.
+
+    Args:
+        count (int): Количество чеков.
+        days (int): Период, за который распределяются чеки.
+        seed (int): Начальное значение генератора случайных чисел.
+        cart_mean (float): Средний размер корзины.
+        files (bool): Записывать файлы чеков в хранилище.
+        batch_size (int): Количество чеков в пачке.
+
+    Returns:
+        int: Количество созданных продаж.
+    """
+    rng = random.Random(seed)
+    ops = connection.ops
+    prices = dict(Item.objects.values_list("id", "price"))
+    titles = dict(Item.objects.values_list("id", "title"))
+    item_ids = list(prices)
+    if not item_ids:
+        raise ValueError("Каталог пуст: сначала создайте товары.")
+
+    end = timezone.now()
+    start = end - datetime.timedelta(days=days)
+    taken = set(
+        Receipt.objects.filter(created_at__gte=start).values_list(
+            "file_name", flat=True
+        )
+    )
+    numbers = {}
+    moments = sorted(
+        start + datetime.timedelta(seconds=rng.uniform(0, days * 86400))
+        for _ in range(count)
+    )
+
+    sales_count = 0
+    for offset in range(0, count, batch_size):
+        receipts, carts = [], []
+        stop = offset + batch_size
+        for created_at in moments[offset:stop]:
+            prefix = timezone.localtime(created_at).strftime(
+                "check_%d.%m.%Y_%H_%M"
+            )
+            number = numbers.get(prefix, 0) + 1
+            while f"{prefix}_{number}.pdf" in taken:
+                number += 1
+            numbers[prefix] = number
+
+            cart = random_cart(rng, item_ids, cart_mean)
+            receipts.append(
+                Receipt(
+                    file_name=f"{prefix}_{number}.pdf",
+                    created_at=created_at,
+                    total=sum(prices[item_id] for item_id in cart),
+                    line_count=len(cart),
+                )
+            )
+            carts.append(cart)
+
+        with transaction.atomic():
+            Receipt.objects.bulk_create(receipts)
+            sales = [
+                (
+                    receipt.id,
+                    item_id,
+                    titles[item_id],
+                    adapt_decimal(prices[item_id]),
+                    1,
+                    adapt_decimal(prices[item_id]),
+                    ops.adapt_datetimefield_value(receipt.created_at),
+                )
+                for receipt, cart in zip(receipts, carts)
+                for item_id in cart
+            ]
+            insert_rows(Sale, SALE_COLUMNS, sales)
+        sales_count += len(sales)
+
+        if files:
+            for receipt in receipts:
+                save_receipt(receipt.file_name, receipt_pdf(receipt.file_name))
+
+    if count:
+        rebuild_rollups(
+            timezone.localtime(start).date(), timezone.localtime(end).date()
+        )
+    return sales_count
@@ -0,0 +1,50 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from receipts.models import PackedReceipt
+from receipts.storage import PackFileStorage
+
+
+class Command(BaseCommand):
+    """
+    Команда удаления устаревших чеков и уплотнения пакетного хранилища.
+
+    Пример запуска:
+        python manage.py compact_receipts --retention-days 1095
+    """
+
+    help = "Удаляет устаревшие чеки и уплотняет сегменты хранилища."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=None,
+            help="Удалить чеки старше указанного количества дней.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.5,
+            help="Уплотнять сегменты, где доля живых данных меньше порога.",
+        )
+
+    def handle(self, *args, **options):
+        if options["retention_days"] is not None:
+            border = timezone.now() - datetime.timedelta(
+                days=options["retention_days"]
+            )
+            deleted, _ = PackedReceipt.objects.filter(
+                created_at__lt=border
+            ).delete()
+            self.stdout.write(f"Удалено чеков: {deleted}")
+
+        result = PackFileStorage().compact(options["threshold"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Уплотнено сегментов: {result['segments']}, "
+                f"освобождено байт: {result['freed_bytes']}"
+            )
+        )
@@ -0,0 +1,91 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from receipts.fixtures import generate_items, generate_receipts
+
+
+class Command(BaseCommand):
+    """
+    Команда генерации синтетических данных для нагрузочных замеров.
+
+    Создаёт каталог товаров, чеки с корзинами реалистичного размера
+    и файлы чеков в текущем хранилище (по умолчанию MEDIA_ROOT).
+    Не предназначена для рабочей базы данных.
+
+    Пример запуска:
+        python manage.py gen_fixtures --items 1000000 --receipts 100000
+    """
+
+    help = "Генерирует товары, чеки и файлы чеков для нагрузочных замеров."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--items",
+            type=int,
+            default=10_000,
+            help="Количество товаров, добавляемых в каталог.",
+        )
+        parser.add_argument(
+            "--receipts",
+            type=int,
+            default=0,
+            help="Количество чеков с продажами.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Период (в днях до текущего момента) для времени чеков.",
+        )
+        parser.add_argument(
+            "--cart-mean",
+            type=float,
+            default=6,
+            help="Средний размер корзины.",
+        )
+        parser.add_argument(
+            "--no-files",
+            action="store_true",
+            help="Создать только записи чеков, без файлов PDF.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Начальное значение генератора случайных чисел.",
+        )
+
+    def handle(self, *args, **options):
+        if min(options["items"], options["receipts"], options["days"]) < 0:
+            raise CommandError("Количества не могут быть отрицательными.")
+        if options["days"] == 0 or options["cart_mean"] < 1:
+            raise CommandError("--days должно быть > 0, --cart-mean >= 1.")
+
+        started = time.monotonic()
+        if options["items"]:
+            ids = generate_items(options["items"], seed=options["seed"])
+            self.stdout.write(
+                f"Товаров создано: {len(ids)} "
+                f"(id {ids.start}-{ids.stop - 1}), "
+                f"{time.monotonic() - started:.1f} с"
+            )
+
+        if options["receipts"]:
+            started = time.monotonic()
+            try:
+                sales = generate_receipts(
+                    options["receipts"],
+                    days=options["days"],
+                    seed=options["seed"],
+                    cart_mean=options["cart_mean"],
+                    files=not options["no_files"],
+                )
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(
+                f"Чеков создано: {options['receipts']}, продаж: {sales}, "
+                f"{time.monotonic() - started:.1f} с"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Данные сгенерированы."))
@@ -0,0 +1,49 @@
+import datetime
+import re
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from receipts.models import Receipt
+from receipts.storage import get_receipt_storage
+
+RECEIPT_NAME = re.compile(
+    r"^check_(\d{2}\.\d{2}\.\d{4}_\d{2}_\d{2})_\d+\.pdf$"
+)
+
+
+class Command(BaseCommand):
+    """
+    Команда однократного заполнения индекса Receipt
+    по уже существующим файлам чеков.
+
+    Пример запуска:
+        python manage.py index_receipts
+    """
+
+    help = "Добавляет в индекс чеки, созданные до его появления."
+
+    def handle(self, *args, **options):
+        try:
+            names = get_receipt_storage().listdir("")[1]
+        except FileNotFoundError:
+            names = []
+
+        batch = []
+        indexed = 0
+        for name in names:
+            match = RECEIPT_NAME.match(name)
+            if match is None:
+                continue
+            created_at = timezone.make_aware(
+                datetime.datetime.strptime(match.group(1), "%d.%m.%Y_%H_%M")
+            )
+            batch.append(Receipt(file_name=name, created_at=created_at))
+            if len(batch) >= 1000:
+                Receipt.objects.bulk_create(batch, ignore_conflicts=True)
+                indexed += len(batch)
+                batch = []
+        Receipt.objects.bulk_create(batch, ignore_conflicts=True)
+        indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Обработано чеков: {indexed}"))
@@ -0,0 +1,58 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import dateparse, timezone
+
+from receipts.sales import rebuild_rollups
+
+
+class Command(BaseCommand):
+    """
+    Команда пересчёта сводок продаж из исходных продаж за период.
+
+    Используется для периодической сверки сводок и после ручных
+    изменений продаж.
+
+    Пример запуска:
+        python manage.py rebuild_sales_rollups --from 2024-01-01
+    """
+
+    help = "Пересчитывает сводки продаж за период."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--from",
+            dest="date_from",
+            help="Первый день периода (YYYY-MM-DD), по умолчанию вчера.",
+        )
+        parser.add_argument(
+            "--to",
+            dest="date_to",
+            help="Последний день периода (YYYY-MM-DD), по умолчанию сегодня.",
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        try:
+            date_from = (
+                dateparse.parse_date(options["date_from"])
+                if options["date_from"]
+                else today - datetime.timedelta(days=1)
+            )
+            date_to = (
+                dateparse.parse_date(options["date_to"])
+                if options["date_to"]
+                else today
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        if date_from is None or date_to is None:
+            raise CommandError("Даты должны быть в формате YYYY-MM-DD.")
+
+        count = rebuild_rollups(date_from, date_to)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Сводки за {date_from} - {date_to} пересчитаны, "
+                f"продаж: {count}"
+            )
+        )
@@ -0,0 +1,280 @@
+import datetime
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Prefetch
+from django.utils import dateparse, timezone
+
+from receipts.models import Receipt, Sale
+from receipts.storage import replace_receipt
+
+
+def init_worker(nice: int):
+    """
+    Подготавливает дочерний процесс пула к рендерингу.
+
+    Понижает приоритет процесса и, если пул запущен не через fork,
+    инициализирует Django.
+    """
+    import django
+    from django.apps import apps
+
+    if nice:
+        os.nice(nice)
+    if not apps.ready:
+        django.setup()
+
+
+def render_receipt(task: tuple) -> tuple:
+    """
+    Формирует PDF чека в дочернем процессе.
+
+    Args:
+        task (tuple): Имя файла, время чека и строки чека
+            (объекты с атрибутами title и price).
+
+    Returns:
+        tuple: Имя файла, новое содержимое PDF и текст ошибки.
+        Если чек сформировать не удалось, содержимое равно None:
+        ошибка одного чека не должна прерывать всю пачку.
+    """
+    from api.views import CashMachineView
+
+    file_name, current_time, lines = task
+    view = CashMachineView()
+    try:
+        rendered_html = view.generate_html_content(lines, current_time)
+        return file_name, view.render_pdf(rendered_html), None
+    except Exception as e:
+        return file_name, None, f"{type(e).__name__}: {e}"
+
+
+class Command(BaseCommand):
+    """
+    Команда повторного формирования PDF чеков после изменения шаблона.
+
+    Чеки формируются заново по сохранённым продажам (Sale) в пуле
+    процессов и атомарно заменяют старые файлы, поэтому чтение чеков
+    не прерывается. Прогресс сохраняется в файл контрольной точки
+    после каждой пачки, и прерванный запуск продолжается с --resume.
+    Чеки без сохранённых продаж пропускаются. Чеки, которые не удалось
+    сформировать или записать, выводятся с ошибкой и учитываются
+    в итоге, а контрольная точка сдвигается дальше, чтобы --resume
+    не упирался в такой чек при каждом запуске.
+
+    Пример запуска:
+        python manage.py rerender_receipts --since 2024-01-01 --resume
+    """
+
+    help = "Формирует заново PDF чеков за период по текущему шаблону."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Первый день периода (YYYY-MM-DD), по умолчанию все чеки.",
+        )
+        parser.add_argument(
+            "--until",
+            help="Последний день периода (YYYY-MM-DD) включительно.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Количество процессов, по умолчанию число CPU.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Количество чеков между контрольными точками.",
+        )
+        parser.add_argument(
+            "--max-rate",
+            type=float,
+            default=None,
+            help="Ограничение скорости записи, чеков в секунду.",
+        )
+        parser.add_argument(
+            "--nice",
+            type=int,
+            default=10,
+            help="Понижение приоритета процессов рендеринга.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=str(settings.BASE_DIR / "rerender_receipts.json"),
+            help="Файл контрольной точки.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Продолжить с сохранённой контрольной точки.",
+        )
+
+    def handle(self, *args, **options):
+        since = self.parse_day(options["since"])
+        until = self.parse_day(options["until"])
+        params = {
+            "since": options["since"],
+            "until": options["until"],
+        }
+        checkpoint = options["checkpoint"]
+        last_id = self.load_checkpoint(checkpoint, params, options["resume"])
+
+        receipts = Receipt.objects.order_by("id")
+        if since is not None:
+            receipts = receipts.filter(created_at__gte=since)
+        if until is not None:
+            receipts = receipts.filter(
+                created_at__lt=until + datetime.timedelta(days=1)
+            )
+        total = receipts.filter(id__gt=last_id).count()
+        self.stdout.write(f"Чеков к обработке: {total}")
+
+        workers = max(1, options["workers"])
+        executor = None
+        if workers > 1:
+            # Дочерние процессы не должны наследовать открытые соединения.
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                workers, initializer=init_worker, initargs=(options["nice"],)
+            )
+        render = executor.map if executor else map
+
+        started = time.monotonic()
+        rendered = skipped = failed = 0
+        try:
+            while True:
+                batch = list(
+                    receipts.filter(id__gt=last_id).prefetch_related(
+                        Prefetch("sales", queryset=Sale.objects.order_by("id"))
+                    )[: options["batch_size"]]
+                )
+                if not batch:
+                    break
+
+                tasks = []
+                for receipt in batch:
+                    task = self.make_task(receipt)
+                    if task is None:
+                        skipped += 1
+                    else:
+                        tasks.append(task)
+
+                for file_name, content, error in render(render_receipt, tasks):
+                    if content is not None:
+                        try:
+                            replace_receipt(file_name, content)
+                        except OSError as e:
+                            error = f"{type(e).__name__}: {e}"
+                    if error is not None:
+                        failed += 1
+                        self.stderr.write(
+                            self.style.ERROR(
+                                f"Не удалось сформировать чек "
+                                f"{file_name}: {error}"
+                            )
+                        )
+                        continue
+                    rendered += 1
+                    self.throttle(started, rendered, options["max_rate"])
+
+                last_id = batch[-1].id
+                self.save_checkpoint(
+                    checkpoint, {**params, "last_id": last_id}
+                )
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"Обработано: {rendered + skipped + failed}/{total}, "
+                    f"{rendered / elapsed:.1f} чеков/с"
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Сформировано чеков: {rendered}, пропущено без продаж: "
+                f"{skipped}, с ошибкой: {failed}, скорость: "
+                f"{rendered / max(elapsed, 1e-9):.1f} чеков/с"
+            )
+        )
+
+    def parse_day(self, value):
+        if not value:
+            return None
+        try:
+            day = dateparse.parse_date(value)
+        except ValueError as e:
+            raise CommandError(str(e))
+        if day is None:
+            raise CommandError("Даты должны быть в формате YYYY-MM-DD.")
+        return timezone.make_aware(
+            datetime.datetime.combine(day, datetime.time())
+        )
+
+    def make_task(self, receipt: Receipt):
+        """
+        Готовит данные чека для передачи в дочерний процесс.
+
+        Returns:
+            tuple: Задача для render_receipt или None,
+            если у чека нет сохранённых продаж.
+        """
+        sales = list(receipt.sales.all())
+        if not sales:
+            return None
+        lines = [
+            SimpleNamespace(title=sale.title, price=sale.price)
+            for sale in sales
+            for _ in range(sale.quantity)
+        ]
+        current_time = timezone.localtime(receipt.created_at).strftime(
+            "%d.%m.%Y %H:%M"
+        )
+        return receipt.file_name, current_time, lines
+
+    def throttle(self, started: float, rendered: int, max_rate):
+        """
+        Приостанавливает запись, если скорость превышает max_rate.
+        """
+        if not max_rate:
+            return
+        delay = rendered / max_rate - (time.monotonic() - started)
+        if delay > 0:
+            time.sleep(delay)
+
+    def load_checkpoint(self, path: str, params: dict, resume: bool) -> int:
+        """
+        Возвращает id последнего обработанного чека из контрольной точки.
+
+        Контрольная точка используется, только если она создана
+        запуском с тем же периодом.
+        """
+        if not resume or not os.path.exists(path):
+            return 0
+        with open(path) as file:
+            state = json.load(file)
+        if {key: state.get(key) for key in params} != params:
+            raise CommandError(
+                "Контрольная точка создана для другого периода: "
+                f"{path}. Удалите её или запустите команду без --resume."
+            )
+        self.stdout.write(f"Продолжение после чека с id {state['last_id']}")
+        return state["last_id"]
+
+    def save_checkpoint(self, path: str, state: dict):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(state, file)
+        os.replace(tmp_path, path)
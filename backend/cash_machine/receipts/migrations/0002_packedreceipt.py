@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PackedReceipt",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("segment", models.PositiveIntegerField(db_index=True)),
+                ("offset", models.BigIntegerField()),
+                ("length", models.PositiveIntegerField()),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, db_index=True),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0003_receipt"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyItemSales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("item_id", models.IntegerField()),
+                ("title", models.CharField(max_length=255)),
+                ("quantity", models.BigIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, max_digits=14),
+                ),
+                ("vat", models.DecimalField(decimal_places=2, max_digits=14)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="HourlySales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField(unique=True)),
+                ("receipts", models.PositiveIntegerField(default=0)),
+                ("quantity", models.BigIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, max_digits=14),
+                ),
+                ("vat", models.DecimalField(decimal_places=2, max_digits=14)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="Sale",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=255)),
+                (
+                    "price",
+                    models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                ("quantity", models.PositiveIntegerField(default=1)),
+                (
+                    "total",
+                    models.DecimalField(decimal_places=2, max_digits=12),
+                ),
+                ("created_at", models.DateTimeField(db_index=True)),
+                (
+                    "item",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="sales",
+                        to="receipts.item",
+                    ),
+                ),
+                (
+                    "receipt",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sales",
+                        to="receipts.receipt",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="dailyitemsales",
+            constraint=models.UniqueConstraint(
+                fields=("day", "item_id"), name="unique_daily_item_sales"
+            ),
+        ),
+    ]
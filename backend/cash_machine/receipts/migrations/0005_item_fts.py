@@ -0,0 +1,50 @@
+from django.db import migrations
+
+NORMALIZED = "replace(replace({}.title, 'ё', 'е'), 'Ё', 'Е')"
+
+CREATE_SQL = [
+    "CREATE VIRTUAL TABLE receipts_item_fts USING fts5("
+    "title, content='', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "INSERT INTO receipts_item_fts(rowid, title) "
+    f"SELECT id, {NORMALIZED.format('receipts_item')} FROM receipts_item",
+    "CREATE TRIGGER receipts_item_fts_insert AFTER INSERT ON receipts_item "
+    "BEGIN INSERT INTO receipts_item_fts(rowid, title) "
+    f"VALUES (new.id, {NORMALIZED.format('new')}); END",
+    "CREATE TRIGGER receipts_item_fts_delete AFTER DELETE ON receipts_item "
+    "BEGIN INSERT INTO receipts_item_fts(receipts_item_fts, rowid, title) "
+    f"VALUES ('delete', old.id, {NORMALIZED.format('old')}); END",
+    "CREATE TRIGGER receipts_item_fts_update "
+    "AFTER UPDATE OF title ON receipts_item "
+    "BEGIN INSERT INTO receipts_item_fts(receipts_item_fts, rowid, title) "
+    f"VALUES ('delete', old.id, {NORMALIZED.format('old')}); "
+    "INSERT INTO receipts_item_fts(rowid, title) "
+    f"VALUES (new.id, {NORMALIZED.format('new')}); END",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS receipts_item_fts_update",
+    "DROP TRIGGER IF EXISTS receipts_item_fts_delete",
+    "DROP TRIGGER IF EXISTS receipts_item_fts_insert",
+    "DROP TABLE IF EXISTS receipts_item_fts",
+]
+
+
+def run_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0004_sales_rollups"),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sqlite(CREATE_SQL), run_sqlite(DROP_SQL)),
+    ]
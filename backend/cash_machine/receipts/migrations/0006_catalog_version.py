@@ -0,0 +1,64 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:19
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+# SQLite пересоздаёт таблицу товаров при добавлении поля,
+# поэтому триггеры полнотекстового индекса создаются заново.
+item_fts = import_module("receipts.migrations.0005_item_fts")
+TRIGGERS_SQL = [sql for sql in item_fts.CREATE_SQL if "TRIGGER" in sql]
+DROP_TRIGGERS_SQL = [sql for sql in item_fts.DROP_SQL if "TRIGGER" in sql]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0005_item_fts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="DeletedItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("item_id", models.IntegerField()),
+                ("version", models.BigIntegerField(db_index=True)),
+            ],
+        ),
+        migrations.RunPython(
+            item_fts.run_sqlite(DROP_TRIGGERS_SQL),
+            item_fts.run_sqlite(TRIGGERS_SQL),
+        ),
+        migrations.AddField(
+            model_name="item",
+            name="version",
+            field=models.BigIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(
+            item_fts.run_sqlite(TRIGGERS_SQL),
+            item_fts.run_sqlite(DROP_TRIGGERS_SQL),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:41
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_receipt_totals(apps, schema_editor):
+    """
+    Заполняет сумму и количество строк чеков по записанным продажам.
+    """
+    Receipt = apps.get_model("receipts", "Receipt")
+    Sale = apps.get_model("receipts", "Sale")
+    sales = Sale.objects.filter(receipt=OuterRef("pk")).values("receipt")
+    Receipt.objects.update(
+        total=Coalesce(
+            Subquery(sales.annotate(value=Sum("total")).values("value")),
+            0,
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+        line_count=Coalesce(
+            Subquery(sales.annotate(value=Count("id")).values("value")), 0
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0006_catalog_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="receipt",
+            name="line_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="receipt",
+            name="total",
+            field=models.DecimalField(
+                decimal_places=2, default=0, max_digits=14
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="receipt",
+            index=models.Index(
+                fields=["-created_at", "-id", "total"],
+                name="receipt_created_id_total",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sale",
+            index=models.Index(
+                fields=["item", "-created_at", "-receipt"],
+                name="sale_item_created_receipt",
+            ),
+        ),
+        migrations.RunPython(fill_receipt_totals, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,41 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+class CatalogState(models.Model):
+    """
+    Модель состояния каталога товаров (единственная запись).
+
+    Attributes:
+        version (BigIntegerField):
+            Версия каталога, увеличивается при каждом изменении товаров.
+    """
+
+    version = models.BigIntegerField(default=0)
+
+    @classmethod
+    def current_version(cls) -> int:
+        """
+        Возвращает текущую версию каталога.
+        """
+        return (
+            cls.objects.filter(pk=1).values_list("version", flat=True).first()
+            or 0
+        )
+
+    @classmethod
+    def next_version(cls) -> int:
+        """
+        Увеличивает версию каталога и возвращает новое значение.
+
+        Должна вызываться в транзакции, изменяющей товары: запись
+        блокируется до её завершения, поэтому версии не повторяются.
+        """
+        with transaction.atomic():
+            if not cls.objects.filter(pk=1).update(version=F("version") + 1):
+                cls.objects.create(pk=1, version=1)
+            return cls.current_version()
 
 
 class Item(models.Model):
@@ -12,11 +49,27 @@ class Item(models.Model):
             Поле для хранения названия товара.
         price (DecimalField):
             Поле для хранения цены товара с фиксацией десятичной части.
+        version (BigIntegerField):
+            Версия каталога, в которой товар был изменён последний раз.
     """
 
     id = models.AutoField(primary_key=True)
     title = models.CharField(max_length=255)
     price = models.DecimalField(max_digits=10, decimal_places=2)
+    version = models.BigIntegerField(default=0, db_index=True)
+
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет товар, присваивая ему новую версию каталога.
+
+        Массовые операции (bulk_create, update) должны сами
+        получать версию через CatalogState.next_version().
+        """
+        with transaction.atomic():
+            self.version = CatalogState.next_version()
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+            super().save(*args, **kwargs)
 
     def __str__(self):
         """
@@ -27,3 +80,211 @@ class Item(models.Model):
             используется название товара.
         """
         return self.title
+
+
+class PackedReceipt(models.Model):
+    """
+    Модель индекса чеков, хранящихся в сегментах пакетного хранилища.
+
+    Attributes:
+        name (CharField):
+            Имя файла чека, например check_01.01.2024_12_00_1.pdf.
+        segment (PositiveIntegerField):
+            Номер файла-сегмента, в который дописан чек.
+        offset (BigIntegerField):
+            Смещение начала чека внутри сегмента в байтах.
+        length (PositiveIntegerField):
+            Длина чека в байтах.
+        created_at (DateTimeField):
+            Время записи чека в хранилище.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    segment = models.PositiveIntegerField(db_index=True)
+    offset = models.BigIntegerField()
+    length = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        """
+        Возвращает строковое представление записи индекса.
+
+        Returns:
+            str: Имя файла чека.
+        """
+        return self.name
+
+
+class Receipt(models.Model):
+    """
+    Модель индекса созданных чеков.
+
+    Позволяет выбирать чеки по времени создания, сумме и товару
+    без сканирования хранилища и разбора имён файлов.
+
+    Attributes:
+        file_name (CharField):
+            Имя файла чека (ключ в хранилище),
+            например check_01.01.2024_12_00_1.pdf.
+        created_at (DateTimeField):
+            Время создания чека.
+        total (DecimalField):
+            Итоговая сумма чека.
+        line_count (PositiveIntegerField):
+            Количество строк (товаров) в чеке.
+    """
+
+    file_name = models.CharField(max_length=255, unique=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    line_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Постраничный поиск по периоду: порядок (created_at, id)
+            # совпадает с ключом страницы, сумма проверяется по индексу.
+            models.Index(
+                fields=["-created_at", "-id", "total"],
+                name="receipt_created_id_total",
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Возвращает строковое представление чека.
+
+        Returns:
+            str: Имя файла чека.
+        """
+        return self.file_name
+
+
+class Sale(models.Model):
+    """
+    Модель продажи товара (строки чека), записываемой при создании чека.
+
+    Attributes:
+        receipt (ForeignKey):
+            Чек, в который входит продажа.
+        item (ForeignKey):
+            Проданный товар. Продажа сохраняет его идентификатор
+            и после удаления товара.
+        title (CharField):
+            Название товара на момент продажи.
+        price (DecimalField):
+            Цена за единицу на момент продажи.
+        quantity (PositiveIntegerField):
+            Количество единиц товара.
+        total (DecimalField):
+            Общая стоимость строки чека.
+        created_at (DateTimeField):
+            Время продажи.
+    """
+
+    receipt = models.ForeignKey(
+        Receipt, on_delete=models.CASCADE, related_name="sales"
+    )
+    item = models.ForeignKey(
+        Item,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="sales",
+    )
+    title = models.CharField(max_length=255)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    quantity = models.PositiveIntegerField(default=1)
+    total = models.DecimalField(max_digits=12, decimal_places=2)
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        indexes = [
+            # Поиск чеков с товаром за период в порядке времени продажи.
+            models.Index(
+                fields=["item", "-created_at", "-receipt"],
+                name="sale_item_created_receipt",
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Возвращает строковое представление продажи.
+
+        Returns:
+            str: Название товара и количество.
+        """
+        return f"{self.title} x {self.quantity}"
+
+
+class DailyItemSales(models.Model):
+    """
+    Модель накопительной сводки продаж товара за день.
+
+    Обновляется инкрементально в той же транзакции, что и продажи.
+
+    Attributes:
+        day (DateField):
+            День продаж (по местному времени).
+        item_id (IntegerField):
+            Идентификатор товара.
+        title (CharField):
+            Название товара на момент последней продажи.
+        quantity (BigIntegerField):
+            Количество проданных единиц.
+        revenue (DecimalField):
+            Выручка.
+        vat (DecimalField):
+            Сумма НДС.
+    """
+
+    day = models.DateField()
+    item_id = models.IntegerField()
+    title = models.CharField(max_length=255)
+    quantity = models.BigIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2)
+    vat = models.DecimalField(max_digits=14, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "item_id"], name="unique_daily_item_sales"
+            )
+        ]
+
+
+class HourlySales(models.Model):
+    """
+    Модель накопительной сводки всех продаж за час.
+
+    Attributes:
+        hour (DateTimeField):
+            Начало часа.
+        receipts (PositiveIntegerField):
+            Количество чеков.
+        quantity (BigIntegerField):
+            Количество проданных единиц.
+        revenue (DecimalField):
+            Выручка.
+        vat (DecimalField):
+            Сумма НДС.
+    """
+
+    hour = models.DateTimeField(unique=True)
+    receipts = models.PositiveIntegerField(default=0)
+    quantity = models.BigIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2)
+    vat = models.DecimalField(max_digits=14, decimal_places=2)
+
+
+class DeletedItem(models.Model):
+    """
+    Модель записи об удалении товара для синхронизации каталога.
+
+    Attributes:
+        item_id (IntegerField):
+            Идентификатор удалённого товара.
+        version (BigIntegerField):
+            Версия каталога, в которой товар был удалён.
+    """
+
+    item_id = models.IntegerField()
+    version = models.BigIntegerField(db_index=True)
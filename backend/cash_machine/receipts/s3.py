@@ -0,0 +1,309 @@
+"""
+Хранилище чеков в S3-совместимом объектном хранилище (AWS S3, MinIO).
+
+Требует пакет boto3 (extra "s3"), который импортируется при первом
+обращении к клиенту. Клиент создаётся один раз на процесс и хранит
+пул соединений размером RECEIPT_S3_MAX_POOL_CONNECTIONS. Файлы больше
+RECEIPT_S3_MULTIPART_THRESHOLD загружаются по частям, а чтение
+через браузер выполняется по подписанным ссылкам (presigned URL),
+поэтому реплики сервиса не нуждаются в общей файловой системе.
+"""
+
+import functools
+import mimetypes
+from importlib import import_module
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.utils.deconstruct import deconstructible
+
+# Минимальный размер части multipart-загрузки в S3 (кроме последней).
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+@functools.cache
+def get_client(
+    endpoint_url, region_name, access_key, secret_key, max_pool_connections
+):
+    """
+    Возвращает клиент S3 с пулом соединений.
+
+    Клиенты boto3 потокобезопасны, поэтому один клиент
+    используется всеми потоками процесса.
+    """
+    boto3 = import_module("boto3")
+    config = import_module("botocore.config").Config(
+        max_pool_connections=max_pool_connections,
+        retries={"max_attempts": 3, "mode": "standard"},
+        signature_version="s3v4",
+        s3={"addressing_style": "path"},
+    )
+    return boto3.session.Session().client(
+        "s3",
+        endpoint_url=endpoint_url or None,
+        region_name=region_name or None,
+        aws_access_key_id=access_key or None,
+        aws_secret_access_key=secret_key or None,
+        config=config,
+    )
+
+
+def is_not_found(error) -> bool:
+    """
+    Проверяет, что ошибка клиента означает отсутствие объекта.
+    """
+    code = error.response.get("Error", {}).get("Code")
+    return code in ("404", "NoSuchKey", "NotFound")
+
+
+@deconstructible
+class S3ReceiptStorage(Storage):
+    """
+    Хранилище чеков в бакете S3-совместимого хранилища.
+
+    Attributes:
+        bucket (str): Имя бакета.
+        prefix (str): Префикс ключей чеков в бакете.
+        presign_expires (int): Время жизни подписанной ссылки, секунды.
+        redirect_reads (bool): Отдавать чеки перенаправлением
+            на подписанную ссылку вместо проксирования через сервис.
+    """
+
+    def __init__(self, bucket=None, prefix=None, **options):
+        self.bucket = bucket or settings.RECEIPT_S3_BUCKET
+        self.prefix = (
+            prefix if prefix is not None else settings.RECEIPT_S3_PREFIX
+        )
+        self.endpoint_url = options.get(
+            "endpoint_url", settings.RECEIPT_S3_ENDPOINT_URL
+        )
+        self.region_name = options.get(
+            "region_name", settings.RECEIPT_S3_REGION
+        )
+        self.access_key = options.get(
+            "access_key", settings.RECEIPT_S3_ACCESS_KEY
+        )
+        self.secret_key = options.get(
+            "secret_key", settings.RECEIPT_S3_SECRET_KEY
+        )
+        self.max_pool_connections = options.get(
+            "max_pool_connections", settings.RECEIPT_S3_MAX_POOL_CONNECTIONS
+        )
+        self.multipart_threshold = options.get(
+            "multipart_threshold", settings.RECEIPT_S3_MULTIPART_THRESHOLD
+        )
+        self.presign_expires = options.get(
+            "presign_expires", settings.RECEIPT_S3_PRESIGN_EXPIRES
+        )
+        self.redirect_reads = options.get(
+            "redirect_reads", settings.RECEIPT_S3_REDIRECT
+        )
+
+    @property
+    def client(self):
+        return get_client(
+            self.endpoint_url,
+            self.region_name,
+            self.access_key,
+            self.secret_key,
+            self.max_pool_connections,
+        )
+
+    def key(self, name: str) -> str:
+        """
+        Возвращает ключ объекта в бакете по имени файла чека.
+        """
+        return f"{self.prefix}{name}"
+
+    def _client_error(self):
+        return import_module("botocore.exceptions").ClientError
+
+    def _save(self, name, content):
+        transfer = import_module("boto3.s3.transfer")
+        content_type = mimetypes.guess_type(name)[0]
+        content.seek(0)
+        self.client.upload_fileobj(
+            content,
+            self.bucket,
+            self.key(name),
+            ExtraArgs={"ContentType": content_type or "application/pdf"},
+            Config=transfer.TransferConfig(
+                multipart_threshold=self.multipart_threshold,
+                multipart_chunksize=max(
+                    self.multipart_threshold, MIN_PART_SIZE
+                ),
+            ),
+        )
+        return name
+
+    def save_stream(self, name: str, chunks, content_type=None) -> str:
+        """
+        Загружает объект из итератора частей без буферизации целиком.
+
+        Данные накапливаются до размера части и отправляются
+        multipart-загрузкой, при ошибке загрузка отменяется.
+        Объекты меньше одной части загружаются одним запросом.
+
+        Args:
+            name (str): Имя файла.
+            chunks: Итератор частей содержимого (bytes).
+            content_type (str): MIME-тип объекта.
+
+        Returns:
+            str: Имя сохранённого файла.
+        """
+        key = self.key(name)
+        content_type = content_type or mimetypes.guess_type(name)[0]
+        extra = {"ContentType": content_type or "application/octet-stream"}
+        part_size = max(self.multipart_threshold, MIN_PART_SIZE)
+
+        buffer = bytearray()
+        upload_id = None
+        parts = []
+        try:
+            for chunk in chunks:
+                buffer += chunk
+                if len(buffer) < part_size:
+                    continue
+                if upload_id is None:
+                    upload_id = self.client.create_multipart_upload(
+                        Bucket=self.bucket, Key=key, **extra
+                    )["UploadId"]
+                parts.append(self._upload_part(key, upload_id, parts, buffer))
+                buffer = bytearray()
+
+            if upload_id is None:
+                self.client.put_object(
+                    Bucket=self.bucket, Key=key, Body=bytes(buffer), **extra
+                )
+                return name
+
+            if buffer:
+                parts.append(self._upload_part(key, upload_id, parts, buffer))
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            if upload_id is not None:
+                self.client.abort_multipart_upload(
+                    Bucket=self.bucket, Key=key, UploadId=upload_id
+                )
+            raise
+        return name
+
+    def _upload_part(self, key, upload_id, parts, data) -> dict:
+        number = len(parts) + 1
+        result = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=number,
+            Body=bytes(data),
+        )
+        return {"ETag": result["ETag"], "PartNumber": number}
+
+    def _get(self, name: str):
+        try:
+            return self.client.get_object(
+                Bucket=self.bucket, Key=self.key(name)
+            )
+        except self._client_error() as e:
+            if is_not_found(e):
+                return None
+            raise
+
+    def _open(self, name, mode="rb"):
+        result = self._get(name)
+        if result is None:
+            raise FileNotFoundError(name)
+        body = result["Body"]
+        try:
+            return ContentFile(body.read(), name=name)
+        finally:
+            body.close()
+
+    def open_chunks(self, name: str, chunk_size: int = 64 * 1024):
+        """
+        Открывает объект для потокового чтения.
+
+        Returns:
+            Iterator[bytes]: Части содержимого или None,
+            если объект не найден.
+        """
+        result = self._get(name)
+        if result is None:
+            return None
+
+        def iter_body():
+            body = result["Body"]
+            try:
+                yield from body.iter_chunks(chunk_size)
+            finally:
+                body.close()
+
+        return iter_body()
+
+    def replace(self, name: str, content: bytes):
+        """
+        Заменяет объект целиком: запись объекта в S3 атомарна.
+        """
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self.key(name),
+            Body=content,
+            ContentType=mimetypes.guess_type(name)[0] or "application/pdf",
+        )
+
+    def exists(self, name):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.key(name))
+        except self._client_error() as e:
+            if is_not_found(e):
+                return False
+            raise
+        return True
+
+    def delete(self, name):
+        self.client.delete_object(Bucket=self.bucket, Key=self.key(name))
+
+    def size(self, name):
+        return self.client.head_object(Bucket=self.bucket, Key=self.key(name))[
+            "ContentLength"
+        ]
+
+    def _iter_pages(self, prefix: str, **kwargs):
+        paginator = self.client.get_paginator("list_objects_v2")
+        return paginator.paginate(
+            Bucket=self.bucket, Prefix=self.key(prefix), **kwargs
+        )
+
+    def listdir(self, path):
+        path = f"{path.rstrip('/')}/" if path else ""
+        start = len(self.key(path))
+        directories, files = [], []
+        for page in self._iter_pages(path, Delimiter="/"):
+            directories += [
+                entry["Prefix"][start:].rstrip("/")
+                for entry in page.get("CommonPrefixes", [])
+            ]
+            files += [
+                entry["Key"][start:] for entry in page.get("Contents", [])
+            ]
+        return directories, files
+
+    def url(self, name):
+        """
+        Возвращает подписанную ссылку на объект.
+        """
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self.key(name)},
+            ExpiresIn=self.presign_expires,
+        )
+
+    def get_available_name(self, name, max_length=None):
+        return name
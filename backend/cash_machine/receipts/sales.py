@@ -0,0 +1,229 @@
+"""
+Запись продаж и поддержка накопительных сводок.
+
+Продажи записываются при создании чека, а сводки по дням и товарам
+(DailyItemSales) и по часам (HourlySales) обновляются инкрементально
+в той же транзакции одним запросом INSERT ... ON CONFLICT DO UPDATE
+на таблицу. Функция rebuild_rollups пересчитывает сводки за период
+из исходных продаж и используется командой rebuild_sales_rollups.
+"""
+
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from .models import DailyItemSales, HourlySales, Sale
+
+# Ставка НДС, с которой считается сумма НДС в чеке (итог / 5).
+VAT_DIVISOR = 5
+
+
+def calculate_vat(amount: Decimal) -> Decimal:
+    """
+    Возвращает сумму НДС так же, как она печатается в чеке.
+    """
+    return amount / VAT_DIVISOR
+
+
+def _upsert(model, key_fields, fields, rows, title_field=None):
+    """
+    Добавляет значения к строкам сводки или создаёт их.
+
+    Args:
+        model: Модель сводки.
+        key_fields (list): Поля уникального ключа.
+        fields (list): Накапливаемые числовые поля.
+        rows (list): Кортежи значений полей (ключ, затем накапливаемые
+            поля, затем title_field, если он задан).
+        title_field (str): Поле, которое перезаписывается значением
+            из последней продажи.
+    """
+    if not rows:
+        return
+
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    columns = key_fields + fields + ([title_field] if title_field else [])
+    updates = [
+        f"{quote(f)} = {table}.{quote(f)} + excluded.{quote(f)}"
+        for f in fields
+    ]
+    if title_field:
+        updates.append(f"{quote(title_field)} = excluded.{quote(title_field)}")
+
+    sql = (
+        f"INSERT INTO {table} ({', '.join(quote(c) for c in columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))}) "
+        f"ON CONFLICT ({', '.join(quote(f) for f in key_fields)}) "
+        f"DO UPDATE SET {', '.join(updates)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def _adapt_decimal(value: Decimal):
+    return connection.ops.adapt_decimalfield_value(value, 14, 2)
+
+
+def record_sale(receipt, lines):
+    """
+    Записывает продажи чека и обновляет сводки.
+
+    Должна вызываться внутри транзакции вместе с созданием чека,
+    чтобы сводки никогда не расходились с продажами.
+
+    Args:
+        receipt (Receipt): Созданный чек.
+        lines (list): Пары (товар, количество).
+
+    Returns:
+        list: Созданные объекты Sale.
+    """
+    created_at = receipt.created_at
+    local_time = timezone.localtime(created_at)
+    day = local_time.date()
+    hour = local_time.replace(minute=0, second=0, microsecond=0)
+
+    sales = [
+        Sale(
+            receipt=receipt,
+            item=item,
+            title=item.title,
+            price=item.price,
+            quantity=quantity,
+            total=item.price * quantity,
+            created_at=created_at,
+        )
+        for item, quantity in lines
+    ]
+
+    with transaction.atomic():
+        Sale.objects.bulk_create(sales)
+
+        daily = defaultdict(lambda: [0, Decimal(0), ""])
+        for sale in sales:
+            row = daily[sale.item_id]
+            row[0] += sale.quantity
+            row[1] += sale.total
+            row[2] = sale.title
+
+        ops = connection.ops
+        _upsert(
+            DailyItemSales,
+            ["day", "item_id"],
+            ["quantity", "revenue", "vat"],
+            [
+                (
+                    ops.adapt_datefield_value(day),
+                    item_id,
+                    quantity,
+                    _adapt_decimal(revenue),
+                    _adapt_decimal(calculate_vat(revenue)),
+                    title,
+                )
+                for item_id, (quantity, revenue, title) in daily.items()
+            ],
+            title_field="title",
+        )
+
+        quantity = sum(sale.quantity for sale in sales)
+        revenue = sum((sale.total for sale in sales), Decimal(0))
+        _upsert(
+            HourlySales,
+            ["hour"],
+            ["receipts", "quantity", "revenue", "vat"],
+            [
+                (
+                    ops.adapt_datetimefield_value(hour),
+                    1,
+                    quantity,
+                    _adapt_decimal(revenue),
+                    _adapt_decimal(calculate_vat(revenue)),
+                )
+            ],
+        )
+
+    return sales
+
+
+def rebuild_rollups(date_from: datetime.date, date_to: datetime.date):
+    """
+    Пересчитывает сводки за период из исходных продаж.
+
+    Args:
+        date_from (date): Первый день периода.
+        date_to (date): Последний день периода (включительно).
+
+    Returns:
+        int: Количество пересчитанных продаж.
+    """
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(
+        datetime.datetime.combine(date_from, datetime.time())
+    )
+    end = timezone.make_aware(
+        datetime.datetime.combine(
+            date_to + datetime.timedelta(days=1), datetime.time()
+        )
+    )
+    sales = Sale.objects.filter(created_at__gte=start, created_at__lt=end)
+
+    with transaction.atomic():
+        DailyItemSales.objects.filter(
+            day__gte=date_from, day__lte=date_to
+        ).delete()
+        HourlySales.objects.filter(hour__gte=start, hour__lt=end).delete()
+
+        daily = (
+            sales.annotate(day=TruncDate("created_at", tzinfo=tz))
+            .values("day", "item_id")
+            .annotate(
+                quantity_sum=Sum("quantity"),
+                revenue_sum=Sum("total"),
+                title_value=Max("title"),
+            )
+        )
+        DailyItemSales.objects.bulk_create(
+            (
+                DailyItemSales(
+                    day=row["day"],
+                    item_id=row["item_id"],
+                    title=row["title_value"],
+                    quantity=row["quantity_sum"],
+                    revenue=row["revenue_sum"],
+                    vat=calculate_vat(row["revenue_sum"]),
+                )
+                for row in daily.iterator()
+            ),
+            batch_size=1000,
+        )
+
+        hourly = (
+            sales.annotate(hour=TruncHour("created_at", tzinfo=tz))
+            .values("hour")
+            .annotate(
+                receipts_count=Count("receipt", distinct=True),
+                quantity_sum=Sum("quantity"),
+                revenue_sum=Sum("total"),
+            )
+        )
+        HourlySales.objects.bulk_create(
+            (
+                HourlySales(
+                    hour=row["hour"],
+                    receipts=row["receipts_count"],
+                    quantity=row["quantity_sum"],
+                    revenue=row["revenue_sum"],
+                    vat=calculate_vat(row["revenue_sum"]),
+                )
+                for row in hourly.iterator()
+            ),
+            batch_size=1000,
+        )
+
+    return sales.count()
@@ -0,0 +1,124 @@
+"""
+Полнотекстовый поиск товаров по названию.
+
+На SQLite используется индекс FTS5 receipts_item_fts, который
+заполняется триггерами на таблице товаров (включая массовые
+вставки через bulk_create) и хранит только токены без копии
+названий. Перед индексацией и поиском буква «ё» заменяется на «е»,
+регистр кириллицы и латиницы учитывается токенизатором unicode61.
+На других СУБД выполняется поиск по началу названия.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from .models import Item
+
+FTS_TABLE = "receipts_item_fts"
+
+TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Сколько первых совпадений ранжируется по релевантности. Короткий
+# префикс может совпасть с большой частью каталога, а подсчёт bm25
+# для всех совпадений сделал бы время ответа пропорциональным их числу.
+MAX_CANDIDATES = 1000
+
+
+def normalize(text: str) -> str:
+    """
+    Приводит текст к виду, в котором он хранится в индексе.
+    """
+    return text.replace("ё", "е").replace("Ё", "Е")
+
+
+def build_match_query(query: str) -> str:
+    """
+    Преобразует пользовательский запрос в выражение FTS5 MATCH.
+
+    Каждое слово запроса ищется как префикс, все слова обязательны.
+
+    Args:
+        query (str): Строка, введённая кассиром.
+
+    Returns:
+        str: Выражение MATCH или пустая строка, если слов нет.
+    """
+    tokens = TOKEN.findall(normalize(query))
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def fts_available() -> bool:
+    """
+    Возвращает True, если для текущей СУБД доступен индекс FTS5.
+    """
+    return connection.vendor == "sqlite"
+
+
+def search_items(query: str, limit: int = 20) -> list:
+    """
+    Ищет товары по словам или их началу.
+
+    По релевантности сортируются первые MAX_CANDIDATES совпадений,
+    поэтому для очень частых префиксов порядок приблизительный.
+
+    Args:
+        query (str): Поисковый запрос.
+        limit (int): Максимальное количество результатов.
+
+    Returns:
+        list: Объекты Item, отсортированные по релевантности.
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+
+    if not fts_available():
+        return list(
+            Item.objects.filter(title__istartswith=query.strip()).order_by(
+                "title"
+            )[:limit]
+        )
+
+    item_table = connection.ops.quote_name(Item._meta.db_table)
+    return list(
+        Item.objects.raw(
+            f"SELECT item.id, item.title, item.price "
+            f"FROM (SELECT rowid, rank FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s LIMIT %s) AS fts "
+            f"JOIN {item_table} AS item ON item.id = fts.rowid "
+            f"ORDER BY fts.rank, item.id LIMIT %s",
+            [match, MAX_CANDIDATES, limit],
+        )
+    )
+
+
+def filter_items(queryset, query: str):
+    """
+    Отбирает из queryset товары, подходящие под запрос, без ранжирования.
+
+    Используется там, где нужны все совпадения в порядке queryset
+    (например, в административном интерфейсе): отбор выполняется
+    по индексу подзапросом, без подсчёта релевантности.
+
+    Args:
+        queryset (QuerySet): Исходный набор товаров.
+        query (str): Поисковый запрос.
+
+    Returns:
+        QuerySet: Отфильтрованный набор товаров.
+    """
+    match = build_match_query(query)
+    if not match:
+        return queryset
+
+    if not fts_available():
+        return queryset.filter(title__istartswith=query.strip())
+
+    return queryset.filter(
+        id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            [match],
+        )
+    )
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import CatalogState, DeletedItem, Item
+
+
+@receiver(post_delete, sender=Item)
+def record_item_deletion(sender, instance, **kwargs):
+    """
+    Сохраняет запись об удалении товара с новой версией каталога.
+    """
+    DeletedItem.objects.create(
+        item_id=instance.id, version=CatalogState.next_version()
+    )
@@ -0,0 +1,623 @@
+import fcntl
+import functools
+import logging
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, Storage
+from django.core.signals import setting_changed
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.dispatch import receiver
+from django.utils.deconstruct import deconstructible
+
+from .models import PackedReceipt, Receipt
+
+logger = logging.getLogger(__name__)
+
+
+@deconstructible
+class PackFileStorage(Storage):
+    """
+    Пакетное хранилище чеков в формате append-only.
+
+    Чеки дописываются в конец файлов-сегментов segment_<n>.pack,
+    а их расположение (сегмент, смещение, длина) сохраняется
+    в модели PackedReceipt. Когда текущий сегмент превышает
+    максимальный размер, создаётся следующий. Чтение выполняется
+    срезами отображённых в память (mmap) сегментов без копирования
+    всего файла. Место, освобождённое удалёнными чеками,
+    возвращается командой compact_receipts.
+
+    Attributes:
+        location (Path): Каталог с файлами-сегментами.
+        segment_size (int): Максимальный размер сегмента в байтах.
+    """
+
+    def __init__(self, location=None, segment_size=None):
+        self.location = Path(location or settings.RECEIPT_PACK_ROOT)
+        self.segment_size = segment_size or settings.RECEIPT_PACK_SEGMENT_SIZE
+        self._maps = {}
+        self._maps_lock = threading.Lock()
+        self._location_version = None
+
+    def segment_path(self, segment: int) -> Path:
+        """
+        Возвращает путь к файлу сегмента по его номеру.
+        """
+        return self.location / f"segment_{segment:06d}.pack"
+
+    def segments(self) -> list:
+        """
+        Возвращает отсортированный список номеров сегментов на диске.
+        """
+        if not self.location.exists():
+            return []
+        return sorted(
+            int(path.stem.split("_")[1])
+            for path in self.location.glob("segment_*.pack")
+        )
+
+    def _lock(self):
+        """
+        Возвращает открытый файл межпроцессной блокировки записи.
+        """
+        self.location.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.location / ".lock", "w")
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    def _append(self, data: bytes, segment: int = None) -> tuple:
+        """
+        Дописывает данные в сегмент и возвращает их расположение.
+
+        Должен вызываться под блокировкой записи.
+
+        Args:
+            data (bytes): Содержимое чека.
+            segment (int): Номер сегмента. По умолчанию используется
+                последний сегмент или создаётся новый, если он заполнен.
+
+        Returns:
+            tuple: Номер сегмента и смещение записанных данных.
+        """
+        if segment is None:
+            segments = self.segments()
+            segment = segments[-1] if segments else 1
+            path = self.segment_path(segment)
+            if path.exists() and path.stat().st_size >= self.segment_size:
+                segment += 1
+
+        with open(self.segment_path(segment), "ab") as file:
+            offset = file.tell()
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        return segment, offset
+
+    def _save(self, name, content):
+        data = content.read()
+        lock_file = self._lock()
+        try:
+            segment, offset = self._append(data)
+            PackedReceipt.objects.create(
+                name=name, segment=segment, offset=offset, length=len(data)
+            )
+        finally:
+            lock_file.close()
+        return name
+
+    def replace(self, name: str, content: bytes):
+        """
+        Атомарно заменяет содержимое существующего чека.
+
+        Новое содержимое дописывается в конец текущего сегмента,
+        после чего запись индекса переключается одним UPDATE.
+        Читатели видят либо старую, либо новую версию целиком,
+        а место старой версии возвращается командой compact_receipts.
+
+        Args:
+            name (str): Имя файла чека.
+            content (bytes): Новое содержимое.
+        """
+        lock_file = self._lock()
+        try:
+            segment, offset = self._append(content)
+            updated = PackedReceipt.objects.filter(name=name).update(
+                segment=segment, offset=offset, length=len(content)
+            )
+            if not updated:
+                PackedReceipt.objects.create(
+                    name=name,
+                    segment=segment,
+                    offset=offset,
+                    length=len(content),
+                )
+        finally:
+            lock_file.close()
+
+    def _drop_removed_maps(self):
+        """
+        Забывает отображения сегментов, удалённых уплотнением.
+
+        Уплотнение может выполняться в другом процессе (воркере или
+        команде compact_receipts), поэтому удаление сегмента
+        обнаруживается по изменению каталога: удаление файла меняет
+        время изменения каталога. Пока удалённый сегмент отображён
+        в память, место на диске не освобождается. Должен вызываться
+        под _maps_lock.
+        """
+        try:
+            version = os.stat(self.location).st_mtime_ns
+        except FileNotFoundError:
+            version = None
+        if version == self._location_version:
+            return
+        self._location_version = version
+        for segment in list(self._maps):
+            if not self.segment_path(segment).exists():
+                del self._maps[segment]
+
+    def _map(self, segment: int, end: int) -> mmap.mmap:
+        """
+        Возвращает mmap сегмента, покрывающий данные до смещения end.
+
+        Сегмент растёт при записи, поэтому отображение
+        пересоздаётся, если оно короче запрошенного диапазона.
+        Прежнее отображение не закрывается явно: из него ещё могут
+        читать memoryview, выданные open_view. Оно закрывается
+        сборщиком мусора, когда освобождается последний срез.
+
+        Raises:
+            FileNotFoundError: Если сегмент удалён уплотнением.
+        """
+        with self._maps_lock:
+            self._drop_removed_maps()
+            mapped = self._maps.get(segment)
+            if mapped is None or len(mapped) < end:
+                with open(self.segment_path(segment), "rb") as file:
+                    mapped = mmap.mmap(
+                        file.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+                self._maps[segment] = mapped
+            return mapped
+
+    def open_view(self, name: str):
+        """
+        Возвращает содержимое чека в виде memoryview среза mmap.
+
+        Args:
+            name (str): Имя файла чека.
+
+        Returns:
+            memoryview: Срез сегмента без копирования данных
+            или None, если чек не найден.
+        """
+        for attempt in range(2):
+            entry = (
+                PackedReceipt.objects.filter(name=name)
+                .values_list("segment", "offset", "length")
+                .first()
+            )
+            if entry is None:
+                return None
+            segment, start, length = entry
+            end = start + length
+            try:
+                mapped = self._map(segment, end)
+            except FileNotFoundError:
+                # Сегмент удалён уплотнением после чтения записи
+                # индекса: чек перенесён, запись читается заново.
+                if attempt:
+                    raise
+                continue
+            return memoryview(mapped)[start:end]
+
+    def open_chunks(self, name: str):
+        """
+        Открывает чек для потокового чтения.
+
+        Returns:
+            Iterator[memoryview]: Части содержимого без копирования
+            или None, если чек не найден.
+        """
+        view = self.open_view(name)
+        return iter_chunks(view) if view is not None else None
+
+    def _open(self, name, mode="rb"):
+        view = self.open_view(name)
+        if view is None:
+            raise FileNotFoundError(name)
+        return ContentFile(bytes(view), name=name)
+
+    def exists(self, name):
+        return PackedReceipt.objects.filter(name=name).exists()
+
+    def delete(self, name):
+        PackedReceipt.objects.filter(name=name).delete()
+
+    def size(self, name):
+        return PackedReceipt.objects.get(name=name).length
+
+    def listdir(self, path):
+        return [], list(PackedReceipt.objects.values_list("name", flat=True))
+
+    def url(self, name):
+        return f"{settings.MEDIA_URL}{name}"
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def compact(self, threshold: float = 0.5) -> dict:
+        """
+        Переписывает сегменты с большой долей удалённых данных.
+
+        Живые чеки из сегментов, где их доля меньше порога,
+        дописываются в новый сегмент, индекс обновляется
+        в транзакции, после чего старые файлы удаляются.
+        Последний (текущий) сегмент не уплотняется.
+
+        Args:
+            threshold (float): Минимальная доля живых данных,
+                при которой сегмент остаётся без изменений.
+
+        Returns:
+            dict: Количество уплотнённых сегментов и освобождённых байт.
+        """
+        result = {"segments": 0, "freed_bytes": 0}
+        lock_file = self._lock()
+        try:
+            segments = self.segments()
+            live = dict(
+                PackedReceipt.objects.values("segment")
+                .annotate(total=Sum("length"))
+                .values_list("segment", "total")
+            )
+            candidates = [
+                segment
+                for segment in segments[:-1]
+                if live.get(segment, 0)
+                < threshold * self.segment_path(segment).stat().st_size
+            ]
+            if not candidates:
+                return result
+
+            target = segments[-1] + 1
+            for segment in candidates:
+                path = self.segment_path(segment)
+                size = path.stat().st_size
+                entries = list(
+                    PackedReceipt.objects.filter(segment=segment).order_by(
+                        "offset"
+                    )
+                )
+                if entries:
+                    mapped = self._map(segment, size)
+                    with open(self.segment_path(target), "ab") as file:
+                        for entry in entries:
+                            start, end = (
+                                entry.offset,
+                                entry.offset + entry.length,
+                            )
+                            entry.segment, entry.offset = target, file.tell()
+                            file.write(mapped[start:end])
+                        file.flush()
+                        os.fsync(file.fileno())
+                    with transaction.atomic():
+                        PackedReceipt.objects.bulk_update(
+                            entries, ["segment", "offset"], batch_size=500
+                        )
+                with self._maps_lock:
+                    # Как и в _map, отображение закрывается сборщиком
+                    # мусора после освобождения выданных срезов.
+                    self._maps.pop(segment, None)
+                path.unlink()
+                result["segments"] += 1
+                result["freed_bytes"] += size - live.get(segment, 0)
+        finally:
+            lock_file.close()
+
+        logger.info(
+            "Уплотнено сегментов: %s, освобождено байт: %s",
+            result["segments"],
+            result["freed_bytes"],
+        )
+        return result
+
+
+def iter_chunks(view: memoryview, chunk_size: int = 64 * 1024):
+    """
+    Разбивает memoryview на части без копирования данных.
+    """
+    for start in range(0, len(view), chunk_size):
+        end = min(start + chunk_size, len(view))
+        yield view[start:end]
+
+
+def iter_file_chunks(file, chunk_size: int = 64 * 1024):
+    """
+    Читает открытый файл частями и закрывает его по окончании.
+    """
+    with file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+def open_receipt_chunks(name: str):
+    """
+    Открывает чек для потокового чтения из текущего хранилища.
+
+    Args:
+        name (str): Имя файла чека.
+
+    Returns:
+        Iterator[bytes]: Итератор частей содержимого чека
+        или None, если чек не найден.
+    """
+    return get_receipt_storage().open_chunks(name)
+
+
+@deconstructible
+class ReceiptFileStorage(FileSystemStorage):
+    """
+    Хранилище чеков в виде отдельных PDF-файлов в MEDIA_ROOT.
+
+    Дополняет FileSystemStorage методами, общими для всех хранилищ
+    чеков: потоковым чтением и атомарной заменой файла. Как и в других
+    хранилищах чеков, имя файла - ключ: оно совпадает
+    с Receipt.file_name и не заменяется свободным именем.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        """
+        Возвращает имя без изменений.
+
+        Raises:
+            FileExistsError: Если файл с таким именем уже существует:
+                сохранение под случайным суффиксом оставило бы ссылку
+                чека на другой файл.
+        """
+        if self.exists(name):
+            raise FileExistsError(f"Файл чека {name} уже существует.")
+        return name
+
+    def open_chunks(self, name: str):
+        """
+        Открывает чек для потокового чтения.
+
+        Returns:
+            Iterator[bytes]: Части содержимого или None,
+            если файл не найден.
+        """
+        try:
+            file = open(self.path(name), "rb")
+        except FileNotFoundError:
+            return None
+        return iter_file_chunks(file)
+
+    def replace(self, name: str, content: bytes):
+        """
+        Атомарно заменяет файл чека, не прерывая текущих читателей.
+
+        Новое содержимое записывается во временный файл в том же
+        каталоге и переименовывается поверх старого.
+        """
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}.{threading.get_ident()}"
+        with open(tmp_path, "wb") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+
+
+def get_receipt_storage():
+    """
+    Возвращает хранилище чеков, выбранное в настройках.
+
+    Все хранилища реализуют Storage API Django и общие методы
+    count, open_chunks и replace, поэтому остальной код не зависит
+    от того, где лежат файлы чеков.
+
+    Хранилище создаётся один раз на процесс: PackFileStorage хранит
+    отображения сегментов (mmap), а S3ReceiptStorage - клиент
+    с пулом соединений. При изменении настроек (override_settings
+    в тестах) хранилище создаётся заново.
+
+    Returns:
+        Storage: PackFileStorage при RECEIPT_STORAGE="pack",
+        S3ReceiptStorage при RECEIPT_STORAGE="s3",
+        иначе ReceiptFileStorage с каталогом MEDIA_ROOT.
+    """
+    return _receipt_storage(settings.RECEIPT_STORAGE)
+
+
+@functools.cache
+def _receipt_storage(kind: str):
+    """
+    Создаёт хранилище чеков вида kind.
+    """
+    if kind == "pack":
+        return PackFileStorage()
+    if kind == "s3":
+        from .s3 import S3ReceiptStorage
+
+        return S3ReceiptStorage()
+    return ReceiptFileStorage()
+
+
+@receiver(setting_changed)
+def reset_receipt_storage(setting, **kwargs):
+    """
+    Сбрасывает хранилище чеков при изменении его настроек.
+    """
+    if setting.startswith("RECEIPT_") or setting == "MEDIA_ROOT":
+        _receipt_storage.cache_clear()
+
+
+def count_receipts(prefix: str) -> int:
+    """
+    Возвращает количество чеков, имя которых начинается с prefix.
+
+    Подсчёт выполняется только по индексу Receipt: запись Receipt
+    создаётся до записи файла, поэтому индекс учитывает и чеки,
+    файлы которых ещё не записаны, а хранилище (листинг S3 или
+    каталога MEDIA_ROOT) при каждой продаже не опрашивается.
+    """
+    return Receipt.objects.filter(file_name__startswith=prefix).count()
+
+
+def save_receipt(name: str, content: bytes) -> str:
+    """
+    Записывает содержимое PDF чека в хранилище одной операцией.
+
+    Args:
+        name (str): Имя файла чека.
+        content (bytes): Содержимое PDF.
+
+    Returns:
+        str: Имя сохранённого файла, всегда равное name.
+
+    Raises:
+        FileExistsError: Если файл с таким именем уже существует.
+    """
+    return get_receipt_storage().save(name, ContentFile(content))
+
+
+def fallback_name(name: str) -> str:
+    """
+    Возвращает имя HTML-версии чека: check_<...>_1.pdf -> check_<...>_1.html.
+    """
+    return f"{os.path.splitext(name)[0]}.html"
+
+
+def save_fallback(name: str, rendered_html: str):
+    """
+    Записывает HTML-версию чека, пока PDF не может быть сформирован.
+
+    Args:
+        name (str): Имя файла PDF чека.
+        rendered_html (str): HTML-код чека или документ
+            api.documents.ReceiptDocument.
+    """
+    replace_receipt(fallback_name(name), str(rendered_html).encode())
+
+
+def replace_receipt(name: str, content: bytes):
+    """
+    Атомарно заменяет файл чека, не прерывая текущих читателей.
+
+    Args:
+        name (str): Имя файла чека.
+        content (bytes): Новое содержимое PDF.
+    """
+    get_receipt_storage().replace(name, content)
+
+
+@functools.cache
+def persist_executor() -> ThreadPoolExecutor:
+    """
+    Возвращает пул из одного потока для отложенной записи чеков.
+
+    Пул создаётся при первом обращении, то есть уже в воркере
+    gunicorn, а не в мастер-процессе до fork.
+    """
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="persist")
+
+
+def _save_receipt_in_background(name: str, content: bytes):
+    try:
+        save_receipt(name, content)
+        logger.info("Файл чека %s записан в хранилище.", name)
+    except Exception:
+        logger.exception("Не удалось записать файл чека %s.", name)
+    finally:
+        connection.close()
+
+
+def persist_receipt(name: str, content: bytes):
+    """
+    Записывает PDF чека в хранилище сразу или после ответа клиенту.
+
+    При RECEIPT_PERSIST="async" запись выполняется в фоновом потоке,
+    содержимое передаётся в него без копирования.
+
+    Args:
+        name (str): Имя файла чека.
+        content (bytes): Содержимое PDF.
+
+    Returns:
+        Future: Задача фоновой записи или None при синхронной записи.
+    """
+    if settings.RECEIPT_PERSIST == "async":
+        return persist_executor().submit(
+            _save_receipt_in_background, name, content
+        )
+    save_receipt(name, content)
+    return None
+
+
+@functools.cache
+def large_persist_executor() -> ThreadPoolExecutor:
+    """
+    Возвращает пул из одного потока для отложенного рендеринга
+    больших чеков.
+
+    Большие чеки не задерживают фоновую запись обычных,
+    которые выполняются в persist_executor.
+    """
+    return ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="persist-large"
+    )
+
+
+def _render_receipt_in_background(name: str, render, args, fallback):
+    try:
+        save_receipt(name, render(*args))
+        logger.info("Файл чека %s сформирован и записан в хранилище.", name)
+    except Exception as e:
+        if fallback is None:
+            logger.exception("Не удалось сформировать файл чека %s.", name)
+            return
+        logger.warning(
+            "PDF чека %s не сформирован, сохраняется HTML-версия: %s", name, e
+        )
+        try:
+            save_fallback(name, fallback)
+        except Exception:
+            logger.exception("Не удалось записать HTML-версию чека %s.", name)
+    finally:
+        connection.close()
+
+
+def defer_receipt(
+    name: str, render, *args, fallback: str = None, large: bool = False
+):
+    """
+    Формирует и записывает PDF чека в фоновом потоке.
+
+    Используется при RECEIPT_PERSIST="async": ответ клиенту
+    отправляется, не дожидаясь ни рендеринга, ни записи файла.
+
+    Args:
+        name (str): Имя файла чека.
+        render (callable): Функция, возвращающая содержимое PDF.
+        *args: Аргументы функции render.
+        fallback (str): HTML-код чека, который записывается
+            вместо PDF, если render завершился ошибкой.
+        large (bool): Чек большой и рендерится в отдельном потоке
+            large_persist_executor.
+
+    Returns:
+        Future: Задача фонового формирования чека.
+    """
+    executor = large_persist_executor() if large else persist_executor()
+    return executor.submit(
+        _render_receipt_in_background, name, render, args, fallback
+    )
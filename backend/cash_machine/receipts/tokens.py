@@ -0,0 +1,107 @@
+"""
+Короткие подписанные токены чеков для QR-кодов.
+
+Токен содержит версию формата, идентификатор чека и усечённую
+подпись HMAC-SHA256 на SECRET_KEY, упакованные в байты
+и закодированные в base62. Любая реплика с тем же SECRET_KEY
+проверяет токен без обращения к общему состоянию, а короткая
+ссылка /r/<token> позволяет обойтись QR-кодом меньшей версии.
+"""
+
+import string
+
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+ALPHABET = string.digits + string.ascii_letters
+
+# Версия формата токена. При изменении формата или ключа подписи
+# увеличивается, а старые версии продолжают проверяться.
+VERSION = 1
+
+SIGNATURE_SIZE = 8
+
+KEY_SALT = "receipts.tokens"
+
+
+class BadToken(ValueError):
+    """
+    Исключение для повреждённого или поддельного токена.
+    """
+
+
+def b62encode(data: bytes) -> str:
+    """
+    Кодирует байты в строку base62.
+
+    Первый байт данных не должен быть нулевым,
+    иначе он потеряется при декодировании.
+    """
+    number = int.from_bytes(data, "big")
+    chars = []
+    while number:
+        number, rest = divmod(number, 62)
+        chars.append(ALPHABET[rest])
+    return "".join(reversed(chars)) or ALPHABET[0]
+
+
+def b62decode(text: str) -> bytes:
+    """
+    Декодирует строку base62 в байты.
+
+    Raises:
+        BadToken: Если строка содержит недопустимые символы.
+    """
+    number = 0
+    for char in text:
+        index = ALPHABET.find(char)
+        if index < 0:
+            raise BadToken("Недопустимый символ в токене")
+        number = number * 62 + index
+    return number.to_bytes((number.bit_length() + 7) // 8, "big")
+
+
+def _signature(version: int, payload: bytes) -> bytes:
+    return salted_hmac(
+        f"{KEY_SALT}.v{version}",
+        bytes([version]) + payload,
+        algorithm="sha256",
+    ).digest()[:SIGNATURE_SIZE]
+
+
+def make_receipt_token(receipt_id: int) -> str:
+    """
+    Создаёт подписанный токен чека.
+
+    Args:
+        receipt_id (int): Идентификатор чека (Receipt).
+
+    Returns:
+        str: Токен из 12-20 символов base62.
+    """
+    payload = receipt_id.to_bytes((receipt_id.bit_length() + 7) // 8, "big")
+    return b62encode(bytes([VERSION]) + payload + _signature(VERSION, payload))
+
+
+def read_receipt_token(token: str) -> int:
+    """
+    Проверяет подпись токена и возвращает идентификатор чека.
+
+    Args:
+        token (str): Токен из ссылки.
+
+    Returns:
+        int: Идентификатор чека.
+
+    Raises:
+        BadToken: Если токен повреждён, подделан
+            или имеет неизвестную версию.
+    """
+    data = b62decode(token)
+    if len(data) <= SIGNATURE_SIZE + 1 or data[0] != VERSION:
+        raise BadToken("Неизвестный формат токена")
+
+    payload = data[1:-SIGNATURE_SIZE]
+    signature = data[-SIGNATURE_SIZE:]
+    if not constant_time_compare(signature, _signature(data[0], payload)):
+        raise BadToken("Неверная подпись токена")
+    return int.from_bytes(payload, "big")
@@ -0,0 +1,41 @@
+from contextlib import contextmanager
+
+from django.db import connection
+
+from api.middleware import QueryCounter
+
+
+@contextmanager
+def count_queries():
+    """
+    Считает SQL-запросы, выполненные внутри блока.
+
+    Пример:
+        with count_queries() as counter:
+            record_sale(receipt, lines)
+        assert counter.count <= 4
+    """
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        yield counter
+
+
+class QueryBudgetMixin:
+    """
+    Примесь для тестов, проверяющих бюджет запросов к БД эндпоинта.
+    """
+
+    def assertQueryCount(self, response, budget):
+        """
+        Проверяет, что ответ уложился в бюджет запросов.
+
+        Количество берётся из заголовка X-DB-Query-Count,
+        который добавляет QueryCountMiddleware.
+        """
+        count = int(response["X-DB-Query-Count"])
+        self.assertLessEqual(
+            count,
+            budget,
+            f"Запросов к БД: {count}, бюджет: {budget}",
+        )
+        return count
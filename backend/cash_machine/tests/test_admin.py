@@ -0,0 +1,115 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from receipts.admin import EstimatedCountPaginator
+from receipts.models import CatalogState, Item
+
+
+class ItemAdminTest(TestCase):
+    """
+    Тесты для проверки административного интерфейса товаров.
+    """
+
+    def setUp(self):
+        """
+        Создаёт администратора и товары.
+        """
+        self.admin = User.objects.create_superuser(
+            username="admin", password="password"
+        )
+        self.client.force_login(self.admin)
+        Item.objects.bulk_create(
+            [
+                Item(title="Макароны", price=Decimal("80.00")),
+                Item(title="Огурцы", price=Decimal("60.00")),
+                Item(title="Помидоры", price=Decimal("99.99")),
+            ]
+        )
+        self.url = reverse("admin:receipts_item_changelist")
+
+    def test_changelist_search(self):
+        """
+        Проверяет поиск товаров в списке по началу слова.
+        """
+        response = self.client.get(self.url, {"q": "огу"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item.title for item in response.context["cl"].result_list],
+            ["Огурцы"],
+        )
+
+    def test_change_price(self):
+        """
+        Проверяет изменение цены на процент одним запросом
+        и обновление версии каталога.
+        """
+        version = CatalogState.current_version()
+        ids = list(Item.objects.values_list("id", flat=True))
+        response = self.client.post(
+            self.url,
+            {
+                "action": "change_price",
+                "percent": "10",
+                "_selected_action": ids[1:],
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            list(Item.objects.order_by("id").values_list("price", flat=True)),
+            [Decimal("80.00"), Decimal("66.00"), Decimal("109.99")],
+        )
+        self.assertEqual(Item.objects.filter(version__gt=version).count(), 2)
+
+    def test_export_csv(self):
+        """
+        Проверяет потоковую выгрузку выбранных товаров в CSV.
+        """
+        ids = list(Item.objects.values_list("id", flat=True))
+        response = self.client.post(
+            self.url, {"action": "export_csv", "_selected_action": ids}
+        )
+        content = b"".join(response.streaming_content).decode()
+        self.assertEqual(
+            content.splitlines(),
+            [
+                "id,title,price",
+                f"{ids[0]},Макароны,80.00",
+                f"{ids[1]},Огурцы,60.00",
+                f"{ids[2]},Помидоры,99.99",
+            ],
+        )
+
+    def test_paginator_uses_estimate(self):
+        """
+        Проверяет, что для большой таблицы без фильтров
+        используется оценка количества строк.
+        """
+        paginator = EstimatedCountPaginator(Item.objects.order_by("id"), 100)
+        paginator.max_exact_count = 1
+        self.assertEqual(paginator.count, Item.objects.latest("id").id)
+
+        filtered = Item.objects.filter(price__gt=70).order_by("id")
+        paginator = EstimatedCountPaginator(filtered, 100)
+        self.assertEqual(paginator.count, 2)
+
+    def test_paginator_truncated_count(self):
+        """
+        Проверяет, что ограниченный подсчёт отфильтрованных строк
+        показывается в списке как "N+".
+        """
+        filtered = Item.objects.filter(price__gt=50).order_by("id")
+        paginator = EstimatedCountPaginator(filtered, 100)
+        paginator.max_exact_count = 2
+        self.assertEqual(paginator.count, 2)
+        self.assertEqual(paginator.count_label, "2+")
+
+        with mock.patch.object(EstimatedCountPaginator, "max_exact_count", 2):
+            response = self.client.get(self.url, {"price__gt": "50"})
+        self.assertContains(response, "2+ ")
+
+        paginator = EstimatedCountPaginator(filtered, 100)
+        self.assertEqual(paginator.count_label, "3")
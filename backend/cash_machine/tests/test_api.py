@@ -1,13 +1,37 @@
 import datetime
+import io
 import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from unittest import mock
 
 import pdfkit
 from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.utils import timezone
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from receipts.models import Item
+from api import breaker, warmup
+from api.renderers import (
+    LARGE,
+    SMALL,
+    ORJSONRenderer,
+    QRCodePNGRenderer,
+    large_executor,
+    lane_executor,
+    pipeline_executor,
+    receipt_lane,
+)
+from api.views import CashMachineView
+from receipts.models import Item, Receipt, Sale
+from receipts.storage import persist_executor
+from receipts.tokens import make_receipt_token
 
 
 class CashMachineViewTest(APITestCase):
@@ -15,8 +39,8 @@ class CashMachineViewTest(APITestCase):
     Тесты для проверки функциональности эндпоинта "cash_machine".
 
     Класс включает в себя тест для эндпоинта "cash_machine", который проверяет
-    функциональность POST-запроса к данному эндпоинту. Предоставляет методы для
-    установки начальных данных и завершения тестового класса.
+    функциональность POST-запроса к данному эндпоинту. Файлы чеков
+    записываются во временный MEDIA_ROOT.
     """
 
     @classmethod
@@ -36,6 +60,21 @@ class CashMachineViewTest(APITestCase):
         cls.item2 = Item.objects.create(title="Item 2", price=20)
         cls.item3 = Item.objects.create(title="Item 3", price=30)
 
+    def setUp(self):
+        """
+        Подменяет MEDIA_ROOT временным каталогом: без wkhtmltopdf
+        в него записывается HTML-версия чека.
+        """
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # Фоновая запись должна завершиться до удаления каталога.
+        self.addCleanup(
+            lambda: persist_executor().submit(lambda: None).result(timeout=5)
+        )
+
     def test_cash_machine_view(self):
         """
         Тест для проверки функциональности эндпоинта "cash_machine".
@@ -52,21 +91,359 @@ class CashMachineViewTest(APITestCase):
 
         self.assertIn("image/png", response["Content-Type"])
 
-    @classmethod
-    def tearDownClass(cls):
+
+class CashMachineFormatsTest(APITestCase):
+    """
+    Тесты для проверки выбора формата ответа эндпоинта "cash_machine".
+
+    Генерация PDF подменяется, чтобы проверять только
+    согласование формата по заголовку Accept.
+    """
+
+    def setUp(self):
         """
-        Завершение тестового класса.
+        Создаёт товары и подменяет создание PDF-файла.
+        """
+        self.items = [
+            Item.objects.create(title="Item 1", price=10),
+            Item.objects.create(title="Item 2", price=25),
+        ]
+        self.data = {"items": [item.id for item in self.items]}
+        self.url = reverse("cash_machine")
+        patcher = mock.patch(
+            "api.views.CashMachineView.create_pdf_receipt",
+            return_value="media/check_01.01.2024_10_00_1.pdf",
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
-        Удаляет созданный PDF-файл после выполнения всех тестов.
+    def post(self, accept):
+        return self.client.post(
+            self.url, self.data, format="json", HTTP_ACCEPT=accept
+        )
+
+    def test_png_by_default(self):
         """
-        super().tearDownClass()
-        current_time = datetime.datetime.now()
-        current_time = current_time.strftime("%d.%m.%Y %H:%M")
-        current_time = current_time.replace(":", "_").replace(" ", "_")
+        Проверяет, что по умолчанию возвращается PNG-изображение.
+        """
+        response = self.post("*/*")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertTrue(response.content.startswith(b"\x89PNG"))
+        self.assertIn("Accept", response["Vary"])
 
-        pdf_file_path = f"media/check_{current_time}_1.pdf"
-        if os.path.exists(pdf_file_path):
-            os.remove(pdf_file_path)
+    def test_svg(self):
+        """
+        Проверяет векторный QR-код в формате SVG.
+        """
+        response = self.post("image/svg+xml")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("image/svg+xml", response["Content-Type"])
+        self.assertIn(b"<svg", response.content)
+
+    def test_json(self):
+        """
+        Проверяет данные чека в формате JSON.
+        """
+        response = self.post("application/json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        receipt = Receipt.objects.get()
+        self.assertRegex(receipt.file_name, r"^check_[\d._]+_1\.pdf$")
+        token = make_receipt_token(receipt.id)
+        self.assertEqual(
+            response.json(),
+            {
+                "id": receipt.id,
+                "file_name": receipt.file_name,
+                "token": token,
+                "url": f"http://testserver/r/{token}",
+                "total_price": "35.00",
+                "total_nds_price": "7.00",
+            },
+        )
+
+    def test_errors_are_json(self):
+        """
+        Проверяет, что ошибки возвращаются в JSON при запросе изображения.
+        """
+        self.data = {"items": [0]}
+        response = self.post("image/png")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+        response = self.post("text/csv")
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+
+class CashMachinePipelineTest(APITestCase):
+    """
+    Тесты для проверки параллельной генерации PDF и QR-кода чека.
+
+    wkhtmltopdf подменяется функцией, возвращающей PDF из памяти.
+    """
+
+    def setUp(self):
+        """
+        Создаёт товары и временный каталог для файлов чеков.
+        """
+        self.items = [
+            Item.objects.create(title="Item 1", price=10),
+            Item.objects.create(title="Item 2", price=25),
+        ]
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        breaker.reset()
+
+    def post(self, accept="image/png"):
+        return self.client.post(
+            reverse("cash_machine"),
+            {"items": [item.id for item in self.items]},
+            format="json",
+            HTTP_ACCEPT=accept,
+        )
+
+    def read(self, name):
+        with open(os.path.join(self.media_root, name), "rb") as file:
+            return file.read()
+
+    def test_pdf_and_qrcode_in_parallel(self):
+        """
+        Проверяет, что PDF формируется, пока строится QR-код,
+        и ответ отправляется после записи файла.
+        """
+        qrcode_started = threading.Event()
+        render_png = QRCodePNGRenderer.render
+
+        def render_qrcode(renderer, *args, **kwargs):
+            qrcode_started.set()
+            return render_png(renderer, *args, **kwargs)
+
+        def render_pdf(view, html):
+            # PDF дожидается начала построения QR-кода: при
+            # последовательной генерации ожидание истекло бы.
+            self.assertTrue(qrcode_started.wait(timeout=5))
+            return b"%PDF-pipeline"
+
+        with mock.patch.object(
+            QRCodePNGRenderer, "render", render_qrcode
+        ), mock.patch.object(CashMachineView, "render_pdf", render_pdf):
+            response = self.post()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertTrue(response.content.startswith(b"\x89PNG"))
+        receipt = Receipt.objects.get()
+        self.assertEqual(self.read(receipt.file_name), b"%PDF-pipeline")
+        self.assertEqual(Sale.objects.filter(receipt=receipt).count(), 2)
+
+    @override_settings(RECEIPT_PIPELINE_WORKERS=0)
+    def test_sequential(self):
+        """
+        Проверяет последовательную генерацию без пула потоков.
+        """
+        with mock.patch.object(
+            CashMachineView, "render_pdf", return_value=b"%PDF-seq"
+        ):
+            response = self.post()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.content.startswith(b"\x89PNG"))
+        receipt = Receipt.objects.get()
+        self.assertEqual(self.read(receipt.file_name), b"%PDF-seq")
+
+    def test_persist_failure_keeps_sale(self):
+        """
+        Проверяет, что при ошибке записи PDF чек и продажа
+        остаются записанными, а файл формируется по ссылке.
+        """
+        with mock.patch.object(
+            CashMachineView, "render_pdf", return_value=b"%PDF-lost"
+        ), mock.patch(
+            "api.views.persist_receipt",
+            side_effect=OSError("storage failed"),
+        ):
+            response = self.post("application/json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        receipt = Receipt.objects.get()
+        self.assertEqual(Sale.objects.filter(receipt=receipt).count(), 2)
+
+        with mock.patch.object(
+            CashMachineView, "render_pdf", return_value=b"%PDF-again"
+        ):
+            response = self.client.get(response.json()["url"])
+        self.assertEqual(response.content, b"%PDF-again")
+
+    def test_sale_failure_rolls_back_receipt(self):
+        """
+        Проверяет, что чек не остаётся без продаж и PDF
+        не формируется, если продажу записать не удалось.
+        """
+        with mock.patch(
+            "api.views.record_sale", side_effect=OSError("db failed")
+        ), mock.patch.object(CashMachineView, "render_pdf") as render_pdf:
+            response = self.post()
+
+        self.assertEqual(
+            response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+        self.assertFalse(Receipt.objects.exists())
+        render_pdf.assert_not_called()
+        self.assertEqual(os.listdir(self.media_root), [])
+
+    @override_settings(RECEIPT_PERSIST="async")
+    def test_async_responds_before_pdf(self):
+        """
+        Проверяет, что при RECEIPT_PERSIST="async" ответ отправляется
+        до рендеринга PDF, а файл записывается в фоне.
+        """
+        release = threading.Event()
+
+        def render_pdf(view, html):
+            release.wait(timeout=5)
+            return b"%PDF-async"
+
+        with mock.patch.object(CashMachineView, "render_pdf", render_pdf):
+            response = self.post("application/json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            receipt = Receipt.objects.get()
+            self.assertFalse(
+                os.path.exists(
+                    os.path.join(self.media_root, receipt.file_name)
+                )
+            )
+            release.set()
+            persist_executor().submit(lambda: None).result(timeout=5)
+
+        self.assertEqual(self.read(receipt.file_name), b"%PDF-async")
+
+    def test_reserve_next_free_name(self):
+        """
+        Проверяет, что занятое параллельным запросом имя
+        пропускается при резервировании.
+        """
+        Receipt.objects.create(file_name="check_01.01.2024_10_00_1.pdf")
+        with mock.patch("api.views.count_receipts", return_value=0):
+            receipt = CashMachineView().reserve_receipt(
+                "01.01.2024 10:00", self.items
+            )
+        self.assertEqual(receipt.file_name, "check_01.01.2024_10_00_2.pdf")
+        self.assertEqual(receipt.total, 35)
+        self.assertEqual(receipt.line_count, 2)
+
+    def test_reserve_many_conflicts(self):
+        """
+        Проверяет, что имя резервируется и после множества
+        конфликтов, а количество чеков перечитывается после конфликта.
+        """
+        for number in range(1, 6):
+            Receipt.objects.create(
+                file_name=f"check_01.01.2024_10_00_{number}.pdf"
+            )
+        with mock.patch("api.views.count_receipts", return_value=0):
+            receipt = CashMachineView().reserve_receipt(
+                "01.01.2024 10:00", self.items
+            )
+        self.assertEqual(receipt.file_name, "check_01.01.2024_10_00_6.pdf")
+
+        with mock.patch(
+            "api.views.count_receipts", side_effect=[0, 6]
+        ) as count_receipts:
+            receipt = CashMachineView().reserve_receipt(
+                "01.01.2024 10:00", self.items
+            )
+        self.assertEqual(receipt.file_name, "check_01.01.2024_10_00_7.pdf")
+        self.assertEqual(count_receipts.call_count, 2)
+
+
+@override_settings(
+    RECEIPT_PERSIST="sync",
+    RECEIPT_PIPELINE_WORKERS=1,
+    RECEIPT_LARGE_WORKERS=1,
+    RECEIPT_LARGE_LINES=50,
+    RECEIPT_LARGE_HTML_BYTES=1000,
+)
+class CashMachineLanesTest(APITestCase):
+    """
+    Тесты для проверки отдельной полосы рендеринга больших чеков.
+    """
+
+    def setUp(self):
+        """
+        Создаёт временный каталог для файлов чеков и новые пулы
+        потоков с размерами из настроек теста.
+        """
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        for executor in (pipeline_executor, large_executor):
+            executor.cache_clear()
+            self.addCleanup(executor.cache_clear)
+        breaker.reset()
+
+    def test_receipt_lane(self):
+        """
+        Проверяет оценку стоимости чека по строкам и размеру HTML.
+        """
+        self.assertEqual(receipt_lane(3, 500), SMALL)
+        self.assertEqual(receipt_lane(50, 1000), SMALL)
+        self.assertEqual(receipt_lane(51, 500), LARGE)
+        self.assertEqual(receipt_lane(3, 1001), LARGE)
+
+        self.assertIs(lane_executor(SMALL), pipeline_executor())
+        self.assertIs(lane_executor(LARGE), large_executor())
+        with override_settings(RECEIPT_LARGE_WORKERS=0):
+            self.assertIs(lane_executor(LARGE), pipeline_executor())
+
+    def test_small_receipt_not_blocked(self):
+        """
+        Проверяет, что обычный чек рендерится, пока единственный
+        поток полосы больших чеков занят.
+        """
+        large_started = threading.Event()
+        release = threading.Event()
+
+        def render_pdf(view, html):
+            if "Большой" in html:
+                large_started.set()
+                release.wait(timeout=5)
+            return html.encode()
+
+        request = mock.Mock(accepted_renderer=ORJSONRenderer())
+        with mock.patch.object(CashMachineView, "render_pdf", render_pdf):
+            thread = threading.Thread(
+                target=CashMachineView().create_pdf_receipt,
+                args=(request, "large.pdf", "<p>Большой</p>", {}),
+                kwargs={"line_count": 500},
+            )
+            thread.start()
+            self.addCleanup(thread.join, 5)
+            self.addCleanup(release.set)
+            self.assertTrue(large_started.wait(timeout=5))
+
+            started = time.monotonic()
+            CashMachineView().create_pdf_receipt(
+                request, "small.pdf", "<p>Обычный</p>", {}, line_count=3
+            )
+            self.assertLess(time.monotonic() - started, 2)
+            self.assertTrue(
+                os.path.exists(os.path.join(self.media_root, "small.pdf"))
+            )
+            self.assertFalse(
+                os.path.exists(os.path.join(self.media_root, "large.pdf"))
+            )
+            release.set()
+            thread.join(timeout=5)
+
+        self.assertTrue(
+            os.path.exists(os.path.join(self.media_root, "large.pdf"))
+        )
 
 
 class QRCodeFileViewTest(APITestCase):
@@ -164,3 +541,170 @@ class CreateItemsViewTest(APITestCase):
         created_item_ids = response_data["items"]
         expected_item_ids = [item["id"] for item in self.data]
         self.assertEqual(created_item_ids, expected_item_ids)
+
+
+class HealthViewsTest(APITestCase):
+    """
+    Тесты для проверки эндпоинтов "healthz" и "readyz".
+    """
+
+    def test_healthz_view(self):
+        """
+        Проверяет, что эндпоинт живости отвечает 200 OK.
+        """
+        response = self.client.get(reverse("healthz"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"status": "ok"})
+
+    def test_readyz_view_ready(self):
+        """
+        Проверяет, что эндпоинт готовности отвечает 200 OK,
+        когда база данных доступна, а воркер прогрет.
+        """
+        with mock.patch.dict(
+            "api.warmup._state", {"templates": True, "renderer": True}
+        ):
+            response = self.client.get(reverse("readyz"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["checks"],
+            {"templates": True, "renderer": True, "database": True},
+        )
+
+    def test_readyz_view_does_not_warm_up(self):
+        """
+        Проверяет, что эндпоинт готовности отвечает 503, пока воркер
+        не прогрет, и сам не запускает рендеринг даже при доступном
+        наборе шрифтов.
+        """
+        fontconfig = tempfile.NamedTemporaryFile(suffix=".conf")
+        self.addCleanup(fontconfig.close)
+
+        with override_settings(
+            RECEIPT_FONTCONFIG_FILE=fontconfig.name
+        ), mock.patch.dict(
+            "api.warmup._state", {"templates": True, "renderer": False}
+        ), mock.patch(
+            "api.views.CashMachineView.render_pdf", return_value=b"%PDF"
+        ) as render_pdf:
+            for _ in range(3):
+                response = self.client.get(reverse("readyz"))
+
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        self.assertFalse(response.data["checks"]["renderer"])
+        render_pdf.assert_not_called()
+
+    @override_settings(WKHTMLTOPDF_DOCKER_PATH="/nonexistent/wkhtmltopdf")
+    def test_warm_renderer_unavailable(self):
+        """
+        Проверяет, что прогрев рендерера не проходит,
+        если wkhtmltopdf недоступен.
+        """
+        self.assertFalse(warmup.warm_renderer())
+
+    @override_settings(RECEIPT_FONTCONFIG_FILE="/nonexistent/fonts.conf")
+    def test_warm_renderer_fonts_missing(self):
+        """
+        Проверяет, что прогрев рендерера не проходит без рендеринга,
+        если набор шрифтов чека не найден.
+        """
+        with mock.patch("api.views.CashMachineView.render_pdf") as render_pdf:
+            self.assertFalse(warmup.warm_renderer())
+        render_pdf.assert_not_called()
+
+    def test_warm_renderer_renders_probe(self):
+        """
+        Проверяет, что прогрев рендерера формирует пробный PDF
+        и не проходит, если wkhtmltopdf вернул не PDF.
+        """
+        with mock.patch(
+            "api.views.CashMachineView.render_pdf", return_value=b"%PDF-1.4"
+        ) as render_pdf:
+            self.assertTrue(warmup.warm_renderer())
+        render_pdf.assert_called_once_with(warmup.PROBE_HTML)
+
+        with mock.patch(
+            "api.views.CashMachineView.render_pdf", return_value=b""
+        ):
+            self.assertFalse(warmup.warm_renderer())
+
+
+class ReceiptExportViewTest(APITestCase):
+    """
+    Тесты для проверки эндпоинта "api/v1/receipts/export/".
+    """
+
+    def setUp(self):
+        """
+        Создаёт чеки во временном MEDIA_ROOT и администратора.
+        """
+        self.media_root = tempfile.mkdtemp()
+        self.admin = User.objects.create_user(
+            username="admin", password="admin", is_staff=True
+        )
+        for day, content in ((1, b"first"), (2, b"second"), (5, b"fifth")):
+            file_name = f"check_0{day}.01.2024_12_00_1.pdf"
+            with open(os.path.join(self.media_root, file_name), "wb") as f:
+                f.write(content)
+            Receipt.objects.create(
+                file_name=file_name,
+                created_at=timezone.make_aware(
+                    datetime.datetime(2024, 1, day, 12)
+                ),
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.media_root)
+
+    def test_export_receipts(self):
+        """
+        Проверяет, что администратор получает ZIP-архив
+        с чеками только за запрошенный период.
+        """
+        self.client.force_authenticate(self.admin)
+        with override_settings(MEDIA_ROOT=self.media_root):
+            response = self.client.get(
+                reverse("receipts_export"),
+                {"from": "2024-01-01", "to": "2024-01-02"},
+            )
+            content = b"".join(response.streaming_content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertEqual(
+                archive.namelist(),
+                [
+                    "check_01.01.2024_12_00_1.pdf",
+                    "check_02.01.2024_12_00_1.pdf",
+                ],
+            )
+            self.assertEqual(
+                archive.read("check_02.01.2024_12_00_1.pdf"), b"second"
+            )
+
+    def test_export_requires_admin(self):
+        """
+        Проверяет, что выгрузка недоступна без прав администратора.
+        """
+        response = self.client.get(reverse("receipts_export"))
+
+        self.assertIn(
+            response.status_code,
+            (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN),
+        )
+
+    def test_export_invalid_date(self):
+        """
+        Проверяет, что некорректная дата возвращает 400 Bad Request.
+        """
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(
+            reverse("receipts_export"), {"from": "01.01.2024"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
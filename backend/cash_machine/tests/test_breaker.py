@@ -0,0 +1,266 @@
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api import breaker
+from api.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+from api.views import CashMachineView
+from receipts.models import Item, Receipt, Sale
+from receipts.sales import record_sale
+from receipts.storage import persist_executor
+from receipts.tokens import make_receipt_token
+
+
+@override_settings(RECEIPT_BREAKER_FAILURES=2, RECEIPT_BREAKER_RESET=30)
+class CircuitBreakerTest(SimpleTestCase):
+    """
+    Тесты для проверки переходов состояний выключателя.
+    """
+
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = CircuitBreaker("test", clock=lambda: self.now)
+
+    def fail(self):
+        with self.assertRaises(OSError):
+            self.breaker.call(mock.Mock(side_effect=OSError("crash")))
+
+    def test_opens_after_consecutive_failures(self):
+        """
+        Проверяет, что выключатель размыкается только после
+        серии ошибок подряд и отклоняет вызовы без их выполнения.
+        """
+        self.fail()
+        self.assertEqual(self.breaker.call(lambda: "ok"), "ok")
+        self.fail()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.fail()
+        self.assertEqual(self.breaker.state, OPEN)
+
+        func = mock.Mock()
+        with self.assertRaises(CircuitOpen):
+            self.breaker.call(func)
+        func.assert_not_called()
+        self.assertEqual(
+            self.breaker.snapshot(),
+            {"state": OPEN, "failures": 3, "rejected": 1, "opened": 1},
+        )
+
+    def test_half_open_trial(self):
+        """
+        Проверяет, что после паузы пропускается один пробный вызов:
+        ошибка снова размыкает выключатель, успех замыкает.
+        """
+        self.fail()
+        self.fail()
+        self.now = 30
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+
+        self.now = 60
+        self.assertEqual(self.breaker.call(lambda: "ok"), "ok")
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.snapshot()["opened"], 2)
+
+
+@override_settings(
+    RECEIPT_BREAKER_FAILURES=2,
+    RECEIPT_BREAKER_RESET=30,
+    RECEIPT_PERSIST="sync",
+)
+class PDFFallbackTest(APITestCase):
+    """
+    Тесты для проверки HTML-версии чека при сбоях wkhtmltopdf.
+
+    Сбои рендерера имитируются подменой render_pdf и исполняемым
+    файлом вместо wkhtmltopdf, который зависает или падает.
+    """
+
+    def setUp(self):
+        """
+        Создаёт товары и временный каталог для файлов чеков.
+        """
+        self.items = [
+            Item.objects.create(title="Item 1", price=10),
+            Item.objects.create(title="Item 2", price=25),
+        ]
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        breaker.reset()
+        self.addCleanup(breaker.reset)
+
+    def post(self, accept="image/png"):
+        return self.client.post(
+            reverse("cash_machine"),
+            {"items": [item.id for item in self.items]},
+            format="json",
+            HTTP_ACCEPT=accept,
+        )
+
+    def path(self, name):
+        return os.path.join(self.media_root, name)
+
+    def fake_wkhtmltopdf(self, script):
+        path = self.path("wkhtmltopdf")
+        with open(path, "w") as file:
+            file.write(f"#!/bin/sh\n{script}\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        return path
+
+    def test_renderer_fault_saves_html(self):
+        """
+        Проверяет, что при ошибке рендерера чек пробивается
+        с HTML-версией, а после серии ошибок wkhtmltopdf
+        больше не запускается.
+        """
+        with mock.patch.object(
+            CashMachineView,
+            "render_pdf",
+            side_effect=OSError("wkhtmltopdf crashed"),
+        ) as render_pdf:
+            for _ in range(3):
+                response = self.post()
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertTrue(response.content.startswith(b"\x89PNG"))
+
+        self.assertEqual(render_pdf.call_count, 2)
+        self.assertEqual(breaker.pdf_breaker().state, OPEN)
+        self.assertEqual(Sale.objects.count(), 6)
+        for receipt in Receipt.objects.all():
+            name = receipt.file_name
+            self.assertFalse(os.path.exists(self.path(name)))
+            with open(self.path(name[:-4] + ".html"), encoding="utf-8") as f:
+                self.assertIn("Item 2", f.read())
+
+    def test_render_timeout(self):
+        """
+        Проверяет, что зависший wkhtmltopdf останавливается по таймауту.
+        """
+        wkhtmltopdf = self.fake_wkhtmltopdf("exec sleep 10")
+        with override_settings(
+            WKHTMLTOPDF_DOCKER_PATH=wkhtmltopdf, RECEIPT_PDF_TIMEOUT=0.2
+        ):
+            with self.assertRaises(subprocess.TimeoutExpired):
+                CashMachineView().render_pdf("<html></html>")
+
+            response = self.post("application/json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        receipt = Receipt.objects.get()
+        self.assertTrue(
+            os.path.exists(self.path(receipt.file_name[:-4] + ".html"))
+        )
+
+    def test_renderer_crash(self):
+        """
+        Проверяет, что ошибка wkhtmltopdf превращается в исключение.
+        """
+        wkhtmltopdf = self.fake_wkhtmltopdf("echo broken >&2; exit 3")
+        with override_settings(WKHTMLTOPDF_DOCKER_PATH=wkhtmltopdf):
+            with self.assertRaisesMessage(IOError, "broken"):
+                CashMachineView().render_pdf("<html></html>")
+
+    @override_settings(RECEIPT_PERSIST="async")
+    def test_async_fault_saves_html(self):
+        """
+        Проверяет, что при фоновом рендеринге ошибка PDF
+        также приводит к записи HTML-версии.
+        """
+        with mock.patch.object(
+            CashMachineView, "render_pdf", side_effect=OSError("crash")
+        ):
+            response = self.post("application/json")
+            persist_executor().submit(lambda: None).result(timeout=5)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        name = Receipt.objects.get().file_name
+        self.assertTrue(os.path.exists(self.path(name[:-4] + ".html")))
+
+    def test_token_serves_html_then_pdf(self):
+        """
+        Проверяет, что ссылка из QR-кода отдаёт HTML-версию,
+        пока выключатель разомкнут, а после восстановления
+        рендерера формирует и сохраняет PDF.
+        """
+        with mock.patch.object(
+            CashMachineView, "render_pdf", side_effect=OSError("crash")
+        ):
+            self.post("application/json")
+            response = self.post("application/json")
+        url = response.data["url"]
+        name = response.data["file_name"]
+
+        with mock.patch.object(CashMachineView, "render_pdf") as render_pdf:
+            response = self.client.get(url)
+            content = b"".join(response.streaming_content).decode()
+        render_pdf.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/html; charset=utf-8")
+        self.assertIn("Item 1", content)
+
+        breaker.reset()
+        with mock.patch.object(
+            CashMachineView, "render_pdf", return_value=b"%PDF-recovered"
+        ):
+            response = self.client.get(url)
+        self.assertEqual(response.content, b"%PDF-recovered")
+        self.assertFalse(os.path.exists(self.path(name[:-4] + ".html")))
+
+        response = self.client.get(url)
+        self.assertEqual(
+            b"".join(response.streaming_content), b"%PDF-recovered"
+        )
+
+    def test_token_without_html_version(self):
+        """
+        Проверяет, что чек без HTML-версии при недоступном
+        рендерере отдаётся в HTML, построенном по продажам.
+        """
+        receipt = Receipt.objects.create(file_name="check_1.pdf")
+        record_sale(receipt, [(self.items[0], 1)])
+        url = reverse("receipt_token", args=[make_receipt_token(receipt.id)])
+
+        with mock.patch.object(
+            CashMachineView, "render_pdf", side_effect=OSError("crash")
+        ):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/html; charset=utf-8")
+        self.assertIn("Item 1", response.content.decode())
+
+    def test_metrics(self):
+        """
+        Проверяет, что состояние выключателя отдаётся в /metrics.
+        """
+        with mock.patch.object(
+            CashMachineView, "render_pdf", side_effect=OSError("crash")
+        ):
+            for _ in range(3):
+                self.post("application/json")
+
+        content = self.client.get(reverse("metrics")).content.decode()
+        self.assertIn('cash_machine_breaker_state{breaker="pdf"} 2', content)
+        self.assertIn(
+            'cash_machine_breaker_failures_total{breaker="pdf"} 2', content
+        )
+        self.assertIn(
+            'cash_machine_breaker_rejected_total{breaker="pdf"} 1', content
+        )
+        self.assertIn(
+            'cash_machine_breaker_opened_total{breaker="pdf"} 1', content
+        )
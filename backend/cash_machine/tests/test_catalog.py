@@ -0,0 +1,88 @@
+import json
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from receipts.models import CatalogState, Item
+
+
+class ItemListViewTest(APITestCase):
+    """
+    Тесты для проверки постраничной выгрузки каталога товаров.
+    """
+
+    def setUp(self):
+        """
+        Создаёт товары через save(), чтобы им была присвоена версия.
+        """
+        self.items = [
+            Item.objects.create(title=f"Товар {i}", price="10.50")
+            for i in range(5)
+        ]
+        self.url = reverse("items_list")
+
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        body = b"".join(response.streaming_content)
+        return response, json.loads(body)
+
+    def test_keyset_pagination(self):
+        """
+        Проверяет обход каталога по страницам через ссылку next.
+        """
+        response, data = self.get(limit=2)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(data["version"], CatalogState.current_version())
+        self.assertEqual(
+            data["items"][0],
+            {"id": self.items[0].id, "title": "Товар 0", "price": "10.50"},
+        )
+
+        ids = [item["id"] for item in data["items"]]
+        while data["next"]:
+            response = self.client.get(data["next"])
+            data = json.loads(b"".join(response.streaming_content))
+            ids += [item["id"] for item in data["items"]]
+        self.assertEqual(ids, [item.id for item in self.items])
+
+    def test_not_modified(self):
+        """
+        Проверяет ответ 304 для неизменённого каталога
+        и новый ETag после изменения товара.
+        """
+        response, _ = self.get()
+        etag = response["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.items[0].price = "11.00"
+        self.items[0].save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_since_version(self):
+        """
+        Проверяет, что дельта содержит изменённые и удалённые товары.
+        """
+        since = CatalogState.current_version()
+        self.items[1].title = "Новое название"
+        self.items[1].save()
+        deleted_id = self.items[2].id
+        self.items[2].delete()
+
+        _, data = self.get(since_version=since)
+        self.assertEqual(
+            [item["title"] for item in data["items"]], ["Новое название"]
+        )
+        self.assertEqual(data["deleted"], [deleted_id])
+        self.assertGreater(data["version"], since)
+
+    def test_invalid_params(self):
+        """
+        Проверяет ответ 400 на нечисловые параметры.
+        """
+        response = self.client.get(self.url, {"after": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
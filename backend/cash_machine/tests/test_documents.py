@@ -0,0 +1,271 @@
+import os
+import re
+import shutil
+import stat
+import subprocess
+import tempfile
+import unittest
+from decimal import Decimal
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from api.documents import (
+    CHUNK_SIZE,
+    ReceiptDocument,
+    page_count,
+    paginate,
+    render_receipt_html,
+    run_streaming,
+)
+from api.views import CashMachineView
+
+
+def receipt_context(count: int, title: str = "Товар") -> dict:
+    items = [
+        {
+            "title": f"{title} {i}",
+            "price": Decimal("1.50"),
+            "quantity": 1,
+            "total_item_price": Decimal("1.50"),
+        }
+        for i in range(count)
+    ]
+    return {
+        "items": items,
+        "total_price": Decimal("1.50") * count,
+        "total_nds_price": Decimal("0.30") * count,
+        "current_time": "01.01.2024 10:00",
+        "company_name": "ООО 'ОБЛАЧКО'",
+        "payment_method": "Наличными",
+        "customer_name": "Прекрасный покупатель",
+    }
+
+
+class ReceiptDocumentTest(SimpleTestCase):
+    """
+    Тесты для проверки постраничного HTML чека.
+    """
+
+    def test_paginate(self):
+        """
+        Проверяет разбиение строк на страницы и итоги страниц.
+        """
+        pages = list(paginate(receipt_context(25)["items"], 10))
+
+        self.assertEqual([page.number for page in pages], [1, 2, 3])
+        self.assertEqual([len(page.items) for page in pages], [10, 10, 5])
+        self.assertEqual(
+            [page.subtotal for page in pages],
+            [Decimal("15.00"), Decimal("15.00"), Decimal("7.50")],
+        )
+        self.assertEqual(pages[-1].running_total, Decimal("37.50"))
+
+        pages = list(paginate([], 10))
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(pages[0].items, [])
+
+    def test_paginate_first_page(self):
+        """
+        Проверяет, что на первой странице, где выводится шапка чека,
+        помещается меньше строк, и количество страниц учитывает это.
+        """
+        items = receipt_context(25)["items"]
+        pages = list(paginate(items, 10, 4))
+
+        self.assertEqual([len(page.items) for page in pages], [4, 10, 10, 1])
+        self.assertEqual(pages[-1].running_total, Decimal("37.50"))
+        self.assertEqual(page_count(25, 10, 4), 4)
+        self.assertEqual(page_count(24, 10, 4), 3)
+        self.assertEqual(page_count(4, 10, 4), 1)
+        self.assertEqual(page_count(0, 10, 4), 1)
+        self.assertEqual(page_count(25, 10), 3)
+
+    @override_settings(RECEIPT_PAGE_LINES=10, RECEIPT_FIRST_PAGE_LINES=4)
+    def test_first_page_setting(self):
+        """
+        Проверяет, что документ по умолчанию использует размер
+        первой страницы из настроек.
+        """
+        html = render_receipt_html(receipt_context(14))
+
+        self.assertEqual(html.count('class="page"'), 2)
+        self.assertIn("Страница 2 из 2", html)
+        self.assertIn("Итого по странице: =6.00", html)
+
+    @override_settings(RECEIPT_PAGE_LINES=10, RECEIPT_FIRST_PAGE_LINES=10)
+    def test_single_page(self):
+        """
+        Проверяет, что у одностраничного чека нет номеров страниц
+        и итогов по страницам.
+        """
+        html = render_receipt_html(receipt_context(3))
+
+        self.assertEqual(html.count("<thead>"), 1)
+        self.assertEqual(html.count("<tr>"), 4)
+        self.assertNotIn("Страница", html)
+        self.assertNotIn("Итого по странице", html)
+        self.assertIn("Итог: =4.50", html)
+
+    @override_settings(RECEIPT_PAGE_LINES=10, RECEIPT_FIRST_PAGE_LINES=10)
+    def test_multiple_pages(self):
+        """
+        Проверяет повтор шапки таблицы, номера страниц
+        и итоги по страницам.
+        """
+        html = render_receipt_html(receipt_context(25))
+
+        self.assertEqual(html.count("<thead>"), 3)
+        self.assertEqual(html.count('class="page"'), 3)
+        self.assertIn("Страница 3 из 3", html)
+        self.assertEqual(html.count("Итого по странице: =15.00"), 2)
+        self.assertIn("Итого по странице: =7.50", html)
+        self.assertIn("Нарастающим итогом: =37.50", html)
+
+    def test_escaping(self):
+        """
+        Проверяет, что названия товаров экранируются и не
+        интерпретируются как шаблон.
+        """
+        html = render_receipt_html(receipt_context(1, "<b>{{ 7 * 7 }}</b>"))
+
+        self.assertIn("&lt;b&gt;{{ 7 * 7 }}&lt;/b&gt; 0", html)
+        self.assertNotIn("49", html)
+
+    def test_chunks(self):
+        """
+        Проверяет, что документ рендерится частями ограниченного
+        размера и может быть обойдён повторно.
+        """
+        document = ReceiptDocument(receipt_context(2000), per_page=10)
+
+        chunks = list(document)
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks[:-1]:
+            self.assertLess(len(chunk), CHUNK_SIZE + 1024)
+        self.assertEqual("".join(chunks), str(document))
+        self.assertEqual(str(document).count("<thead>"), 200)
+
+    @override_settings(RECEIPT_LARGE_LINES=50)
+    def test_render_html(self):
+        """
+        Проверяет, что HTML больших чеков не собирается в строку.
+        """
+        view = CashMachineView()
+        self.assertIsInstance(view.render_html(receipt_context(50)), str)
+        self.assertIsInstance(
+            view.render_html(receipt_context(51)), ReceiptDocument
+        )
+
+
+class RunStreamingTest(SimpleTestCase):
+    """
+    Тесты для проверки потоковой передачи HTML в wkhtmltopdf.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def fake_wkhtmltopdf(self, script):
+        path = os.path.join(self.directory, "wkhtmltopdf")
+        with open(path, "w") as file:
+            file.write(f"#!/bin/sh\n{script}\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        return path
+
+    def test_output(self):
+        """
+        Проверяет, что все части доходят до процесса, а stdout
+        и stderr читаются без взаимной блокировки.
+        """
+        script = self.fake_wkhtmltopdf("tee /dev/stderr")
+        chunks = ["ы" * CHUNK_SIZE] * 8
+
+        returncode, content, stderr = run_streaming([script], chunks, 10)
+
+        self.assertEqual(returncode, 0)
+        self.assertEqual(content.decode(), "".join(chunks))
+        self.assertEqual(stderr, "".join(chunks))
+
+    def test_process_exits_early(self):
+        """
+        Проверяет, что завершение процесса до конца HTML
+        возвращается кодом ошибки.
+        """
+        script = self.fake_wkhtmltopdf("echo broken >&2; exit 3")
+
+        returncode, content, stderr = run_streaming(
+            [script], ["x" * CHUNK_SIZE] * 16, 10
+        )
+
+        self.assertEqual(returncode, 3)
+        self.assertEqual(stderr.strip(), "broken")
+
+    def test_timeout(self):
+        """
+        Проверяет остановку процесса, который не читает HTML.
+        """
+        script = self.fake_wkhtmltopdf("exec sleep 10")
+
+        with self.assertRaises(subprocess.TimeoutExpired):
+            run_streaming([script], ["x" * CHUNK_SIZE] * 16, 0.2)
+
+    def test_render_pdf(self):
+        """
+        Проверяет передачу документа в wkhtmltopdf без сборки в строку.
+        """
+        document = ReceiptDocument(receipt_context(500), per_page=10)
+        script = self.fake_wkhtmltopdf("cat")
+
+        with override_settings(WKHTMLTOPDF_DOCKER_PATH=script):
+            content = CashMachineView().render_pdf(document)
+
+        self.assertEqual(content.decode(), str(document))
+
+    def test_fontconfig_file(self):
+        """
+        Проверяет, что wkhtmltopdf получает набор шрифтов чека.
+        """
+        script = self.fake_wkhtmltopdf('printf "%s" "$FONTCONFIG_FILE"')
+        fontconfig_file = os.path.join(self.directory, "fonts.conf")
+
+        with override_settings(
+            WKHTMLTOPDF_DOCKER_PATH=script,
+            RECEIPT_FONTCONFIG_FILE=fontconfig_file,
+        ):
+            content = CashMachineView().render_pdf("<html></html>")
+
+        self.assertEqual(content.decode(), fontconfig_file)
+
+
+@unittest.skipUnless(
+    shutil.which(settings.WKHTMLTOPDF_DOCKER_PATH), "wkhtmltopdf не найден"
+)
+class RenderedPagesTest(SimpleTestCase):
+    """
+    Проверяет, что страницы чека помещаются на лист PDF.
+
+    Если строки страницы не помещаются на лист A7, wkhtmltopdf
+    переносит их на лишний лист, и листов в PDF становится больше,
+    чем страниц чека. Запускается там, где есть wkhtmltopdf
+    (образ backend), со шрифтами из RECEIPT_FONTCONFIG_FILE.
+    """
+
+    def test_pages_fit(self):
+        """
+        Проверяет чеки с полностью заполненными страницами.
+        """
+        per_page = settings.RECEIPT_PAGE_LINES
+        first_page = settings.RECEIPT_FIRST_PAGE_LINES
+        for line_count in (first_page, first_page + per_page * 2):
+            with self.subTest(line_count=line_count):
+                document = ReceiptDocument(
+                    receipt_context(line_count, "Товар с длинным названием")
+                )
+                content = CashMachineView().render_pdf(document)
+
+                sheets = len(re.findall(rb"/Type\s*/Page\b", content))
+                self.assertEqual(
+                    sheets, page_count(line_count, per_page, first_page)
+                )
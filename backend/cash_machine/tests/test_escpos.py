@@ -0,0 +1,166 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api import escpos
+from api.renderers import ESCPOSRenderer
+from receipts.models import Item, Receipt
+from receipts.tokens import make_receipt_token
+
+DATA = {
+    "url": "http://testserver/r/3hK9x2LmQp7Zt4",
+    "total_price": "1035.50",
+    "total_nds_price": "207.10",
+}
+RECEIPT = {
+    "company_name": "ООО 'ОБЛАЧКО'",
+    "current_time": "01.01.2024 10:00",
+    "payment_method": "Наличными",
+    "customer_name": "Прекрасный покупатель",
+    "items": [
+        {
+            "title": "Молоко фермерское 3,2% в стеклянной бутылке 1 л",
+            "price": Decimal("120"),
+            "quantity": 1,
+            "total_item_price": Decimal("120"),
+        },
+        {
+            "title": "Хлеб",
+            "price": Decimal("45.5"),
+            "quantity": 1,
+            "total_item_price": Decimal("45.5"),
+        },
+        {
+            "title": "Кофе",
+            "price": Decimal("870"),
+            "quantity": 1,
+            "total_item_price": Decimal("870"),
+        },
+    ],
+}
+
+
+class ESCPOSTest(SimpleTestCase):
+    """
+    Тесты для проверки формирования чека в командах ESC/POS.
+    """
+
+    def text_lines(self, content: bytes) -> list:
+        return [
+            line.decode("cp866", errors="replace")
+            for line in content.split(b"\n")
+        ]
+
+    def test_render_receipt(self):
+        """
+        Проверяет команды принтера, кодировку CP866, QR-код
+        и размер чека.
+        """
+        content = escpos.render_receipt(DATA, RECEIPT)
+
+        self.assertTrue(content.startswith(escpos.INITIALIZE))
+        self.assertIn(escpos.CODE_PAGE_CP866, content)
+        self.assertTrue(content.endswith(escpos.FEED_AND_CUT))
+        self.assertIn("Кассовый чек".encode("cp866"), content)
+        self.assertIn("Хлеб".encode("cp866"), content)
+        self.assertIn(b"=45.50", content)
+        self.assertIn(b"=1035.50", content)
+        self.assertIn(b"=207.10", content)
+        self.assertIn(
+            b"\x1d(k\x25\x00\x31\x50\x30" + DATA["url"].encode(), content
+        )
+        self.assertLess(len(content), 1024)
+
+    def test_line_width(self):
+        """
+        Проверяет, что длинные названия переносятся по ширине ленты.
+        """
+        for columns in (escpos.COLUMNS_58MM, escpos.COLUMNS_80MM):
+            content = escpos.render_receipt(DATA, RECEIPT, columns)
+            lines = self.text_lines(content.split(escpos.ALIGN_LEFT)[1])
+            self.assertIn("-" * columns, lines)
+            for line in lines:
+                if "\x1b" not in line and "\x1d" not in line:
+                    self.assertLessEqual(len(line), columns)
+
+        self.assertEqual(
+            escpos.wrap("Очень-длинное-название товара", 10),
+            ["Очень-длин", "ное-назван", "ие товара"],
+        )
+
+    def test_columns_parameter(self):
+        """
+        Проверяет разбор ширины строки из типа содержимого.
+        """
+        get_columns = ESCPOSRenderer.get_columns
+        self.assertEqual(get_columns("application/vnd.escpos"), 32)
+        self.assertEqual(get_columns("application/vnd.escpos; columns=48"), 48)
+        self.assertEqual(
+            get_columns("application/vnd.escpos; columns=1000"), 64
+        )
+        self.assertEqual(
+            get_columns("application/vnd.escpos; columns=wide"), 32
+        )
+
+
+class CashMachineESCPOSTest(APITestCase):
+    """
+    Тесты для проверки печати чека эндпоинтом "cash_machine"
+    в формате ESC/POS.
+    """
+
+    def setUp(self):
+        """
+        Создаёт товары и подменяет создание PDF-файла.
+        """
+        self.items = [
+            Item.objects.create(title="Молоко", price=10),
+            Item.objects.create(title="Хлеб", price=25),
+        ]
+        patcher = mock.patch(
+            "api.views.CashMachineView.create_pdf_receipt",
+            return_value="media/check_01.01.2024_10_00_1.pdf",
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, accept):
+        return self.client.post(
+            reverse("cash_machine"),
+            {"items": [item.id for item in self.items]},
+            format="json",
+            HTTP_ACCEPT=accept,
+        )
+
+    def test_escpos(self):
+        """
+        Проверяет, что чек со строками, итогами и QR-кодом
+        возвращается в командах термопринтера.
+        """
+        response = self.post("application/vnd.escpos; columns=48")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/vnd.escpos")
+        content = response.content
+        self.assertTrue(content.startswith(escpos.INITIALIZE))
+        self.assertIn("Молоко".encode("cp866"), content)
+        self.assertIn("ООО 'ОБЛАЧКО'".encode("cp866"), content)
+        self.assertIn(b"-" * 48 + b"\n", content)
+        self.assertIn(b"=35.00", content)
+        self.assertIn(b"=7.00", content)
+        receipt = Receipt.objects.get()
+        token = make_receipt_token(receipt.id)
+        self.assertIn(f"http://testserver/r/{token}".encode(), content)
+
+    def test_errors_are_json(self):
+        """
+        Проверяет, что ошибки возвращаются в JSON.
+        """
+        Item.objects.all().delete()
+        response = self.post("application/vnd.escpos")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response["Content-Type"], "application/json")
@@ -0,0 +1,86 @@
+import os
+import random
+import re
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+
+from receipts.fixtures import cart_size
+from receipts.models import DailyItemSales, Item, Receipt, Sale
+
+RECEIPT_NAME = re.compile(r"^check_\d{2}\.\d{2}\.\d{4}_\d{2}_\d{2}_\d+\.pdf$")
+
+
+class GenFixturesTest(TestCase):
+    """
+    Тесты для проверки команды gen_fixtures.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+    def gen(self, **options):
+        with override_settings(MEDIA_ROOT=self.media_root):
+            call_command("gen_fixtures", stdout=StringIO(), **options)
+
+    def test_items_receipts_and_files(self):
+        """
+        Проверяет, что чеки согласованы с продажами и сводками,
+        а файлы чеков записаны в MEDIA_ROOT под уникальными именами.
+        """
+        Item.objects.create(title="Хлеб", price=45)
+        self.gen(items=500, receipts=200, days=1)
+
+        self.assertEqual(Item.objects.count(), 501)
+        self.assertEqual(Receipt.objects.count(), 200)
+        names = set(os.listdir(self.media_root))
+        self.assertEqual(
+            names, set(Receipt.objects.values_list("file_name", flat=True))
+        )
+        self.assertTrue(all(RECEIPT_NAME.match(name) for name in names))
+
+        for receipt in Receipt.objects.prefetch_related("sales"):
+            sales = receipt.sales.all()
+            self.assertEqual(receipt.line_count, len(sales))
+            self.assertEqual(receipt.total, sum(sale.total for sale in sales))
+        self.assertEqual(
+            Sale.objects.count(),
+            Receipt.objects.aggregate(Sum("line_count"))["line_count__sum"],
+        )
+        self.assertEqual(
+            DailyItemSales.objects.aggregate(Sum("quantity"))["quantity__sum"],
+            Sale.objects.count(),
+        )
+
+        # Повторный запуск продолжает нумерацию и идентификаторы.
+        self.gen(items=10, receipts=20, days=1, no_files=True, seed=1)
+        self.assertEqual(Item.objects.count(), 511)
+        self.assertEqual(Receipt.objects.count(), 220)
+        self.assertEqual(len(os.listdir(self.media_root)), 200)
+
+    def test_errors(self):
+        """
+        Проверяет ошибки при пустом каталоге и неверных параметрах.
+        """
+        with self.assertRaises(CommandError):
+            self.gen(items=0, receipts=10)
+        with self.assertRaises(CommandError):
+            self.gen(items=-1)
+
+    def test_cart_size_distribution(self):
+        """
+        Проверяет, что размеры корзин ограничены и в среднем близки
+        к заданному, а большинство корзин небольшие.
+        """
+        rng = random.Random(0)
+        sizes = [cart_size(rng, mean=6, limit=100) for _ in range(10_000)]
+        self.assertGreaterEqual(min(sizes), 1)
+        self.assertLessEqual(max(sizes), 100)
+        self.assertAlmostEqual(sum(sizes) / len(sizes), 6, delta=0.5)
+        self.assertGreater(sum(size <= 6 for size in sizes), len(sizes) / 2)
@@ -0,0 +1,51 @@
+import logging
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+from api import lazy
+
+
+logger = logging.getLogger(__name__)
+
+
+class TestLazyImports:
+    """
+    Класс тестов для проверки ленивой загрузки тяжёлых зависимостей.
+    """
+
+    def test_views_do_not_import_heavy_modules(self):
+        """
+        Проверяет, что импорт api.views не загружает pdfkit, qrcode и Pillow.
+        """
+        code = (
+            "import sys, django; django.setup(); import api.views; "
+            "print(','.join(m for m in ('pdfkit', 'qrcode', 'PIL.Image') "
+            "if m in sys.modules))"
+        )
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE="cash_machine.settings")
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert (
+            result.stdout.strip() == ""
+        ), f"При импорте api.views загружены модули: {result.stdout}"
+
+        logger.info("Тест ленивой загрузки зависимостей выполнен успешно.")
+
+    def test_accessors_return_modules(self):
+        """
+        Проверяет, что функции доступа возвращают нужные модули
+        и кешируют окружение Jinja2.
+        """
+        assert lazy.pdfkit().__name__ == "pdfkit"
+        assert lazy.qrcode().__name__ == "qrcode"
+        assert lazy.jinja_environment() is lazy.jinja_environment()
@@ -0,0 +1,89 @@
+import io
+import logging
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+from api.views import CreateItemsView
+
+
+logger = logging.getLogger(__name__)
+
+
+class TestORJSON:
+    """
+    Класс тестов для проверки быстрых JSON-парсера и рендерера.
+
+    Результат работы ORJSONRenderer и ORJSONParser должен совпадать
+    с результатом стандартных JSONRenderer и JSONParser из DRF.
+    """
+
+    data = {
+        "items": [
+            {"id": 1, "title": "Макароны", "price": Decimal("80.50")},
+            {"id": 2, "title": "Огурцы", "price": Decimal("60")},
+        ],
+        "created": timezone.now(),
+        "empty": None,
+    }
+
+    def test_render_matches_default_renderer(self):
+        """
+        Проверяет, что ORJSONRenderer формирует тот же JSON,
+        что и стандартный рендерер, включая цены в формате Decimal.
+        """
+        assert ORJSONRenderer().render(self.data) == JSONRenderer().render(
+            self.data
+        ), "JSON отличается от результата стандартного рендерера."
+
+        logger.info("Тест рендеринга JSON выполнен успешно.")
+
+    def test_render_with_indent_falls_back(self):
+        """
+        Проверяет, что запрос форматирования с отступами
+        обрабатывается так же, как стандартным рендерером.
+        """
+        media_type = "application/json; indent=4"
+        assert ORJSONRenderer().render(
+            self.data, media_type
+        ) == JSONRenderer().render(self.data, media_type)
+
+    def test_render_unsupported_by_orjson(self):
+        """
+        Проверяет, что ключи-числа и целые числа шире 64 бит
+        сериализуются так же, как стандартным рендерером.
+        """
+        for data in ({1: "Макароны", None: 0}, {"id": 2**64}):
+            assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_form_parsers(self):
+        """
+        Проверяет, что загрузка товаров принимает те же типы
+        содержимого, что и парсеры по умолчанию.
+        """
+        parsers = CreateItemsView.parser_classes
+        assert FormParser in parsers and MultiPartParser in parsers
+
+    def test_parse_matches_default_parser(self):
+        """
+        Проверяет, что ORJSONParser разбирает тело запроса так же,
+        как стандартный парсер.
+        """
+        body = '[{"id": 1, "title": "Макароны", "price": 80.5}]'.encode()
+        assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(
+            io.BytesIO(body)
+        ), "Результат разбора отличается от стандартного парсера."
+
+    def test_parse_rejects_invalid_json(self):
+        """
+        Проверяет, что некорректный JSON и значения NaN отклоняются.
+        """
+        for body in (b"[1, 2", b"[NaN]"):
+            with pytest.raises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
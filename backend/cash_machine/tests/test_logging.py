@@ -0,0 +1,103 @@
+import io
+import json
+import logging
+import threading
+
+from api import metrics
+from cash_machine.log import (
+    JSONFormatter,
+    QueueListenerHandler,
+    SamplingFilter,
+    dropped_records,
+)
+
+
+def make_record(name="api.views", level=logging.INFO, msg="%s", args=(1,)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+class TestLogging:
+    """
+    Тесты для проверки неблокирующего логирования.
+    """
+
+    def test_json_formatter(self):
+        """
+        Проверяет вывод записи одной строкой JSON с ленивым форматированием.
+        """
+        line = JSONFormatter().format(
+            make_record(msg="Товары созданы: %s шт.", args=(3,))
+        )
+        data = json.loads(line)
+        assert data["message"] == "Товары созданы: 3 шт."
+        assert data["level"] == "INFO"
+        assert data["logger"] == "api.views"
+        assert "\n" not in line
+
+    def test_sampling_filter(self):
+        """
+        Проверяет выборочный вывод информационных сообщений.
+        """
+        sampling = SamplingFilter(rates={"api": 0.25})
+        passed = [sampling.filter(make_record("api.views")) for _ in range(8)]
+        assert passed.count(True) == 2
+        assert sampling.filter(make_record("api.views", logging.ERROR))
+        assert all(
+            sampling.filter(make_record("django.request")) for _ in range(3)
+        )
+
+    def test_queue_handler(self):
+        """
+        Проверяет вывод через фоновый поток и отбрасывание записей
+        при переполненной очереди.
+        """
+        stream = io.StringIO()
+        console = logging.StreamHandler(stream)
+        console.setFormatter(JSONFormatter())
+        handler = QueueListenerHandler([console], queue_size=2)
+
+        handler.handle(make_record(msg="первое: %s"))
+        handler.stop()
+        assert json.loads(stream.getvalue())["message"] == "первое: 1"
+
+        for _ in range(5):
+            handler.handle(make_record())
+        assert handler.dropped == 3
+
+    def test_dropped_metrics(self):
+        """
+        Проверяет, что отброшенные записи отдаются в метриках.
+        """
+        handler = QueueListenerHandler([logging.NullHandler()], queue_size=1)
+        handler.name = "test_queue"
+        handler.stop()
+        for _ in range(4):
+            handler.handle(make_record())
+
+        assert dropped_records()["test_queue"] == 3
+        assert (
+            'cash_machine_log_dropped_total{handler="test_queue"} 3'
+            in metrics.render_prometheus()
+        )
+
+    def test_dropped_concurrent(self):
+        """
+        Проверяет, что отброшенные записи не теряются при одновременной
+        записи из нескольких потоков.
+        """
+        handler = QueueListenerHandler([logging.NullHandler()], queue_size=1)
+        handler.stop()
+        handler.enqueue(make_record())
+        record = make_record()
+
+        def enqueue():
+            for _ in range(10000):
+                handler.enqueue(record)
+
+        threads = [threading.Thread(target=enqueue) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert handler.dropped == 80000
@@ -0,0 +1,190 @@
+import datetime
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api import metrics, warmup
+from api.middleware import QueryBudgetExceeded
+from api.views import CashMachineView
+from receipts.models import Item, Receipt
+from receipts.sales import record_sale
+from receipts.tokens import make_receipt_token
+from tests.helpers import QueryBudgetMixin, count_queries
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class QueryBudgetTest(QueryBudgetMixin, APITestCase):
+    """
+    Тесты, закрепляющие количество запросов к БД для эндпоинтов.
+
+    Каждый эндпоинт с query_budget закреплён здесь. Бюджеты в тестах
+    совпадают с объявленными или строже, а строгий режим превращает
+    превышение в ошибку. Для потоковых ответов запросы, выполняемые
+    при отдаче тела, middleware не видит, поэтому они проверяются
+    через assertNumQueries с чтением всего тела внутри блока.
+    """
+
+    def setUp(self):
+        """
+        Создаёт товары, чек с продажами и его файлом во временном
+        MEDIA_ROOT и администратора.
+        """
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.items = [
+            Item.objects.create(title=f"Товар {i}", price=10 + i)
+            for i in range(5)
+        ]
+        self.receipt = Receipt.objects.create(
+            file_name="check_01.01.2024_12_00_1.pdf",
+            created_at=timezone.make_aware(datetime.datetime(2024, 1, 1, 12)),
+        )
+        record_sale(self.receipt, [(item, 1) for item in self.items])
+        path = os.path.join(self.media_root, self.receipt.file_name)
+        with open(path, "wb") as f:
+            f.write(b"%PDF")
+        self.admin = User.objects.create_user(
+            username="admin", password="admin", is_staff=True
+        )
+        metrics.reset()
+
+    def test_cash_machine(self):
+        """
+        Количество запросов не зависит от количества товаров в чеке.
+        """
+        with mock.patch.object(
+            CashMachineView,
+            "create_pdf_receipt",
+            return_value="media/check_02.01.2024_12_00_1.pdf",
+        ):
+            response = self.client.post(
+                reverse("cash_machine"),
+                {"items": [item.id for item in self.items]},
+                format="json",
+                HTTP_ACCEPT="application/json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertQueryCount(response, 12)
+
+    def test_create_items(self):
+        """
+        Загрузка товаров не выполняет запросов на каждый товар.
+        """
+        data = [
+            {"id": 1000 + i, "title": f"Новый {i}", "price": 5}
+            for i in range(50)
+        ]
+        response = self.client.post(
+            reverse("create_items"), data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertQueryCount(response, 8)
+        self.assertEqual(
+            Item.objects.filter(id__gte=1000, version__gt=0).count(), 50
+        )
+
+    def test_read_endpoints(self):
+        """
+        Закрепляет бюджеты эндпоинтов чтения.
+        """
+        self.client.force_authenticate(self.admin)
+        token = make_receipt_token(self.receipt.id)
+        cases = [
+            (reverse("items_list"), {"since_version": 0}, 3),
+            (reverse("items_search"), {"q": "тов"}, 1),
+            (
+                reverse("sales_report"),
+                {"from": "2024-01-01", "to": "2024-01-31"},
+                1,
+            ),
+            (
+                reverse("receipts_list"),
+                {"from": "2024-01-01", "item": self.items[0].id},
+                1,
+            ),
+            (reverse("receipt_token", args=[token]), {}, 2),
+            (reverse("healthz"), {}, 0),
+            (reverse("readyz"), {}, 1),
+            (reverse("metrics"), {}, 0),
+        ]
+        for url, params, budget in cases:
+            with self.subTest(url=url), mock.patch(
+                "api.views.CashMachineView.render_pdf", return_value=b"%PDF"
+            ), mock.patch.dict(
+                warmup._state, {"templates": True, "renderer": True}
+            ):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertQueryCount(response, budget)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+
+    def test_streaming_bodies(self):
+        """
+        Закрепляет запросы потоковых ответов вместе с отдачей тела.
+
+        Выгрузка выбирает чеки одним запросом уже при отдаче архива,
+        а файл чека по QR-коду читается из хранилища без запросов.
+        """
+        self.client.force_authenticate(self.admin)
+        cases = [
+            (reverse("receipts_export"), {"from": "2024-01-01"}, 2, 1),
+            (
+                reverse("qr_code_file", args=[self.receipt.file_name]),
+                {},
+                1,
+                0,
+            ),
+        ]
+        for url, params, budget, total in cases:
+            with self.subTest(url=url), self.assertNumQueries(total):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertQueryCount(response, budget)
+                self.assertTrue(b"".join(response.streaming_content))
+
+    def test_budget_exceeded(self):
+        """
+        Проверяет ошибку в строгом режиме и учёт превышения в метриках.
+        """
+        with mock.patch.object(
+            CashMachineView, "query_budget", 0
+        ), self.assertRaises(QueryBudgetExceeded):
+            self.client.post(
+                reverse("cash_machine"), {"items": [0]}, format="json"
+            )
+
+        with override_settings(QUERY_BUDGET_STRICT=False), mock.patch.object(
+            CashMachineView, "query_budget", 0
+        ), self.assertLogs("api.middleware", "WARNING"):
+            self.client.post(
+                reverse("cash_machine"), {"items": [0]}, format="json"
+            )
+        self.assertEqual(
+            metrics.snapshot()["CashMachineView"]["over_budget"], 2
+        )
+        response = self.client.get(reverse("metrics"))
+        self.assertIn(
+            b'cash_machine_view_over_budget_total{view="CashMachineView"} 2',
+            response.content,
+        )
+
+    def test_count_queries_helper(self):
+        """
+        Проверяет подсчёт запросов вне HTTP-запроса.
+        """
+        with count_queries() as counter:
+            list(Item.objects.all())
+            Item.objects.count()
+        self.assertEqual(counter.count, 2)
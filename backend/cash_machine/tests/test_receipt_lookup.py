@@ -0,0 +1,149 @@
+import datetime
+from decimal import Decimal
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from receipts.models import Item, Receipt
+from receipts.sales import record_sale
+from receipts.tokens import make_receipt_token
+
+
+class ReceiptLookupTest(APITestCase):
+    """
+    Тесты для проверки поиска чеков по периоду, сумме и товару.
+    """
+
+    def setUp(self):
+        """
+        Создаёт товары, администратора и пять чеков с шагом в час,
+        два из которых созданы в одну и ту же секунду.
+        """
+        self.bread = Item.objects.create(title="Хлеб", price=40)
+        self.milk = Item.objects.create(title="Молоко", price=90)
+        start = timezone.make_aware(datetime.datetime(2024, 1, 1, 10))
+        moments = [start + datetime.timedelta(hours=i) for i in range(4)]
+        moments.append(moments[-1])
+
+        self.receipts = []
+        for number, created_at in enumerate(moments):
+            lines = [(self.bread, 1)]
+            if number % 2:
+                lines.append((self.milk, 1))
+            receipt = Receipt.objects.create(
+                file_name=f"check_01.01.2024_{number}.pdf",
+                created_at=created_at,
+                total=sum(item.price for item, _ in lines),
+                line_count=len(lines),
+            )
+            record_sale(receipt, lines)
+            self.receipts.append(receipt)
+
+        self.admin = User.objects.create_user(
+            username="admin", password="admin", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+
+    def fetch_all(self, params):
+        """
+        Проходит все страницы по ссылкам next и возвращает id чеков.
+        """
+        ids = []
+        response = self.client.get(reverse("receipts_list"), params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [row["id"] for row in response.json()["receipts"]]
+            if response.json()["next"] is None:
+                return ids
+            response = self.client.get(response.json()["next"])
+
+    def test_keyset_pages(self):
+        """
+        Проверяет, что страницы по ключу (время, id) возвращают
+        все чеки от новых к старым без повторов и пропусков,
+        в том числе чеки с одинаковым временем создания.
+        """
+        expected = [receipt.id for receipt in reversed(self.receipts)]
+        self.assertEqual(self.fetch_all({"limit": 2}), expected)
+
+        response = self.client.get(reverse("receipts_list"), {"limit": 1})
+        row = response.json()["receipts"][0]
+        receipt = self.receipts[-1]
+        self.assertEqual(row["file_name"], receipt.file_name)
+        self.assertEqual(row["total"], "40.00")
+        self.assertEqual(row["line_count"], 1)
+        self.assertEqual(row["token"], make_receipt_token(receipt.id))
+
+    def test_filters(self):
+        """
+        Проверяет отбор по периоду, минимальной сумме и товару.
+        """
+        ids = [receipt.id for receipt in self.receipts]
+        cases = [
+            (
+                {"from": "2024-01-01T11:00:00", "to": "2024-01-01T12:30:00"},
+                [ids[2], ids[1]],
+            ),
+            ({"min_total": "100"}, [ids[3], ids[1]]),
+            ({"item": self.milk.id}, [ids[3], ids[1]]),
+            (
+                {"item": self.bread.id, "from": "2024-01-01T12:00:00"},
+                [ids[4], ids[3], ids[2]],
+            ),
+            (
+                {"item": self.bread.id, "min_total": "50"},
+                [ids[3], ids[1]],
+            ),
+        ]
+        for params, expected in cases:
+            with self.subTest(params=params):
+                self.assertEqual(
+                    self.fetch_all({**params, "limit": 1}), expected
+                )
+
+    def test_bad_params_and_permissions(self):
+        """
+        Проверяет ответ 400 на некорректные параметры
+        и закрытый доступ для обычных пользователей.
+        """
+        for params in (
+            {"min_total": "abc"},
+            {"min_total": "NaN"},
+            {"item": "x"},
+            {"after": "broken"},
+            {"from": "вчера"},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(reverse("receipts_list"), params)
+                self.assertEqual(
+                    response.status_code, status.HTTP_400_BAD_REQUEST
+                )
+
+        self.client.force_authenticate(None)
+        response = self.client.get(reverse("receipts_list"))
+        self.assertIn(
+            response.status_code,
+            (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN),
+        )
+
+    def test_fill_totals_migration(self):
+        """
+        Проверяет заполнение суммы и количества строк старых чеков
+        по записанным продажам.
+        """
+        Receipt.objects.update(total=0, line_count=0)
+        empty = Receipt.objects.create(file_name="check_legacy.pdf")
+
+        migration = import_module("receipts.migrations.0007_receipt_lookup")
+        migration.fill_receipt_totals(apps, None)
+
+        receipt = Receipt.objects.get(pk=self.receipts[1].pk)
+        self.assertEqual(receipt.total, Decimal("130.00"))
+        self.assertEqual(receipt.line_count, 2)
+        empty.refresh_from_db()
+        self.assertEqual((empty.total, empty.line_count), (0, 0))
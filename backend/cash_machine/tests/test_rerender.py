@@ -0,0 +1,153 @@
+import datetime
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from receipts.models import Item, PackedReceipt, Receipt
+from receipts.sales import record_sale
+from receipts.storage import PackFileStorage, replace_receipt
+
+
+def fake_render_pdf(self, rendered_html):
+    return b"%PDF-new " + str(rendered_html.count("Хлеб")).encode()
+
+
+class RerenderReceiptsTest(TestCase):
+    """
+    Тесты для проверки команды rerender_receipts.
+    """
+
+    def setUp(self):
+        """
+        Создаёт чеки с продажами и их файлы во временном MEDIA_ROOT.
+        """
+        self.media_root = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.media_root, "checkpoint.json")
+        item = Item.objects.create(title="Хлеб", price=45)
+        self.receipts = []
+        for day in (1, 2, 3):
+            receipt = Receipt.objects.create(
+                file_name=f"check_0{day}.01.2024_12_00_1.pdf",
+                created_at=timezone.make_aware(
+                    datetime.datetime(2024, 1, day, 12)
+                ),
+            )
+            record_sale(receipt, [(item, day)])
+            self.write(receipt.file_name, b"%PDF-old")
+            self.receipts.append(receipt)
+        Receipt.objects.create(file_name="check_legacy.pdf")
+        self.write("check_legacy.pdf", b"%PDF-old")
+
+    def tearDown(self):
+        shutil.rmtree(self.media_root)
+
+    def write(self, name, content):
+        with open(os.path.join(self.media_root, name), "wb") as file:
+            file.write(content)
+
+    def read(self, name):
+        with open(os.path.join(self.media_root, name), "rb") as file:
+            return file.read()
+
+    def rerender(self, render_pdf=fake_render_pdf, **options):
+        out = StringIO()
+        self.errors = StringIO()
+        with override_settings(MEDIA_ROOT=self.media_root), mock.patch(
+            "api.views.CashMachineView.render_pdf", render_pdf
+        ):
+            call_command(
+                "rerender_receipts",
+                workers=1,
+                batch_size=2,
+                checkpoint=self.checkpoint,
+                stdout=out,
+                stderr=self.errors,
+                **options,
+            )
+        return out.getvalue()
+
+    def test_rerender_period(self):
+        """
+        Проверяет формирование чеков за период по сохранённым продажам.
+        """
+        output = self.rerender(since="2024-01-02", until="2024-01-03")
+
+        self.assertEqual(self.read(self.receipts[0].file_name), b"%PDF-old")
+        self.assertEqual(self.read(self.receipts[1].file_name), b"%PDF-new 2")
+        self.assertEqual(self.read(self.receipts[2].file_name), b"%PDF-new 3")
+        self.assertIn("Сформировано чеков: 2", output)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resume(self):
+        """
+        Проверяет продолжение с контрольной точки и пропуск чеков
+        без продаж.
+        """
+        with open(self.checkpoint, "w") as file:
+            json.dump(
+                {
+                    "since": None,
+                    "until": None,
+                    "last_id": self.receipts[1].id,
+                },
+                file,
+            )
+
+        output = self.rerender(resume=True)
+
+        self.assertEqual(self.read(self.receipts[1].file_name), b"%PDF-old")
+        self.assertEqual(self.read(self.receipts[2].file_name), b"%PDF-new 3")
+        self.assertEqual(self.read("check_legacy.pdf"), b"%PDF-old")
+        self.assertIn("пропущено без продаж: 1", output)
+
+    def test_render_error(self):
+        """
+        Проверяет, что ошибка одного чека не прерывает пачку,
+        а контрольная точка сдвигается за него.
+        """
+        failing = self.receipts[1].file_name
+
+        def render_pdf(view, rendered_html):
+            if rendered_html.count("Хлеб") == 2:
+                raise OSError("wkhtmltopdf exited with code 1")
+            return fake_render_pdf(view, rendered_html)
+
+        with mock.patch(
+            "receipts.management.commands.rerender_receipts"
+            ".Command.save_checkpoint",
+            autospec=True,
+        ) as save_checkpoint:
+            output = self.rerender(render_pdf=render_pdf)
+
+        self.assertEqual(self.read(self.receipts[0].file_name), b"%PDF-new 1")
+        self.assertEqual(self.read(failing), b"%PDF-old")
+        self.assertEqual(self.read(self.receipts[2].file_name), b"%PDF-new 3")
+        self.assertIn(
+            f"Не удалось сформировать чек {failing}", self.errors.getvalue()
+        )
+        self.assertIn("с ошибкой: 1", output)
+        first_batch = save_checkpoint.call_args_list[0].args[2]
+        self.assertEqual(first_batch["last_id"], self.receipts[1].id)
+
+    def test_replace_in_pack(self):
+        """
+        Проверяет атомарную замену чека в пакетном хранилище.
+        """
+        with override_settings(
+            RECEIPT_STORAGE="pack", RECEIPT_PACK_ROOT=self.media_root
+        ):
+            storage = PackFileStorage()
+            storage.save("check_pack.pdf", ContentFile(b"old"))
+            replace_receipt("check_pack.pdf", b"new content")
+            self.assertEqual(
+                bytes(storage.open_view("check_pack.pdf")), b"new content"
+            )
+        self.assertEqual(PackedReceipt.objects.get().length, 11)
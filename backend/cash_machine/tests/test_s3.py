@@ -0,0 +1,222 @@
+import os
+import socket
+import unittest
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from receipts.models import Receipt
+from receipts.s3 import MIN_PART_SIZE, S3ReceiptStorage, get_client
+
+try:
+    import boto3  # noqa: F401
+except ImportError:  # pragma: no cover - boto3 является опциональным
+    boto3 = None
+
+try:
+    from moto.server import ThreadedMotoServer
+except ImportError:  # pragma: no cover - moto нужен только для тестов
+    ThreadedMotoServer = None
+
+# Адрес внешнего S3-совместимого сервера (например, MinIO из
+# docker-compose). Если не задан, тесты поднимают сервер moto.
+TEST_ENDPOINT = os.environ.get("RECEIPT_S3_TEST_ENDPOINT")
+
+S3_SETTINGS = {
+    "RECEIPT_STORAGE": "s3",
+    "RECEIPT_S3_BUCKET": "receipts-test",
+    "RECEIPT_S3_PREFIX": "receipts/",
+    "RECEIPT_S3_REGION": "us-east-1",
+    "RECEIPT_S3_ACCESS_KEY": os.environ.get(
+        "RECEIPT_S3_TEST_ACCESS_KEY", "testing"
+    ),
+    "RECEIPT_S3_SECRET_KEY": os.environ.get(
+        "RECEIPT_S3_TEST_SECRET_KEY", "testing"
+    ),
+    "RECEIPT_S3_MULTIPART_THRESHOLD": MIN_PART_SIZE,
+}
+
+
+@unittest.skipIf(boto3 is None, "boto3 не установлен")
+@unittest.skipIf(
+    TEST_ENDPOINT is None and ThreadedMotoServer is None,
+    "нет S3-совместимого сервера для тестов",
+)
+class S3TestCase(APITestCase):
+    """
+    Базовый класс тестов с S3-совместимым сервером и чистым бакетом.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = None
+        endpoint = TEST_ENDPOINT
+        if endpoint is None:
+            with socket.socket() as sock:
+                sock.bind(("127.0.0.1", 0))
+                port = sock.getsockname()[1]
+            cls.server = ThreadedMotoServer(
+                ip_address="127.0.0.1", port=port, verbose=False
+            )
+            cls.server.start()
+            endpoint = f"http://127.0.0.1:{port}"
+        cls.settings = override_settings(
+            RECEIPT_S3_ENDPOINT_URL=endpoint, **S3_SETTINGS
+        )
+        cls.settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        if cls.server is not None:
+            cls.server.stop()
+        get_client.cache_clear()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.storage = S3ReceiptStorage()
+        self.storage.client.create_bucket(Bucket=self.storage.bucket)
+
+    def tearDown(self):
+        bucket = self.storage.bucket
+        client = self.storage.client
+        for page in client.get_paginator("list_objects_v2").paginate(
+            Bucket=bucket
+        ):
+            for entry in page.get("Contents", []):
+                client.delete_object(Bucket=bucket, Key=entry["Key"])
+        client.delete_bucket(Bucket=bucket)
+
+
+class S3ReceiptStorageTest(S3TestCase):
+    """
+    Тесты для проверки хранилища чеков в S3.
+    """
+
+    def test_save_and_read(self):
+        """
+        Проверяет запись, потоковое чтение, листинг и замену чеков.
+        """
+        for number in range(3):
+            self.storage.save(
+                f"check_01.01.2024_10_00_{number}.pdf",
+                ContentFile(b"%PDF-" + bytes([number]) * 10),
+            )
+
+        name = "check_01.01.2024_10_00_1.pdf"
+        self.assertEqual(
+            b"".join(self.storage.open_chunks(name)), b"%PDF-" + b"\x01" * 10
+        )
+        self.assertIsNone(self.storage.open_chunks("missing.pdf"))
+        self.assertEqual(len(self.storage.listdir("")[1]), 3)
+        self.assertTrue(self.storage.exists(name))
+        self.assertFalse(self.storage.exists("missing.pdf"))
+
+        self.storage.replace(name, b"%PDF-new")
+        with self.storage.open(name) as file:
+            self.assertEqual(file.read(), b"%PDF-new")
+        self.assertEqual(self.storage.size(name), 8)
+
+        url = self.storage.url(name)
+        self.assertIn(f"receipts/{name}", url)
+        self.assertIn("Signature", url)
+
+    def test_save_stream_multipart(self):
+        """
+        Проверяет, что большой поток загружается по частям
+        и собирается в исходный объект.
+        """
+        chunk = b"x" * (1024 * 1024)
+        chunks = [chunk] * 11 + [b"tail"]
+        self.storage.save_stream("exports/big.zip", iter(chunks))
+
+        result = self.storage.client.head_object(
+            Bucket=self.storage.bucket, Key="receipts/exports/big.zip"
+        )
+        self.assertEqual(result["ContentLength"], 11 * len(chunk) + 4)
+        self.assertEqual(result["ContentType"], "application/zip")
+        # У объекта, собранного из частей, ETag имеет вид "<md5>-<частей>".
+        self.assertTrue(result["ETag"].strip('"').endswith("-3"))
+
+        self.storage.save_stream("exports/small.zip", iter([b"a", b"b"]))
+        self.assertEqual(
+            b"".join(self.storage.open_chunks("exports/small.zip")), b"ab"
+        )
+
+    def test_save_stream_aborts_on_error(self):
+        """
+        Проверяет, что при ошибке в источнике загрузка отменяется
+        и объект не появляется в бакете.
+        """
+
+        def broken():
+            yield b"x" * MIN_PART_SIZE
+            raise RuntimeError("source failed")
+
+        with self.assertRaises(RuntimeError):
+            self.storage.save_stream("exports/broken.zip", broken())
+
+        self.assertFalse(self.storage.exists("exports/broken.zip"))
+        uploads = self.storage.client.list_multipart_uploads(
+            Bucket=self.storage.bucket
+        )
+        self.assertEqual(uploads.get("Uploads", []), [])
+
+
+class S3ViewsTest(S3TestCase):
+    """
+    Тесты для проверки выдачи чеков из S3 через API.
+    """
+
+    def test_qr_code_file_view_redirects(self):
+        """
+        Проверяет, что файл чека отдаётся перенаправлением
+        на подписанную ссылку, а чтение без перенаправления
+        проксирует содержимое.
+        """
+        name = "check_01.01.2024_10_00_1.pdf"
+        self.storage.save(name, ContentFile(b"%PDF-s3"))
+        url = reverse("qr_code_file", kwargs={"file_name": name})
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertIn(f"receipts/{name}", response["Location"])
+
+        with override_settings(RECEIPT_S3_REDIRECT=False):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(b"".join(response.streaming_content), b"%PDF-s3")
+
+            response = self.client.get(
+                reverse("qr_code_file", kwargs={"file_name": "missing.pdf"})
+            )
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_receipt_export_store(self):
+        """
+        Проверяет, что архив чеков сохраняется в S3
+        и ответ перенаправляет на него.
+        """
+        name = "check_01.01.2024_10_00_1.pdf"
+        self.storage.save(name, ContentFile(b"%PDF-s3"))
+        Receipt.objects.create(file_name=name)
+        admin = User.objects.create_user(
+            username="admin", password="admin", is_staff=True
+        )
+        self.client.force_authenticate(admin)
+
+        response = self.client.get(
+            reverse("receipts_export"), {"store": "true"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertIn("receipts/exports/receipts_", response["Location"])
+        _, files = self.storage.listdir("exports")
+        self.assertEqual(len(files), 1)
+        with self.storage.open(f"exports/{files[0]}") as file:
+            self.assertTrue(file.read().startswith(b"PK"))
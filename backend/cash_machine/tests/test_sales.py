@@ -0,0 +1,121 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from receipts.models import DailyItemSales, HourlySales, Item, Receipt
+from receipts.sales import rebuild_rollups, record_sale
+
+
+class SalesRollupTest(APITestCase):
+    """
+    Тесты для проверки записи продаж, сводок и отчёта о продажах.
+    """
+
+    def setUp(self):
+        """
+        Создаёт товары и два чека за один час.
+        """
+        self.item1 = Item.objects.create(title="Макароны", price=80)
+        self.item2 = Item.objects.create(
+            title="Огурцы", price=Decimal("60.50")
+        )
+        created_at = timezone.make_aware(datetime.datetime(2024, 1, 1, 12, 15))
+
+        for number, lines in enumerate(
+            ([(self.item1, 1), (self.item2, 2)], [(self.item1, 3)])
+        ):
+            receipt = Receipt.objects.create(
+                file_name=f"check_01.01.2024_12_15_{number}.pdf",
+                created_at=created_at,
+            )
+            record_sale(receipt, lines)
+
+    def assert_rollups(self):
+        daily = {
+            row.item_id: row
+            for row in DailyItemSales.objects.filter(
+                day=datetime.date(2024, 1, 1)
+            )
+        }
+        self.assertEqual(daily[self.item1.id].quantity, 4)
+        self.assertEqual(daily[self.item1.id].revenue, Decimal("320.00"))
+        self.assertEqual(daily[self.item2.id].revenue, Decimal("121.00"))
+
+        hourly = HourlySales.objects.get()
+        self.assertEqual(
+            timezone.localtime(hourly.hour).hour, 12, "Неверный час сводки."
+        )
+        self.assertEqual(hourly.receipts, 2)
+        self.assertEqual(hourly.quantity, 6)
+        self.assertEqual(hourly.revenue, Decimal("441.00"))
+        self.assertEqual(hourly.vat, Decimal("88.20"))
+
+    def test_rollups_are_incremental(self):
+        """
+        Проверяет, что сводки накапливают продажи нескольких чеков.
+        """
+        self.assert_rollups()
+
+    def test_rebuild_rollups(self):
+        """
+        Проверяет, что пересчёт из исходных продаж даёт те же сводки.
+        """
+        DailyItemSales.objects.update(quantity=0)
+
+        count = rebuild_rollups(
+            datetime.date(2024, 1, 1), datetime.date(2024, 1, 1)
+        )
+
+        self.assertEqual(count, 3)
+        self.assert_rollups()
+
+    def test_sales_report_view(self):
+        """
+        Проверяет отчёт о продажах с группировкой по дням и товарам.
+        """
+        admin = User.objects.create_user(
+            username="admin", password="admin", is_staff=True
+        )
+        self.client.force_authenticate(admin)
+        url = reverse("sales_report")
+        period = {"from": "2024-01-01", "to": "2024-01-31"}
+
+        by_day = self.client.get(url, {**period, "group": "day"})
+        by_item = self.client.get(url, {**period, "group": "item"})
+        by_hour = self.client.get(url, {**period, "group": "hour"})
+
+        self.assertEqual(by_day.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            by_day.data,
+            [
+                {
+                    "day": "2024-01-01",
+                    "quantity": 6,
+                    "revenue": "441.00",
+                    "vat": "88.20",
+                }
+            ],
+        )
+        self.assertEqual(
+            [row["item_id"] for row in by_item.data],
+            [self.item1.id, self.item2.id],
+        )
+        self.assertEqual(by_hour.data[0]["receipts"], 2)
+
+    def test_sales_report_requires_period(self):
+        """
+        Проверяет, что отчёт без периода возвращает 400 Bad Request.
+        """
+        admin = User.objects.create_user(
+            username="admin", password="admin", is_staff=True
+        )
+        self.client.force_authenticate(admin)
+
+        response = self.client.get(reverse("sales_report"))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,76 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from receipts.models import Item
+from receipts.search import build_match_query, search_items
+
+
+class ItemSearchTest(APITestCase):
+    """
+    Тесты для проверки полнотекстового поиска товаров.
+    """
+
+    def setUp(self):
+        """
+        Создаёт товары, в том числе массовой вставкой.
+        """
+        Item.objects.bulk_create(
+            [
+                Item(title="Макароны твёрдых сортов", price=80),
+                Item(title="МАКАРОНЫ-рожки", price=70),
+                Item(title="Огурцы", price=60),
+                Item(title="Pasta Barilla", price=150),
+            ]
+        )
+
+    def titles(self, query):
+        return [item.title for item in search_items(query)]
+
+    def test_build_match_query(self):
+        """
+        Проверяет преобразование запроса в выражение MATCH.
+        """
+        self.assertEqual(build_match_query('мак "тв'), '"мак"* "тв"*')
+        self.assertEqual(build_match_query("ёлка"), '"елка"*')
+        self.assertEqual(build_match_query("  ,. "), "")
+
+    def test_prefix_and_case(self):
+        """
+        Проверяет поиск по началу слова без учёта регистра.
+        """
+        self.assertCountEqual(
+            self.titles("мак"),
+            ["Макароны твёрдых сортов", "МАКАРОНЫ-рожки"],
+        )
+        self.assertEqual(self.titles("рож"), ["МАКАРОНЫ-рожки"])
+        self.assertEqual(self.titles("BARI"), ["Pasta Barilla"])
+        self.assertEqual(self.titles("твердых"), ["Макароны твёрдых сортов"])
+        self.assertEqual(self.titles("мак огу"), [])
+
+    def test_index_follows_item_changes(self):
+        """
+        Проверяет, что индекс обновляется при изменении
+        и удалении товаров.
+        """
+        item = Item.objects.get(title="Огурцы")
+        item.title = "Помидоры"
+        item.save()
+        Item.objects.filter(title="Pasta Barilla").delete()
+
+        self.assertEqual(self.titles("огу"), [])
+        self.assertEqual(self.titles("пом"), ["Помидоры"])
+        self.assertEqual(self.titles("pasta"), [])
+
+    def test_items_search_view(self):
+        """
+        Проверяет эндпоинт "api/v1/items/search/".
+        """
+        response = self.client.get(
+            reverse("items_search"), {"q": "огу", "limit": 5}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["title"], "Огурцы")
+        self.assertEqual(response.data[0]["price"], "60.00")
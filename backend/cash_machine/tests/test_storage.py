@@ -0,0 +1,270 @@
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from receipts.models import PackedReceipt, Receipt
+from receipts.storage import (
+    PackFileStorage,
+    ReceiptFileStorage,
+    count_receipts,
+    get_receipt_storage,
+    persist_receipt,
+)
+
+
+class PackFileStorageTest(APITestCase):
+    """
+    Тесты для проверки пакетного хранилища чеков.
+    """
+
+    def setUp(self):
+        """
+        Создаёт хранилище во временном каталоге с маленькими сегментами.
+        """
+        self.location = tempfile.mkdtemp()
+        self.storage = PackFileStorage(self.location, segment_size=100)
+
+    def tearDown(self):
+        shutil.rmtree(self.location)
+
+    def test_save_and_read(self):
+        """
+        Проверяет, что сохранённые чеки читаются без изменений
+        и при переполнении создаётся новый сегмент.
+        """
+        for number in range(3):
+            self.storage.save(
+                f"check_{number}.pdf", ContentFile(bytes([number]) * 60)
+            )
+
+        for number in range(3):
+            self.assertEqual(
+                bytes(self.storage.open_view(f"check_{number}.pdf")),
+                bytes([number]) * 60,
+            )
+        self.assertEqual(self.storage.segments(), [1, 2])
+        self.assertEqual(self.storage.size("check_1.pdf"), 60)
+        self.assertTrue(self.storage.exists("check_2.pdf"))
+        self.assertIsNone(self.storage.open_view("missing.pdf"))
+
+    def test_compact(self):
+        """
+        Проверяет, что уплотнение переносит живые чеки
+        и удаляет сегмент, где больше половины данных удалено.
+        """
+        for number in range(4):
+            self.storage.save(
+                f"check_{number}.pdf", ContentFile(bytes([number]) * 40)
+            )
+        self.storage.delete("check_0.pdf")
+        self.storage.delete("check_2.pdf")
+
+        result = self.storage.compact()
+
+        self.assertEqual(result["segments"], 1)
+        self.assertEqual(result["freed_bytes"], 80)
+        self.assertNotIn(1, self.storage.segments())
+        for number in (1, 3):
+            self.assertEqual(
+                bytes(self.storage.open_view(f"check_{number}.pdf")),
+                bytes([number]) * 40,
+            )
+
+    def fill_for_compact(self):
+        for number in range(4):
+            self.storage.save(
+                f"check_{number}.pdf", ContentFile(bytes([number]) * 40)
+            )
+        self.storage.delete("check_0.pdf")
+        self.storage.delete("check_2.pdf")
+
+    def test_compact_in_other_process(self):
+        """
+        Проверяет, что после уплотнения в другом процессе отображение
+        удалённого сегмента забывается и место на диске освобождается.
+        """
+        self.fill_for_compact()
+        self.assertEqual(
+            bytes(self.storage.open_view("check_1.pdf")), b"\x01" * 40
+        )
+        self.assertIn(1, self.storage._maps)
+
+        PackFileStorage(self.location, segment_size=100).compact()
+
+        self.assertEqual(
+            bytes(self.storage.open_view("check_3.pdf")), b"\x03" * 40
+        )
+        self.assertNotIn(1, self.storage._maps)
+        self.assertEqual(
+            bytes(self.storage.open_view("check_1.pdf")), b"\x01" * 40
+        )
+
+    def test_compact_after_index_read(self):
+        """
+        Проверяет, что чтение по записи индекса, прочитанной
+        до уплотнения, находит перенесённый чек.
+        """
+        self.fill_for_compact()
+        other = PackFileStorage(self.location, segment_size=100)
+        original_map = self.storage._map
+
+        def compact_then_map(segment, end):
+            if 1 in other.segments():
+                other.compact()
+            return original_map(segment, end)
+
+        with mock.patch.object(
+            self.storage, "_map", side_effect=compact_then_map
+        ):
+            view = self.storage.open_view("check_1.pdf")
+
+        self.assertEqual(bytes(view), b"\x01" * 40)
+        self.assertNotIn(1, self.storage.segments())
+
+    def test_append_while_reading(self):
+        """
+        Проверяет, что дозапись в сегмент не закрывает отображение,
+        из которого ещё читается выданный срез.
+        """
+        self.storage.save("check_0.pdf", ContentFile(b"a" * 40))
+        view = self.storage.open_view("check_0.pdf")
+
+        self.storage.save("check_1.pdf", ContentFile(b"b" * 40))
+
+        self.assertEqual(
+            bytes(self.storage.open_view("check_1.pdf")), b"b" * 40
+        )
+        self.assertEqual(bytes(view), b"a" * 40)
+        self.assertEqual(self.storage.segments(), [1])
+
+    def test_storage_per_process(self):
+        """
+        Проверяет, что хранилище создаётся один раз
+        и пересоздаётся при изменении настроек.
+        """
+        with override_settings(
+            RECEIPT_STORAGE="pack", RECEIPT_PACK_ROOT=self.location
+        ):
+            storage = get_receipt_storage()
+            self.assertIs(get_receipt_storage(), storage)
+            with override_settings(RECEIPT_PACK_SEGMENT_SIZE=100):
+                self.assertIsNot(get_receipt_storage(), storage)
+                self.assertEqual(get_receipt_storage().segment_size, 100)
+
+    def test_qr_code_file_view_reads_pack(self):
+        """
+        Проверяет, что эндпоинт "qr_code_file" отдаёт чек
+        из пакетного хранилища.
+        """
+        content = b"%PDF-1.4 packed receipt"
+        with override_settings(
+            RECEIPT_STORAGE="pack", RECEIPT_PACK_ROOT=self.location
+        ):
+            PackFileStorage().save("check_pack.pdf", ContentFile(content))
+            response = self.client.get(
+                reverse("qr_code_file", kwargs={"file_name": "check_pack.pdf"})
+            )
+            missing = self.client.get(
+                reverse("qr_code_file", kwargs={"file_name": "missing.pdf"})
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(b"".join(response.streaming_content), content)
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(PackedReceipt.objects.count(), 1)
+
+
+class PersistReceiptTest(APITestCase):
+    """
+    Тесты для проверки записи PDF чеков, сформированных в памяти.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.media_root)
+
+    def read(self, name):
+        with open(os.path.join(self.media_root, name), "rb") as file:
+            return file.read()
+
+    def test_sync_and_async(self):
+        """
+        Проверяет запись до ответа и в фоновом потоке.
+        """
+        with override_settings(
+            MEDIA_ROOT=self.media_root, RECEIPT_PERSIST="sync"
+        ):
+            self.assertIsNone(persist_receipt("check_1.pdf", b"%PDF-1"))
+        self.assertEqual(self.read("check_1.pdf"), b"%PDF-1")
+
+        with override_settings(
+            MEDIA_ROOT=self.media_root, RECEIPT_PERSIST="async"
+        ):
+            persist_receipt("check_2.pdf", b"%PDF-2").result(timeout=5)
+        self.assertEqual(self.read("check_2.pdf"), b"%PDF-2")
+
+    def test_count_uses_index(self):
+        """
+        Проверяет, что чеки подсчитываются по индексу Receipt,
+        без обращения к хранилищу.
+        """
+        Receipt.objects.create(file_name="check_01.01.2024_12_00_1.pdf")
+        Receipt.objects.create(file_name="check_01.01.2024_12_00_2.pdf")
+        with override_settings(MEDIA_ROOT=self.media_root), mock.patch(
+            "receipts.storage.get_receipt_storage"
+        ) as storage:
+            self.assertEqual(count_receipts("check_01.01.2024_12_00"), 2)
+            self.assertEqual(count_receipts("check_01.01.2024_13_00"), 0)
+        storage.assert_not_called()
+
+    def test_name_collision(self):
+        """
+        Проверяет, что существующий файл чека не сохраняется повторно
+        под другим именем.
+        """
+        with override_settings(
+            MEDIA_ROOT=self.media_root, RECEIPT_PERSIST="sync"
+        ):
+            persist_receipt("check_1.pdf", b"%PDF-old")
+            with self.assertRaises(FileExistsError):
+                persist_receipt("check_1.pdf", b"%PDF-new")
+        self.assertEqual(os.listdir(self.media_root), ["check_1.pdf"])
+        self.assertEqual(self.read("check_1.pdf"), b"%PDF-old")
+
+    def test_concurrent_replace(self):
+        """
+        Проверяет, что параллельные замены одного чека из потоков
+        одного процесса не используют общий временный файл.
+        """
+        storage = ReceiptFileStorage(location=self.media_root)
+        errors = []
+
+        def replace(number):
+            try:
+                for _ in range(50):
+                    storage.replace("check_1.pdf", b"%PDF-" + bytes([number]))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=replace, args=(number,))
+            for number in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(os.listdir(self.media_root), ["check_1.pdf"])
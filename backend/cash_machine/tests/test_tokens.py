@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from receipts.models import Item, Receipt
+from receipts.sales import record_sale
+from receipts.tokens import (
+    BadToken,
+    b62decode,
+    b62encode,
+    make_receipt_token,
+    read_receipt_token,
+)
+
+
+class ReceiptTokenTest(APITestCase):
+    """
+    Тесты для проверки подписанных токенов чеков и ссылки /r/<token>.
+    """
+
+    def setUp(self):
+        """
+        Создаёт чек во временном MEDIA_ROOT.
+        """
+        self.media_root = tempfile.mkdtemp()
+        self.receipt = Receipt.objects.create(
+            file_name="check_01.01.2024_12_00_1.pdf"
+        )
+        self.token = make_receipt_token(self.receipt.id)
+
+    def tearDown(self):
+        shutil.rmtree(self.media_root)
+
+    def test_round_trip(self):
+        """
+        Проверяет кодирование base62 и чтение токена.
+        """
+        self.assertEqual(
+            b62decode(b62encode(b"\x01\x00\xff")), b"\x01\x00\xff"
+        )
+        self.assertRegex(self.token, r"^[0-9A-Za-z]{12,20}$")
+        self.assertEqual(read_receipt_token(self.token), self.receipt.id)
+        self.assertEqual(
+            read_receipt_token(make_receipt_token(2**40)), 2**40
+        )
+
+    def test_tampered_token(self):
+        """
+        Проверяет, что изменённый или повреждённый токен отклоняется.
+        """
+        other = make_receipt_token(self.receipt.id + 1)
+        forged = other[:-1] + ("0" if other[-1] != "0" else "1")
+        for token in (forged, "abc", "not-base62!"):
+            with self.assertRaises(BadToken):
+                read_receipt_token(token)
+
+        response = self.client.get(reverse("receipt_token", args=[forged]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_serves_stored_file(self):
+        """
+        Проверяет выдачу сохранённого файла чека по токену.
+        """
+        path = os.path.join(self.media_root, self.receipt.file_name)
+        with open(path, "wb") as file:
+            file.write(b"%PDF-stored")
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            response = self.client.get(
+                reverse("receipt_token", args=[self.token])
+            )
+            content = b"".join(response.streaming_content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(content, b"%PDF-stored")
+
+    def test_regenerates_missing_file(self):
+        """
+        Проверяет, что при отсутствии файла PDF формируется заново
+        по сохранённым строкам чека.
+        """
+        item = Item.objects.create(title="Хлеб", price=Decimal("45.00"))
+        record_sale(self.receipt, [(item, 2)])
+
+        with override_settings(MEDIA_ROOT=self.media_root), mock.patch(
+            "api.views.CashMachineView.render_pdf",
+            return_value=b"%PDF-regenerated",
+        ) as render_pdf:
+            response = self.client.get(
+                reverse("receipt_token", args=[self.token])
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"%PDF-regenerated")
+        html = render_pdf.call_args.args[0]
+        self.assertEqual(html.count("Хлеб"), 2)
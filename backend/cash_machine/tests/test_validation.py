@@ -0,0 +1,187 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.validation import (
+    PayloadError,
+    filter_in_chunks,
+    parse_price,
+    validate_cart,
+    validate_item_row,
+)
+from receipts.models import Item
+
+from .helpers import count_queries
+
+
+class ValidationTest(SimpleTestCase):
+    """
+    Тесты для проверки функций api.validation.
+    """
+
+    @override_settings(RECEIPT_MAX_ITEMS=3)
+    def test_validate_cart(self):
+        """
+        Проверяет список товаров чека: тип, размер и идентификаторы.
+        """
+        self.assertEqual(validate_cart({"items": [3, 1, 3]}), [3, 1, 3])
+        for data in (
+            [1, 2],
+            {},
+            {"items": []},
+            {"items": "1,2"},
+            {"items": [1, 2, 3, 4]},
+            {"items": [1, "2"]},
+            {"items": [1.0]},
+            {"items": [True]},
+            {"items": [-1]},
+            {"items": [2**63]},
+        ):
+            with self.subTest(data=data), self.assertRaises(PayloadError):
+                validate_cart(data)
+
+    def test_parse_price(self):
+        """
+        Проверяет преобразование цены в Decimal.
+        """
+        self.assertEqual(parse_price(80), Decimal("80"))
+        self.assertEqual(parse_price(0.1), Decimal("0.10"))
+        self.assertEqual(parse_price("12.50"), Decimal("12.50"))
+        for value in (0, -5, "abc", "NaN", "Infinity", 1.005, 10**9, [1]):
+            with self.subTest(value=value), self.assertRaises(PayloadError):
+                parse_price(value)
+
+    def test_validate_item_row(self):
+        """
+        Проверяет строку загрузки каталога.
+        """
+        self.assertEqual(
+            validate_item_row({"id": 5, "title": "Хлеб", "price": "45.5"}),
+            (5, "Хлеб", Decimal("45.5")),
+        )
+        self.assertEqual(
+            validate_item_row({"title": "Хлеб", "price": 45}),
+            (None, "Хлеб", Decimal("45")),
+        )
+        for row in (
+            "Хлеб",
+            {"title": "Хлеб"},
+            {"id": "5", "title": "Хлеб", "price": 45},
+            {"title": ["Хлеб"], "price": 45},
+            {"title": "x" * 256, "price": 45},
+        ):
+            with self.subTest(row=row), self.assertRaises(PayloadError):
+                validate_item_row(row)
+
+
+class FilterInChunksTest(TestCase):
+    """
+    Тесты для проверки выборки по большому списку идентификаторов.
+    """
+
+    def test_chunks(self):
+        """
+        Проверяет, что список разбивается на части по ограничению
+        и результаты объединяются без повторов.
+        """
+        items = Item.objects.bulk_create(
+            Item(title=f"Товар {i}", price=10) for i in range(25)
+        )
+        ids = [item.id for item in items]
+
+        with mock.patch("api.validation.in_chunk_size", return_value=10):
+            with count_queries() as counter:
+                found = filter_in_chunks(
+                    Item.objects.all(), "id", ids + ids[:5] + [10**6]
+                )
+        self.assertEqual(counter.count, 3)
+        self.assertEqual([item.id for item in found], sorted(ids))
+
+        with count_queries() as counter:
+            self.assertEqual(
+                len(filter_in_chunks(Item.objects.all(), "id", ids)), 25
+            )
+        self.assertEqual(counter.count, 1)
+
+    def test_sqlite_limit(self):
+        """
+        Проверяет выборку списком длиннее ограничения SQLite
+        на количество параметров запроса.
+        """
+        Item.objects.bulk_create(
+            Item(id=i, title="Товар", price=10) for i in range(1, 2501)
+        )
+        found = filter_in_chunks(
+            Item.objects.values_list("id", flat=True), "id", range(1, 3001)
+        )
+        self.assertEqual(len(found), 2500)
+
+
+class RequestValidationTest(APITestCase):
+    """
+    Тесты для проверки ответов на некорректные запросы.
+    """
+
+    def setUp(self):
+        self.item = Item.objects.create(title="Хлеб", price=45)
+
+    def post_cart(self, data, **kwargs):
+        return self.client.post(
+            reverse("cash_machine"),
+            data,
+            HTTP_ACCEPT="application/json",
+            **kwargs,
+        )
+
+    @override_settings(RECEIPT_MAX_ITEMS=2)
+    def test_cash_machine(self):
+        """
+        Проверяет ответ 400 на слишком большую корзину,
+        некорректные идентификаторы и некорректный JSON.
+        """
+        for data in (
+            {"items": [self.item.id] * 3},
+            {"items": ["1 OR 1=1"]},
+            {"items": {"id": 1}},
+        ):
+            with self.subTest(data=data):
+                response = self.post_cart(data, format="json")
+                self.assertEqual(
+                    response.status_code, status.HTTP_400_BAD_REQUEST
+                )
+                self.assertIn("error", response.json())
+
+        response = self.post_cart(
+            b'{"items": [1,', content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(ITEMS_LOAD_MAX_ROWS=3)
+    def test_create_items(self):
+        """
+        Проверяет ограничение размера загрузки и ошибки по строкам:
+        корректные строки загружаются, цены сохраняются без потерь.
+        """
+        url = reverse("create_items")
+        data = [{"title": "Товар", "price": 1}] * 4
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Item.objects.filter(title="Товар").exists())
+
+        response = self.client.post(url, {"id": 1}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        data = [
+            {"id": 100, "title": "Сыр", "price": 0.1},
+            {"id": 100, "title": "Сыр", "price": 1},
+            {"id": 101, "title": "Чай", "price": "12.345"},
+        ]
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.json()), 2)
+        self.assertEqual(Item.objects.get(id=100).price, Decimal("0.10"))
+        self.assertFalse(Item.objects.filter(id=101).exists())
@@ -1,11 +1,28 @@
 #!/bin/bash
+set -e
 
-# Выполнение миграций и сборки статики
-poetry install
-python manage.py makemigrations
-python manage.py migrate
-python manage.py collectstatic --noinput
-poetry run pytest
+# START_MODE=fast - быстрый запуск для production: статика собрана
+# и байт-код скомпилирован при сборке образа, при старте проверяется
+# только состояние миграций: при непримененных миграциях запуск
+# останавливается, а применяются они при старте только явно
+# (MIGRATE_ON_START=True). START_MODE=full - прежний полный цикл.
+if [ "${START_MODE:-full}" = "fast" ]; then
+    if ! python manage.py migrate --check > /dev/null; then
+        if [ "${MIGRATE_ON_START:-False}" = "True" ]; then
+            python manage.py migrate --noinput
+        else
+            echo "Есть непримененные миграции, запуск остановлен." >&2
+            exit 1
+        fi
+    fi
+else
+    # Выполнение миграций и сборки статики
+    poetry install
+    python manage.py makemigrations
+    python manage.py migrate
+    python manage.py collectstatic --noinput
+    poetry run pytest
+fi
 
 # Запуск Gunicorn
 exec "$@"